@@ -69,11 +69,13 @@ export const useAuth = () => {
   // 登出
   const logout = async () => {
     try {
+      // 同时提交刷新令牌，使两者在服务端一并吊销
       await $fetch('/api/auth/logout', {
         method: 'POST',
         headers: {
           Authorization: `Bearer ${accessToken.value}`
-        }
+        },
+        body: { refresh_token: refreshToken.value }
       });
     } catch (error) {
       console.error('Logout failed:', error);
@@ -0,0 +1,121 @@
+import { ref, onBeforeUnmount } from 'vue';
+import type { SyncResult } from '~/types/hr';
+import { useAuth } from './useAuth';
+
+// 重新连接的等待时间（毫秒），连续失败时逐次加倍
+const RECONNECT_DELAY = 3000;
+const MAX_RECONNECT_DELAY = 60000;
+
+// 订阅服务端的变更推送，收到事件后通过 /api/sync 增量拉取，空闲时不再轮询列表接口
+export const useChangeFeed = (onChanges: (result: SyncResult) => void) => {
+  const { accessToken, refresh } = useAuth();
+  const connected = ref(false);
+  let source: EventSource | null = null;
+  let syncToken: string | null = null;
+  let pending: ReturnType<typeof setTimeout> | null = null;
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  let reconnectDelay = RECONNECT_DELAY;
+
+  const fetchSync = () => $fetch<SyncResult>('/api/sync', {
+    headers: { Authorization: `Bearer ${accessToken.value}` },
+    query: syncToken ? { since: syncToken } : {},
+  });
+
+  // 首次同步只取得令牌，页面已自行加载列表，不触发回调
+  const sync = async (initial = false) => {
+    let result: SyncResult;
+    try {
+      result = await fetchSync();
+    } catch (err: any) {
+      if (err.status !== 401) throw err;
+      await refresh();
+      result = await fetchSync();
+    }
+    syncToken = result.token;
+    if (!initial) onChanges(result);
+  };
+
+  // 合并短时间内的多条事件，只同步一次
+  const scheduleSync = () => {
+    if (pending) return;
+    pending = setTimeout(() => {
+      pending = null;
+      sync().catch((err) => console.error('Sync failed:', err));
+    }, 200);
+  };
+
+  // 变更推送只在 ASGI 部署下提供；以 runserver 等 WSGI 方式运行时接口返回 404。
+  // 不带令牌请求一次：接口存在时立即返回 401，不会建立长连接
+  const feedAvailable = async () => {
+    try {
+      await $fetch('/api/changes');
+    } catch (err: any) {
+      return err.status !== 404;
+    }
+    return true;
+  };
+
+  // 服务端拒绝连接（如访问令牌已过期）后 EventSource 不再自动重试：刷新令牌后重新连接；
+  // 接口不存在时不再重连，列表页仍可手动刷新
+  const scheduleReconnect = () => {
+    if (reconnectTimer) return;
+    reconnectTimer = setTimeout(async () => {
+      reconnectTimer = null;
+      if (!(await feedAvailable())) {
+        console.warn('Change feed unavailable, live updates disabled');
+        return;
+      }
+      try {
+        await refresh();
+      } catch {
+        // 刷新令牌失效，需重新登录
+        return;
+      }
+      reconnectDelay = Math.min(reconnectDelay * 2, MAX_RECONNECT_DELAY);
+      open();
+      // 断线期间可能错过事件，重连后补同步一次
+      scheduleSync();
+    }, reconnectDelay);
+  };
+
+  const open = () => {
+    source?.close();
+    source = new EventSource(`/api/changes?token=${encodeURIComponent(accessToken.value ?? '')}`);
+    source.onopen = () => {
+      connected.value = true;
+      reconnectDelay = RECONNECT_DELAY;
+    };
+    source.onerror = () => {
+      connected.value = false;
+      // CONNECTING 表示浏览器正在按 retry 间隔自动重连，无需处理
+      if (source?.readyState === EventSource.CLOSED) {
+        source.close();
+        source = null;
+        scheduleReconnect();
+      }
+    };
+    source.addEventListener('change', scheduleSync);
+  };
+
+  const connect = async () => {
+    disconnect();
+    await sync(true);
+    open();
+  };
+
+  const disconnect = () => {
+    source?.close();
+    source = null;
+    connected.value = false;
+    for (const timer of [pending, reconnectTimer]) {
+      if (timer) clearTimeout(timer);
+    }
+    pending = null;
+    reconnectTimer = null;
+    reconnectDelay = RECONNECT_DELAY;
+  };
+
+  onBeforeUnmount(disconnect);
+
+  return { connected, connect, disconnect };
+};
@@ -1,5 +1,5 @@
 import { ref, computed } from 'vue';
-import type { Department, DepartmentTreeNode, PaginationQuery } from '~/types/hr';
+import type { Department, DepartmentTreeNode, PaginatedResponse, PaginationQuery } from '~/types/hr';
 import { useAuth } from './useAuth';
 
 export const useDepartments = () => {
@@ -24,7 +24,7 @@ export const useDepartments = () => {
         ...filters
       };
       
-      const response = await $fetch<Department[]>('/api/departments/', {
+      const response = await $fetch<PaginatedResponse<Department>>('/api/departments/', {
         method: 'GET',
         headers: {
           Authorization: `Bearer ${accessToken.value}`
@@ -32,8 +32,8 @@ export const useDepartments = () => {
         query
       });
       
-      departments.value = response;
-      total.value = response.length;
+      departments.value = response.items;
+      total.value = response.total;
       
       return response;
     } catch (err: any) {
@@ -1,5 +1,5 @@
 import { ref, computed } from 'vue';
-import type { Employee, PaginationQuery } from '~/types/hr';
+import type { Employee, PaginatedResponse, PaginationQuery } from '~/types/hr';
 import { useAuth } from './useAuth';
 
 export const useEmployees = () => {
@@ -23,7 +23,7 @@ export const useEmployees = () => {
         ...filters
       };
       
-      const response = await $fetch<Employee[]>('/api/employees/', {
+      const response = await $fetch<PaginatedResponse<Employee>>('/api/employees/', {
         method: 'GET',
         headers: {
           Authorization: `Bearer ${accessToken.value}`
@@ -31,9 +31,8 @@ export const useEmployees = () => {
         query
       });
       
-      employees.value = response;
-      // 假设API返回的响应头中包含total计数，这里简化处理
-      total.value = response.length;
+      employees.value = response.items;
+      total.value = response.total;
       
       return response;
     } catch (err: any) {
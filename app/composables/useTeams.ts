@@ -1,5 +1,5 @@
 import { ref, computed } from 'vue';
-import type { ResearchTeam, PaginationQuery } from '~/types/hr';
+import type { ResearchTeam, PaginatedResponse, PaginationQuery } from '~/types/hr';
 import { useAuth } from './useAuth';
 
 export const useTeams = () => {
@@ -23,7 +23,7 @@ export const useTeams = () => {
         ...filters
       };
       
-      const response = await $fetch<ResearchTeam[]>('/api/teams/', {
+      const response = await $fetch<PaginatedResponse<ResearchTeam>>('/api/teams/', {
         method: 'GET',
         headers: {
           Authorization: `Bearer ${accessToken.value}`
@@ -31,8 +31,8 @@ export const useTeams = () => {
         query
       });
       
-      teams.value = response;
-      total.value = response.length;
+      teams.value = response.items;
+      total.value = response.total;
       
       return response;
     } catch (err: any) {
@@ -67,6 +67,7 @@ export interface Department {
 
 // 部门树节点类型
 export interface DepartmentTreeNode extends Department {
+  total_employee_count: number;
   children: DepartmentTreeNode[];
 }
 
@@ -103,9 +104,53 @@ export interface PaginationQuery {
 }
 
 export interface PaginatedResponse<T> {
-  data: T[];
+  items: T[];
   total: number;
   page: number;
   page_size: number;
-  total_pages: number;
+  next_cursor?: string;
+}
+
+// format=columnar 的列式响应：data 按列存放，选项字段的值为 enums 中 [代码, 标签] 的下标
+export interface ColumnarPage {
+  columns: string[];
+  data: unknown[][];
+  enums: Record<string, [string, string][]>;
+  total: number;
+  page?: number;
+  page_size?: number;
+  next_cursor?: string;
+}
+
+export interface StatItem {
+  key: string | boolean | null;
+  label: string;
+  count: number;
+}
+
+export interface EmployeeStats {
+  total: number;
+  by_department: { id: number; name: string; count: number }[];
+  by_gender: StatItem[];
+  by_age_band: StatItem[];
+  by_political_status: StatItem[];
+  by_professional_title: StatItem[];
+  by_education: StatItem[];
+  by_degree: StatItem[];
+  as_of: string;
+}
+
+export interface SyncResult {
+  // 下次同步时作为 since 传入
+  token: string;
+  // 为 true 时丢弃本地副本，全量加载列表后以 token 继续同步
+  reset: boolean;
+  employees: Employee[];
+  departments: Department[];
+  teams: ResearchTeam[];
+  deleted: {
+    employees: number[];
+    departments: number[];
+    teams: number[];
+  };
 }
@@ -0,0 +1,20 @@
+import type { ColumnarPage } from '~/types/hr';
+
+// 将列式响应还原为行对象，选项字段还原为代码；labels 为各选项字段的代码到标签映射
+export function fromColumnar<T = Record<string, unknown>>(page: ColumnarPage): { items: T[]; labels: Record<string, Record<string, string>> } {
+  const { columns, data, enums } = page;
+  const count = data[0]?.length ?? 0;
+  const items = Array.from({ length: count }, () => ({} as Record<string, unknown>));
+  columns.forEach((column, c) => {
+    const values = data[c]!;
+    const choices = enums[column];
+    for (let i = 0; i < count; i++) {
+      const value = values[i];
+      items[i]![column] = choices && typeof value === 'number' ? choices[value]![0] : value;
+    }
+  });
+  const labels = Object.fromEntries(
+    Object.entries(enums).map(([column, choices]) => [column, Object.fromEntries(choices)]),
+  );
+  return { items: items as T[], labels };
+}
@@ -1,16 +1,25 @@
 from ninja import NinjaAPI
 from django.conf import settings
 
+from .renderers import ORJSONRenderer
+from .security import JWTAuth
+
 api = NinjaAPI(
     title="人事系统API",
     description="人事信息管理系统API",
     version="1.0.0",
-    urls_namespace="api"
+    urls_namespace="api",
+    auth=JWTAuth(),
+    renderer=ORJSONRenderer(),
 )
 
-from . import auth, employees, departments, teams
+from . import auth, employees, departments, teams, stats, reports, metrics, sync
 
 api.add_router("/auth/", auth.router)
 api.add_router("/employees/", employees.router)
 api.add_router("/departments/", departments.router)
 api.add_router("/teams/", teams.router)
+api.add_router("/stats/", stats.router)
+api.add_router("/reports/", reports.router)
+api.add_router("/sync", sync.router)
+api.add_router("/metrics", metrics.router)
@@ -1,11 +1,12 @@
 from ninja import Router, Form
+from ninja.errors import HttpError
 from django.contrib.auth import authenticate
-from django.conf import settings
-from datetime import datetime, timedelta
-from jose import jwt, JWTError
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, ValidationError
 from django.http import JsonResponse
 
+from .security import create_access_token, create_refresh_token, password_fingerprint, resolve_token, revoke_token
+
 router = Router()
 
 class LoginRequest(BaseModel):
@@ -20,46 +21,20 @@ class TokenResponse(BaseModel):
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
-def create_access_token(user_id: int) -> str:
-    """创建访问令牌"""
-    expire = datetime.utcnow() + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
-    payload = {
-        "user_id": user_id,
-        "exp": expire,
-        "type": "access"
-    }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-
-
-def create_refresh_token(user_id: int) -> str:
-    """创建刷新令牌"""
-    expire = datetime.utcnow() + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME)
-    payload = {
-        "user_id": user_id,
-        "exp": expire,
-        "type": "refresh"
-    }
-    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-
-
-def decode_token(token: str) -> dict:
-    """解码令牌"""
-    try:
-        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-    except JWTError:
-        return None
 
-
-@router.post("/login", response=TokenResponse)
+@router.post("/login", response=TokenResponse, auth=None)
 def login(request, data: LoginRequest):
     """用户登录"""
     user = authenticate(username=data.username, password=data.password)
     if not user:
         return JsonResponse({"detail": "用户名或密码错误"}, status=401)
     
-    access_token = create_access_token(user.id)
-    refresh_token = create_refresh_token(user.id)
+    fingerprint = password_fingerprint(user)
+    access_token = create_access_token(user.id, fingerprint)
+    refresh_token = create_refresh_token(user.id, fingerprint)
     
     return {
         "access_token": access_token,
@@ -68,15 +43,15 @@ def login(request, data: LoginRequest):
     }
 
 
-@router.post("/refresh", response=TokenResponse)
+@router.post("/refresh", response=TokenResponse, auth=None)
 def refresh_token(request, data: RefreshTokenRequest):
     """刷新访问令牌"""
-    payload = decode_token(data.refresh_token)
-    if not payload or payload["type"] != "refresh":
+    principal = resolve_token(data.refresh_token, "refresh")
+    if principal is None:
         return JsonResponse({"detail": "无效的刷新令牌"}, status=401)
     
-    access_token = create_access_token(payload["user_id"])
-    refresh_token = create_refresh_token(payload["user_id"])
+    access_token = create_access_token(principal.id, principal.password_fingerprint)
+    refresh_token = create_refresh_token(principal.id, principal.password_fingerprint)
     
     return {
         "access_token": access_token,
@@ -87,6 +62,14 @@ def refresh_token(request, data: RefreshTokenRequest):
 
 @router.post("/logout")
 def logout(request):
-    """用户登出"""
-    # JWT是无状态的，登出只需客户端删除令牌即可
+    """用户登出，吊销当前访问令牌及随请求提交的刷新令牌"""
+    # 请求体可省略，因此不声明为 Body 参数，仅在提交 JSON 时自行解析
+    is_json = request.content_type == "application/json" and request.body
+    try:
+        data = LogoutRequest.model_validate_json(request.body) if is_json else LogoutRequest()
+    except ValidationError:
+        raise HttpError(400, "无效的请求体")
+    revoke_token(request.access_token)
+    if data.refresh_token:
+        revoke_token(data.refresh_token)
     return {"detail": "登出成功"}
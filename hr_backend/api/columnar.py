@@ -0,0 +1,64 @@
+"""列表与导出接口的列式响应（format=columnar）
+
+大页列表按行输出时，每行都重复全部字段名；列式响应只发送一次列名，每列的值为一个数组，
+选项字段（政治面貌、职称等）的值为 enums 中的下标，代码与中文标签整页只发送一次：
+
+    {"columns": ["id", "political_status", ...],
+     "data": [[1, 2, ...], [0, 2, ...], ...],
+     "enums": {"political_status": [["party_member", "中共党员"], ...]},
+     "total": 1000, "page": 1, ...}
+
+请求头 Accept 包含 application/msgpack 且安装了 msgpack 时以 MessagePack 编码，否则为 JSON。
+"""
+from typing import Dict, Iterable, List, Sequence
+
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .renderers import render_response
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖，未安装时只提供 JSON
+    msgpack = None
+
+MSGPACK_CONTENT_TYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+def enum_columns(model, columns: Sequence[str]) -> Dict[str, list]:
+    """返回 columns 中带选项的字段及其 [代码, 标签] 列表"""
+    enums = {}
+    for name in columns:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # 关联名称、年龄等计算字段
+            continue
+        if getattr(field, 'choices', None):
+            enums[name] = [[value, str(label)] for value, label in field.choices]
+    return enums
+
+
+def to_columnar(items: Iterable[dict], columns: Sequence[str], enums: Dict[str, list]) -> dict:
+    """将行转换为列式结构，选项字段的代码替换为下标（不在选项中的值原样保留）"""
+    items = list(items)
+    data: List[list] = []
+    for name in columns:
+        values = [item[name] for item in items]
+        if name in enums:
+            index = {code: position for position, (code, _) in enumerate(enums[name])}
+            values = [index.get(value, value) for value in values]
+        data.append(values)
+    return {'columns': list(columns), 'data': data, 'enums': {name: enums[name] for name in columns if name in enums}}
+
+
+def columnar_response(request, payload: dict):
+    """按请求头 Accept 以 MessagePack 或 JSON 输出列式结构"""
+    accept = request.headers.get('Accept', '')
+    if msgpack is not None and any(content_type in accept for content_type in MSGPACK_CONTENT_TYPES):
+        response = HttpResponse(msgpack.packb(payload), content_type=MSGPACK_CONTENT_TYPES[0])
+    else:
+        response = render_response(request, payload)
+    patch_vary_headers(response, ['Accept'])
+    return response
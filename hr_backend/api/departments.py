@@ -1,8 +1,21 @@
 from ninja import Router, Query
-from typing import List, Optional
+from typing import Literal, Optional
 from pydantic import BaseModel
 from departments.models import Department
+from teams.models import ResearchTeam
+from departments.tree import adepartment_tree_etag, aget_cached_department_tree
 from employees.models import Employee
+from django.db.models import Count, F
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .columnar import columnar_response, enum_columns, to_columnar
+from .fields import FieldSet, Include, SparseQuery
+from .pagination import CURSOR_COLUMNS, CURSOR_ORDERING, Page, acached_count, apaginate_by_cursor
+from .partial import apply_partial_update, partial_schema
+from .renderers import render_response, trusted_response
+from .security import async_auth
 
 router = Router()
 
@@ -18,6 +31,9 @@ class DepartmentCreate(DepartmentBase):
 class DepartmentUpdate(DepartmentBase):
     pass
 
+# 部分更新：仅提交需要修改的字段
+DepartmentPatch = partial_schema('DepartmentPatch', DepartmentBase)
+
 class DepartmentOut(DepartmentBase):
     id: int
     parent_department_name: Optional[str] = None
@@ -29,14 +45,59 @@ class DepartmentOut(DepartmentBase):
     class Config:
         from_attributes = True
 
-class DepartmentQuery(BaseModel):
+class DepartmentQuery(SparseQuery):
     name: Optional[str] = None
     page: int = 1
     page_size: int = 10
+    # 游标分页：传入空字符串获取第一页，之后传入上一页返回的 next_cursor
+    cursor: Optional[str] = None
+    # columnar：列式响应，列名与选项标签只发送一次
+    format: Optional[Literal['columnar']] = None
+
+
+DEPARTMENT_COLUMNS = ['id', 'name', 'parent_department_id', 'leader_id', 'description', 'created_at', 'updated_at']
+
+
+def project_departments(queryset):
+    """将部门查询集投影为响应所需的列，员工数量通过分组聚合一次算出"""
+    return queryset.annotate(employee_count=Count('employee')).values(
+        *DEPARTMENT_COLUMNS,
+        'employee_count',
+        parent_department_name=F('parent_department__name'),
+        leader_name=F('leader__name'),
+    )
+
 
+# 稀疏字段：可选的列、计算字段与可嵌入的关联
+DEPARTMENT_FIELDS = FieldSet(
+    DEPARTMENT_COLUMNS,
+    {
+        'employee_count': lambda: Count('employee'),
+        'parent_department_name': lambda: F('parent_department__name'),
+        'leader_name': lambda: F('leader__name'),
+    },
+    {
+        'parent_department': Include(('id', 'name'), relation='parent_department'),
+        'leader': Include(('id', 'employee_id', 'name'), relation='leader'),
+        'teams': Include(('id', 'name', 'leader_id'), model=ResearchTeam, foreign_key='department_id'),
+    },
+)
 
-@router.get("/", response=List[DepartmentOut])
-def list_departments(request, q: DepartmentQuery = Query(...)):
+
+def to_department_out(row: dict) -> dict:
+    """将投影行转换为DepartmentOut格式"""
+    row['created_at'] = row['created_at'].isoformat()
+    row['updated_at'] = row['updated_at'].isoformat()
+    return row
+
+
+# 列式响应的列与选项字段
+DEPARTMENT_OUT_COLUMNS = list(DepartmentOut.model_fields)
+DEPARTMENT_ENUMS = enum_columns(Department, DEPARTMENT_OUT_COLUMNS)
+
+
+@router.get("/", auth=async_auth, response=Page[DepartmentOut])
+async def list_departments(request, q: DepartmentQuery = Query(...)):
     """获取部门列表"""
     queryset = Department.objects.all()
     
@@ -44,45 +105,55 @@ def list_departments(request, q: DepartmentQuery = Query(...)):
     if q.name:
         queryset = queryset.filter(name__icontains=q.name)
     
+    selection = DEPARTMENT_FIELDS.select(q.fields, q.include)
+    projected = selection.project(queryset, extra=CURSOR_COLUMNS) if selection else project_departments(queryset)
+    
     # 分页
-    offset = (q.page - 1) * q.page_size
-    departments = queryset[offset:offset + q.page_size]
+    next_cursor = None
+    if q.cursor is not None:
+        rows, next_cursor = await apaginate_by_cursor(projected, q.cursor, q.page_size)
+    else:
+        offset = (q.page - 1) * q.page_size
+        # 与游标分页相同的排序键，(created_at, id) 唯一确定顺序，翻页时不会重复或遗漏
+        rows = [row async for row in projected.order_by(*CURSOR_ORDERING)[offset:offset + q.page_size]]
     
-    # 转换为响应格式
-    result = []
-    for dept in departments:
-        result.append({
-            "id": dept.id,
-            "name": dept.name,
-            "parent_department_id": dept.parent_department.id if dept.parent_department else None,
-            "parent_department_name": dept.parent_department.name if dept.parent_department else None,
-            "leader_id": dept.leader.id if dept.leader else None,
-            "leader_name": dept.leader.name if dept.leader else None,
-            "description": dept.description,
-            "created_at": dept.created_at.isoformat(),
-            "updated_at": dept.updated_at.isoformat(),
-            "employee_count": dept.employee_set.count()
-        })
+    page = {
+        "total": await acached_count(queryset, q),
+        "page": q.page,
+        "page_size": q.page_size,
+        "next_cursor": next_cursor,
+    }
+    items = await selection.aserialize(rows) if selection else [to_department_out(row) for row in rows]
+    if q.format == 'columnar':
+        columns = selection.columns if selection else DEPARTMENT_OUT_COLUMNS
+        return columnar_response(request, {**to_columnar(items, columns, DEPARTMENT_ENUMS), **page})
+    if selection:
+        return render_response(request, {"items": items, **page})
+    return trusted_response(request, {"items": items, **page})
+
+
+@router.get("/tree", auth=async_auth)
+async def get_department_tree(request, response: HttpResponse):
+    """获取部门树状结构"""
+    # 客户端持有的版本未变化时直接返回304，不访问数据库
+    etag = await adepartment_tree_etag()
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return HttpResponseNotModified(headers={'ETag': etag})
     
-    return result
+    etag, tree = await aget_cached_department_tree()
+    response['ETag'] = etag
+    return tree
 
 
-@router.get("/{department_id}", response=DepartmentOut)
-def get_department(request, department_id: int):
+@router.get("/{department_id}", auth=async_auth, response=DepartmentOut)
+async def get_department(request, department_id: int, q: SparseQuery = Query(...)):
     """获取单个部门信息"""
-    dept = Department.objects.get(id=department_id)
-    return {
-        "id": dept.id,
-        "name": dept.name,
-        "parent_department_id": dept.parent_department.id if dept.parent_department else None,
-        "parent_department_name": dept.parent_department.name if dept.parent_department else None,
-        "leader_id": dept.leader.id if dept.leader else None,
-        "leader_name": dept.leader.name if dept.leader else None,
-        "description": dept.description,
-        "created_at": dept.created_at.isoformat(),
-        "updated_at": dept.updated_at.isoformat(),
-        "employee_count": dept.employee_set.count()
-    }
+    selection = DEPARTMENT_FIELDS.select(q.fields, q.include)
+    if selection:
+        row = await aget_object_or_404(selection.project(Department.objects.all()), id=department_id)
+        return render_response(request, (await selection.aserialize([row]))[0])
+    row = await aget_object_or_404(project_departments(Department.objects.all()), id=department_id)
+    return trusted_response(request, to_department_out(row))
 
 
 @router.post("/", response=DepartmentOut)
@@ -98,18 +169,7 @@ def create_department(request, data: DepartmentCreate):
         description=data.description
     )
     
-    return {
-        "id": department.id,
-        "name": department.name,
-        "parent_department_id": department.parent_department.id if department.parent_department else None,
-        "parent_department_name": department.parent_department.name if department.parent_department else None,
-        "leader_id": department.leader.id if department.leader else None,
-        "leader_name": department.leader.name if department.leader else None,
-        "description": department.description,
-        "created_at": department.created_at.isoformat(),
-        "updated_at": department.updated_at.isoformat(),
-        "employee_count": 0
-    }
+    return to_department_out(project_departments(Department.objects.all()).get(id=department.id))
 
 
 @router.put("/{department_id}", response=DepartmentOut)
@@ -127,18 +187,18 @@ def update_department(request, department_id: int, data: DepartmentUpdate):
     
     department.save()
     
-    return {
-        "id": department.id,
-        "name": department.name,
-        "parent_department_id": department.parent_department.id if department.parent_department else None,
-        "parent_department_name": department.parent_department.name if department.parent_department else None,
-        "leader_id": department.leader.id if department.leader else None,
-        "leader_name": department.leader.name if department.leader else None,
-        "description": department.description,
-        "created_at": department.created_at.isoformat(),
-        "updated_at": department.updated_at.isoformat(),
-        "employee_count": department.employee_set.count()
-    }
+    return to_department_out(project_departments(Department.objects.all()).get(id=department.id))
+
+
+@router.patch("/{department_id}", response=DepartmentOut)
+def patch_department(request, department_id: int, data: DepartmentPatch):
+    """部分更新部门信息，仅写入发生变化的字段"""
+    department = get_object_or_404(Department, id=department_id)
+    changed = apply_partial_update(department, data, {'parent_department_id': Department, 'leader_id': Employee})
+    if changed:
+        department.save(update_fields=[*changed, 'updated_at'])
+
+    return to_department_out(project_departments(Department.objects.all()).get(id=department.id))
 
 
 @router.delete("/{department_id}")
@@ -147,27 +207,3 @@ def delete_department(request, department_id: int):
     department = Department.objects.get(id=department_id)
     department.delete()
     return {"detail": "部门删除成功"}
-
-
-@router.get("/tree")
-def get_department_tree(request):
-    """获取部门树状结构"""
-    def build_tree(departments, parent_id=None):
-        """递归构建部门树"""
-        tree = []
-        for dept in departments:
-            if dept.parent_department_id == parent_id:
-                children = build_tree(departments, dept.id)
-                node = {
-                    "id": dept.id,
-                    "name": dept.name,
-                    "leader_id": dept.leader_id,
-                    "leader_name": dept.leader.name if dept.leader else None,
-                    "employee_count": dept.employee_set.count(),
-                    "children": children
-                }
-                tree.append(node)
-        return tree
-    
-    departments = Department.objects.all()
-    return build_tree(departments)
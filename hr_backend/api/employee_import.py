@@ -0,0 +1,246 @@
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from pydantic import ValidationError
+
+from departments.models import Department
+from departments.tree import invalidate_department_tree
+from employees.models import Employee
+from employees.reports import invalidate_employee_reports
+from employees.search import build_search_text
+from employees.stats import invalidate_employee_stats
+from hr_backend.cache import bump_version, count_namespace
+from sync.broker import publish_change
+from teams.models import ResearchTeam
+from .employees import BulkImportError, BulkImportQuery, BulkImportResult, DuplicateMode, EmployeeCreate
+
+# 由接口校验或导入流程自行处理、无需再做模型字段校验的字段
+CLEAN_EXCLUDE = ['department', 'team', 'created_by', 'search_text']
+
+# CSV 表头既可以是字段名，也可以是字段的中文名称
+HEADER_ALIASES = {
+    str(field.verbose_name): field.attname
+    for field in Employee._meta.concrete_fields
+    if field.attname in EmployeeCreate.model_fields
+}
+
+# 选项字段既可以填写代码，也可以填写中文标签
+CHOICE_LABELS = {
+    field.attname: {str(label): value for value, label in field.choices}
+    for field in Employee._meta.concrete_fields
+    if field.choices and field.attname in EmployeeCreate.model_fields
+}
+
+# 布尔字段可填写导出文件中的“是/否”
+BOOLEAN_LABELS = {'是': True, '否': False}
+BOOLEAN_FIELDS = {
+    field.attname for field in Employee._meta.concrete_fields
+    if field.get_internal_type() == 'BooleanField' and field.attname in EmployeeCreate.model_fields
+}
+
+# upsert 模式下按员工编号更新的字段，检索文本随姓名、电话等一并重新写入
+UPSERT_FIELDS = [name for name in EmployeeCreate.model_fields if name != 'employee_id'] + ['search_text', 'updated_at']
+
+
+def detect_format(request, requested: Optional[str]) -> str:
+    """根据查询参数或 Content-Type 判断上传格式"""
+    if requested:
+        return requested
+    content_type = request.content_type or ''
+    return 'csv' if 'csv' in content_type else 'jsonl'
+
+
+def read_rows(request, fmt: str):
+    """逐行读取请求体，产出 (行号, 数据字典或解析错误)"""
+    lines = codecs.iterdecode(request, 'utf-8-sig')
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(lines), start=2):
+            yield number, _normalize_csv_row(row)
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield number, f'JSON解析失败: {exc}'
+            continue
+        yield number, data if isinstance(data, dict) else 'JSON行必须是对象'
+
+
+def _normalize_csv_row(row: dict) -> dict:
+    """转换表头别名与选项标签，空单元格视为未填写"""
+    data = {}
+    for header, value in row.items():
+        if header is None or value is None:
+            continue
+        header, value = header.strip(), value.strip()
+        if value == '':
+            continue
+        field = HEADER_ALIASES.get(header, header)
+        if field in BOOLEAN_FIELDS:
+            value = BOOLEAN_LABELS.get(value, value)
+        data[field] = CHOICE_LABELS.get(field, {}).get(value, value)
+    return data
+
+
+class EmployeeImporter:
+    """按批校验并写入员工数据，生成逐行错误报告"""
+
+    def __init__(self, on_duplicate: DuplicateMode, chunk_size: int, created_by_id=None):
+        self.on_duplicate = on_duplicate
+        self.chunk_size = chunk_size
+        self.created_by_id = created_by_id
+        self.result = BulkImportResult()
+        # 部门、团队在整个导入过程中只查询一次；导出文件中的名称也可直接用于导入
+        self.department_ids, self.department_names = self._load_lookup(Department)
+        self.team_ids, self.team_names = self._load_lookup(ResearchTeam)
+        self.seen_employee_ids = set()
+        self.seen_id_cards = set()
+
+    def run(self, rows) -> BulkImportResult:
+        with transaction.atomic():
+            rows = iter(rows)
+            while chunk := list(islice(rows, self.chunk_size)):
+                self._import_chunk(chunk)
+
+            if not self.result.committed:
+                transaction.set_rollback(True)
+
+        if self.result.committed and (self.result.created or self.result.updated):
+            # bulk_create 不触发模型信号，需手动使相关缓存失效
+            bump_version(count_namespace(Employee))
+            invalidate_department_tree()
+            invalidate_employee_stats()
+            invalidate_employee_reports()
+            # 订阅者收到后按令牌增量同步
+            publish_change('employees', 'bulk')
+        return self.result
+
+    @staticmethod
+    def _load_lookup(model):
+        """返回 (ID集合, 名称到ID的映射)，重名的名称映射为 None"""
+        ids, names = set(), {}
+        for pk, name in model.objects.values_list('id', 'name'):
+            ids.add(pk)
+            names[name] = None if name in names else pk
+        return ids, names
+
+    def _resolve_names(self, data):
+        """将部门、团队名称替换为ID"""
+        for field, names in (('department_id', self.department_names), ('team_id', self.team_names)):
+            value = data.get(field)
+            if isinstance(value, str) and not value.isdigit():
+                data[field] = names.get(value) or value
+
+    def _error(self, number, employee_id, errors):
+        self.result.errors.append(BulkImportError(row=number, employee_id=employee_id, errors=errors))
+
+    def _build(self, number, data):
+        """校验单行数据，成功时返回未保存的员工对象"""
+        if isinstance(data, str):
+            self._error(number, None, [data])
+            return None
+        self._resolve_names(data)
+        try:
+            payload = EmployeeCreate(**data)
+        except ValidationError as exc:
+            errors = [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()]
+            self._error(number, data.get('employee_id'), errors)
+            return None
+
+        errors = []
+        if payload.department_id not in self.department_ids:
+            errors.append(f'department_id: 部门 {payload.department_id} 不存在')
+        if payload.team_id is not None and payload.team_id not in self.team_ids:
+            errors.append(f'team_id: 科研团队 {payload.team_id} 不存在')
+
+        # 未填写的字段交给模型默认值（如非空的民族字段默认为空字符串）
+        employee = Employee(**payload.model_dump(exclude_none=True), created_by_id=self.created_by_id)
+        try:
+            employee.clean_fields(exclude=CLEAN_EXCLUDE)
+        except DjangoValidationError as exc:
+            errors += [f'{field}: {message}' for field, messages in exc.message_dict.items() for message in messages]
+
+        if errors:
+            self._error(number, payload.employee_id, errors)
+            return None
+        employee.search_text = build_search_text(employee)
+        return employee
+
+    def _import_chunk(self, chunk):
+        candidates = [(number, employee) for number, data in chunk
+                      if (employee := self._build(number, data)) is not None]
+        if not candidates:
+            return
+
+        employee_ids = [employee.employee_id for _, employee in candidates]
+        id_cards = [employee.id_card_number for _, employee in candidates]
+        existing_ids = set(Employee.objects.filter(employee_id__in=employee_ids).values_list('employee_id', flat=True))
+        card_owners = dict(Employee.objects.filter(id_card_number__in=id_cards).values_list('id_card_number', 'employee_id'))
+
+        to_create, to_update = [], []
+        for number, employee in candidates:
+            in_batch = employee.employee_id in self.seen_employee_ids or employee.id_card_number in self.seen_id_cards
+            id_exists = employee.employee_id in existing_ids
+            card_owner = card_owners.get(employee.id_card_number)
+            self.seen_employee_ids.add(employee.employee_id)
+            self.seen_id_cards.add(employee.id_card_number)
+
+            if self.on_duplicate == 'upsert':
+                if in_batch:
+                    self._error(number, employee.employee_id, ['员工编号或身份证号在导入数据中重复'])
+                elif card_owner is not None and card_owner != employee.employee_id:
+                    self._error(number, employee.employee_id, [f'身份证号已被员工 {card_owner} 使用'])
+                else:
+                    (to_update if id_exists else to_create).append(employee)
+                continue
+
+            if in_batch or id_exists or card_owner is not None:
+                if self.on_duplicate == 'skip':
+                    self.result.skipped += 1
+                else:
+                    self.result.committed = False
+                    self._error(number, employee.employee_id, ['员工编号或身份证号重复'])
+                continue
+            to_create.append(employee)
+
+        # 一旦决定回滚，后续数据只做校验不再写入
+        if not self.result.committed:
+            return
+        try:
+            with transaction.atomic():
+                if self.on_duplicate == 'upsert':
+                    Employee.objects.bulk_create(
+                        to_create + to_update,
+                        update_conflicts=True,
+                        unique_fields=['employee_id'],
+                        update_fields=UPSERT_FIELDS,
+                    )
+                    if to_update:
+                        # bulk_create 不触发模型信号：负责人可能改名，刷新其负责的部门与团队供增量同步重新返回
+                        updated = [employee.employee_id for employee in to_update]
+                        for model in (Department, ResearchTeam):
+                            model.objects.filter(leader__employee_id__in=updated).update(updated_at=timezone.now())
+                else:
+                    Employee.objects.bulk_create(to_create)
+        except IntegrityError as exc:
+            self.result.committed = False
+            self._error(chunk[0][0], None, [f'写入失败: {exc}'])
+            return
+        self.result.created += len(to_create)
+        self.result.updated += len(to_update)
+
+
+def import_employees(request, query: BulkImportQuery) -> BulkImportResult:
+    """从请求体流式导入员工"""
+    rows = read_rows(request, detect_format(request, query.format))
+    importer = EmployeeImporter(query.on_duplicate, query.chunk_size, created_by_id=request.user.id)
+    return importer.run(rows)
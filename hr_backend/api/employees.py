@@ -1,10 +1,21 @@
 from ninja import Router, Query
-from typing import List, Optional
-from pydantic import BaseModel
-from employees.models import Employee, PoliticalStatus, PositionLevel, ProfessionalTitle, EducationLevel, DegreeLevel
+from datetime import date
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from employees.models import Employee, years_since_expression, years_since_filter, PoliticalStatus, PositionLevel, ProfessionalTitle, EducationLevel, DegreeLevel
+from employees.search import SEARCH_SOURCE_FIELDS, filter_by_search, search_employee_ids
 from departments.models import Department
 from teams.models import ResearchTeam
-from django.db.models import Q
+from django.db import models
+from django.db.models import Q, F
+from django.shortcuts import aget_object_or_404, get_object_or_404
+
+from .columnar import columnar_response, enum_columns, to_columnar
+from .fields import FieldSet, Include, SparseQuery
+from .pagination import CURSOR_COLUMNS, CURSOR_ORDERING, Page, acached_count, apaginate_by_cursor
+from .partial import apply_partial_update, partial_schema
+from .renderers import render_response, trusted_response
+from .security import async_auth
 
 router = Router()
 
@@ -59,6 +70,9 @@ class EmployeeCreate(EmployeeBase):
 class EmployeeUpdate(EmployeeBase):
     pass
 
+# 部分更新：仅提交需要修改的字段
+EmployeePatch = partial_schema('EmployeePatch', EmployeeBase)
+
 class EmployeeOut(EmployeeBase):
     id: int
     department_name: str
@@ -70,21 +84,121 @@ class EmployeeOut(EmployeeBase):
     class Config:
         from_attributes = True
 
-class EmployeeQuery(BaseModel):
+class EmployeeFilter(BaseModel):
+    # 关键词检索：姓名、员工编号、姓名拼音、电话、邮箱
+    search: Optional[str] = None
     name: Optional[str] = None
     employee_id: Optional[str] = None
     department_id: Optional[int] = None
     is_active: Optional[bool] = None
+    # 年龄、工龄（周岁/周年，含边界）与日期范围，均转换为对日期列的范围比较
+    age_min: Optional[int] = Field(None, ge=0)
+    age_max: Optional[int] = Field(None, ge=0)
+    birthday_from: Optional[date] = None
+    birthday_to: Optional[date] = None
+    seniority_min: Optional[int] = Field(None, ge=0)
+    seniority_max: Optional[int] = Field(None, ge=0)
+    join_date_from: Optional[date] = None
+    join_date_to: Optional[date] = None
+
+class EmployeeQuery(EmployeeFilter, SparseQuery):
     page: int = 1
     page_size: int = 10
+    # 游标分页：传入空字符串获取第一页，之后传入上一页返回的 next_cursor
+    cursor: Optional[str] = None
+    # columnar：列式响应，列名与选项标签只发送一次
+    format: Optional[Literal['columnar']] = None
 
 
-@router.get("/", response=List[EmployeeOut])
-def list_employees(request, q: EmployeeQuery = Query(...)):
-    """获取员工列表"""
+class EmployeeExportQuery(EmployeeFilter):
+    # columnar 为列式 JSON（或 MessagePack），与列表接口的 format=columnar 结构相同；
+    # 列式结构需整页生成后才能输出，因此按游标分页：传入上一页的 next_cursor 取下一页
+    format: Literal['csv', 'xlsx', 'columnar'] = 'csv'
+    cursor: Optional[str] = None
+    page_size: int = Field(1000, ge=1, le=5000)
+
+
+class EmployeeSearchQuery(BaseModel):
+    q: str
+    limit: int = Field(20, ge=1, le=100)
+
+
+DuplicateMode = Literal['skip', 'fail', 'upsert']
+
+
+class BulkImportQuery(BaseModel):
+    # 上传格式，未指定时根据 Content-Type 判断
+    format: Optional[Literal['csv', 'jsonl']] = None
+    # 员工编号或身份证号重复时：跳过、整批回滚或按员工编号更新
+    on_duplicate: DuplicateMode = 'fail'
+    chunk_size: int = Field(500, ge=1, le=5000)
+
+
+class BulkImportError(BaseModel):
+    row: int
+    employee_id: Optional[str] = None
+    errors: List[str]
+
+
+class BulkImportResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    committed: bool = True
+    errors: List[BulkImportError] = []
+
+
+# 列表与详情接口共用的字段投影：部门、团队名称通过JOIN一次取回，避免逐行查询
+EMPLOYEE_COLUMNS = ['id', *EmployeeBase.model_fields, 'created_at', 'updated_at']
+EMPLOYEE_DATE_COLUMNS = [
+    field.name for field in Employee._meta.concrete_fields
+    if isinstance(field, models.DateField) and field.name in EMPLOYEE_COLUMNS
+]
+
+
+def project_employees(queryset):
+    """将员工查询集投影为响应所需的列，年龄由数据库计算"""
+    return queryset.values(
+        *EMPLOYEE_COLUMNS,
+        department_name=F('department__name'),
+        team_name=F('team__name'),
+        age=years_since_expression('birthday'),
+    )
+
+
+# 稀疏字段：可选的列、计算字段与可嵌入的关联
+EMPLOYEE_FIELDS = FieldSet(
+    EMPLOYEE_COLUMNS,
+    {
+        'department_name': lambda: F('department__name'),
+        'team_name': lambda: F('team__name'),
+        'age': lambda: years_since_expression('birthday'),
+    },
+    {
+        'department': Include(('id', 'name'), relation='department'),
+        'team': Include(('id', 'name', 'leader_id'), relation='team'),
+    },
+)
+
+
+def to_employee_out(row: dict) -> dict:
+    """将投影行转换为EmployeeOut格式"""
+    for column in EMPLOYEE_DATE_COLUMNS:
+        if row[column] is not None:
+            row[column] = row[column].isoformat()
+    return row
+
+
+# 列式响应的列与选项字段
+EMPLOYEE_OUT_COLUMNS = list(EmployeeOut.model_fields)
+EMPLOYEE_ENUMS = enum_columns(Employee, EMPLOYEE_OUT_COLUMNS)
+
+
+def filter_employees(q: EmployeeFilter):
+    """按查询条件过滤员工"""
     queryset = Employee.objects.all()
-    
-    # 过滤条件
+    if q.search:
+        queryset = filter_by_search(queryset, q.search)
     if q.name:
         queryset = queryset.filter(name__icontains=q.name)
     if q.employee_id:
@@ -93,38 +207,90 @@ def list_employees(request, q: EmployeeQuery = Query(...)):
         queryset = queryset.filter(department_id=q.department_id)
     if q.is_active is not None:
         queryset = queryset.filter(is_active=q.is_active)
+    if q.age_min is not None or q.age_max is not None:
+        queryset = queryset.filter(years_since_filter('birthday', q.age_min, _exclusive(q.age_max)))
+    if q.birthday_from:
+        queryset = queryset.filter(birthday__gte=q.birthday_from)
+    if q.birthday_to:
+        queryset = queryset.filter(birthday__lte=q.birthday_to)
+    if q.seniority_min is not None or q.seniority_max is not None:
+        queryset = queryset.filter(years_since_filter('work_start_date', q.seniority_min, _exclusive(q.seniority_max)))
+    if q.join_date_from:
+        queryset = queryset.filter(join_institute_date__gte=q.join_date_from)
+    if q.join_date_to:
+        queryset = queryset.filter(join_institute_date__lte=q.join_date_to)
+    return queryset
+
+
+def _exclusive(maximum: Optional[int]) -> Optional[int]:
+    # 接口的年数上限含边界，“不超过45岁”即“未满46岁”
+    return None if maximum is None else maximum + 1
+
+
+@router.get("/", auth=async_auth, response=Page[EmployeeOut])
+async def list_employees(request, q: EmployeeQuery = Query(...)):
+    """获取员工列表"""
+    queryset = filter_employees(q)
+    selection = EMPLOYEE_FIELDS.select(q.fields, q.include)
+    projected = selection.project(queryset, extra=CURSOR_COLUMNS) if selection else project_employees(queryset)
     
     # 分页
-    offset = (q.page - 1) * q.page_size
-    employees = queryset[offset:offset + q.page_size]
-    
-    # 转换为响应格式
-    result = []
-    for emp in employees:
-        result.append({
-            **emp.__dict__,
-            "department_name": emp.department.name,
-            "team_name": emp.team.name if emp.team else None,
-            "created_at": emp.created_at.isoformat(),
-            "updated_at": emp.updated_at.isoformat(),
-            "age": emp.age if emp.birthday else None
-        })
+    next_cursor = None
+    if q.cursor is not None:
+        rows, next_cursor = await apaginate_by_cursor(projected, q.cursor, q.page_size)
+    else:
+        offset = (q.page - 1) * q.page_size
+        # 与游标分页相同的排序键，(created_at, id) 唯一确定顺序，翻页时不会重复或遗漏
+        rows = [row async for row in projected.order_by(*CURSOR_ORDERING)[offset:offset + q.page_size]]
     
-    return result
+    page = {
+        "total": await acached_count(queryset, q),
+        "page": q.page,
+        "page_size": q.page_size,
+        "next_cursor": next_cursor,
+    }
+    items = await selection.aserialize(rows) if selection else [to_employee_out(row) for row in rows]
+    if q.format == 'columnar':
+        columns = selection.columns if selection else EMPLOYEE_OUT_COLUMNS
+        return columnar_response(request, {**to_columnar(items, columns, EMPLOYEE_ENUMS), **page})
+    if selection:
+        return render_response(request, {"items": items, **page})
+    return trusted_response(request, {"items": items, **page})
 
 
-@router.get("/{employee_id}", response=EmployeeOut)
-def get_employee(request, employee_id: int):
+@router.get("/search", response=List[EmployeeOut])
+def search_employees(request, q: EmployeeSearchQuery = Query(...)):
+    """按相关度检索员工"""
+    ids = search_employee_ids(q.q, q.limit)
+    rows = {row['id']: row for row in project_employees(Employee.objects.filter(id__in=ids))}
+    return trusted_response(request, [to_employee_out(rows[pk]) for pk in ids if pk in rows])
+
+
+@router.get("/export")
+def export_employees(request, q: EmployeeExportQuery = Query(...)):
+    """导出员工花名册：CSV、XLSX 按查询条件流式输出，列式按游标分页输出"""
+    from .employee_export import export_columnar, export_employees_response
+    if q.format == 'columnar':
+        return columnar_response(request, export_columnar(filter_employees(q), q))
+    return export_employees_response(request, filter_employees(q), q.format)
+
+
+@router.post("/bulk", response=BulkImportResult)
+def bulk_import_employees(request, q: BulkImportQuery = Query(...)):
+    """批量导入员工，请求体为CSV或JSON Lines"""
+    from .employee_import import import_employees
+    return import_employees(request, q)
+
+
+@router.get("/{employee_id}", auth=async_auth, response=EmployeeOut)
+async def get_employee(request, employee_id: int, q: SparseQuery = Query(...)):
     """获取单个员工信息"""
-    emp = Employee.objects.get(id=employee_id)
-    return {
-        **emp.__dict__,
-        "department_name": emp.department.name,
-        "team_name": emp.team.name if emp.team else None,
-        "created_at": emp.created_at.isoformat(),
-        "updated_at": emp.updated_at.isoformat(),
-        "age": emp.age if emp.birthday else None
-    }
+    selection = EMPLOYEE_FIELDS.select(q.fields, q.include)
+    if selection:
+        row = await aget_object_or_404(selection.project(Employee.objects.all()), id=employee_id)
+        return render_response(request, (await selection.aserialize([row]))[0])
+    row = await aget_object_or_404(project_employees(Employee.objects.all()), id=employee_id)
+    return trusted_response(request, to_employee_out(row))
 
 
 @router.post("/", response=EmployeeOut)
@@ -177,17 +343,10 @@ def create_employee(request, data: EmployeeCreate):
         mobile_phone=data.mobile_phone,
         email=data.email,
         is_active=data.is_active,
-        created_by=request.user
+        created_by_id=request.user.id
     )
     
-    return {
-        **employee.__dict__,
-        "department_name": employee.department.name,
-        "team_name": employee.team.name if employee.team else None,
-        "created_at": employee.created_at.isoformat(),
-        "updated_at": employee.updated_at.isoformat(),
-        "age": employee.age if employee.birthday else None
-    }
+    return to_employee_out(project_employees(Employee.objects.all()).get(id=employee.id))
 
 
 @router.put("/{employee_id}", response=EmployeeOut)
@@ -244,14 +403,20 @@ def update_employee(request, employee_id: int, data: EmployeeUpdate):
     
     employee.save()
     
-    return {
-        **employee.__dict__,
-        "department_name": employee.department.name,
-        "team_name": employee.team.name if employee.team else None,
-        "created_at": employee.created_at.isoformat(),
-        "updated_at": employee.updated_at.isoformat(),
-        "age": employee.age if employee.birthday else None
-    }
+    return to_employee_out(project_employees(Employee.objects.all()).get(id=employee.id))
+
+
+@router.patch("/{employee_id}", response=EmployeeOut)
+def patch_employee(request, employee_id: int, data: EmployeePatch):
+    """部分更新员工信息，仅写入发生变化的字段"""
+    employee = get_object_or_404(Employee, id=employee_id)
+    changed = apply_partial_update(employee, data, {'department_id': Department, 'team_id': ResearchTeam})
+    if changed:
+        if SEARCH_SOURCE_FIELDS.intersection(changed):
+            changed.append('search_text')
+        employee.save(update_fields=[*changed, 'updated_at'])
+
+    return to_employee_out(project_employees(Employee.objects.all()).get(id=employee.id))
 
 
 @router.delete("/{employee_id}")
@@ -0,0 +1,133 @@
+"""列表与详情接口的稀疏字段（fields=）与关联嵌入（include=）
+
+fields 为逗号分隔的字段名，查询只投影这些列（id 总是返回），计算字段（关联名称、年龄、
+成员数量等）也只在被请求时才加入查询；include 嵌入关联对象：外键关联在同一查询中 JOIN 取回，
+反向关联（如部门下的团队）另发一次查询按ID批量取回，与 select_related / prefetch_related 对应。
+
+请求了 fields 或 include 时响应只包含所选字段，不再按完整的输出模型校验。
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Optional, Sequence
+
+from ninja.errors import HttpError
+from pydantic import BaseModel
+
+
+class SparseQuery(BaseModel):
+    # 逗号分隔的字段名与关联名，例如 fields=name,department_name&include=team
+    fields: Optional[str] = None
+    include: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Include:
+    """可嵌入的关联对象
+
+    外键关联指定 relation（外键字段名）；反向关联指定 model 与其指向本模型的外键列 foreign_key。
+    """
+    columns: Sequence[str]
+    relation: Optional[str] = None
+    model: Optional[type] = None
+    foreign_key: Optional[str] = None
+
+    @property
+    def many(self) -> bool:
+        return self.model is not None
+
+
+class FieldSet:
+    """某个资源可选的字段与关联
+
+    columns 为模型上的列；computed 为计算字段名到表达式工厂的映射（在查询时才创建表达式，
+    例如年龄依赖当天日期）；includes 为可嵌入的关联。
+    """
+
+    def __init__(self, columns: Sequence[str], computed: Dict[str, Callable], includes: Dict[str, Include]):
+        self.columns = list(columns)
+        self.computed = computed
+        self.includes = includes
+
+    def select(self, fields: Optional[str], include: Optional[str]) -> Optional['Selection']:
+        """解析查询参数，两者都未提供时返回 None（使用完整的输出模型）"""
+        if not fields and not include:
+            return None
+        names = _split(fields) or [*self.columns, *self.computed]
+        unknown = [name for name in names if name not in self.columns and name not in self.computed]
+        if unknown:
+            raise HttpError(400, f"未知的字段：{', '.join(unknown)}")
+        relations = _split(include)
+        unknown = [name for name in relations if name not in self.includes]
+        if unknown:
+            raise HttpError(400, f"未知的关联：{', '.join(unknown)}")
+        if 'id' not in names:
+            names.insert(0, 'id')
+        return Selection(self, names, relations)
+
+
+class Selection:
+    """一次请求选定的字段与关联"""
+
+    def __init__(self, fieldset: FieldSet, fields, includes):
+        self.fieldset = fieldset
+        self.fields = fields
+        self.includes = includes
+
+    @property
+    def columns(self) -> list:
+        """序列化后各行的键：所选字段及嵌入的关联"""
+        return [*self.fields, *self.includes]
+
+    def project(self, queryset, extra: Sequence[str] = ()):
+        """投影为 values() 查询集；extra 为分页等内部需要、序列化时去掉的列"""
+        columns = [name for name in (*self.fields, *extra) if name in self.fieldset.columns]
+        expressions = {name: self.fieldset.computed[name]() for name in self.fields if name in self.fieldset.computed}
+        # 聚合字段先 annotate，再由 values() 按所选列分组（F() 等未解析的引用没有 contains_aggregate）
+        aggregates = {name: expression for name, expression in expressions.items() if getattr(expression, 'contains_aggregate', False)}
+        if aggregates:
+            queryset = queryset.annotate(**aggregates)
+        joined = [
+            f'{include.relation}__{column}'
+            for include in map(self.fieldset.includes.get, self.includes) if not include.many
+            for column in include.columns
+        ]
+        return queryset.values(
+            *dict.fromkeys([*columns, *aggregates]), *joined,
+            **{name: expression for name, expression in expressions.items() if name not in aggregates},
+        )
+
+    async def aserialize(self, rows: list) -> list:
+        """整理投影行：嵌入关联对象、日期转为 ISO 格式、去掉未请求的列"""
+        items = []
+        for row in rows:
+            item = {name: _json_value(row[name]) for name in self.fields}
+            for name in self.includes:
+                include = self.fieldset.includes[name]
+                if not include.many:
+                    related = {column: _json_value(row[f'{include.relation}__{column}']) for column in include.columns}
+                    # 可为空的外键经 LEFT JOIN 取回的各列均为空
+                    item[name] = related if related['id'] is not None else None
+            items.append(item)
+
+        ids = [item['id'] for item in items]
+        if not ids:
+            return items
+        for name in self.includes:
+            include = self.fieldset.includes[name]
+            if include.many:
+                grouped = {pk: [] for pk in ids}
+                related = include.model.objects.filter(**{f'{include.foreign_key}__in': ids}).order_by('id')
+                async for row in related.values(include.foreign_key, *include.columns):
+                    grouped[row.pop(include.foreign_key)].append({key: _json_value(value) for key, value in row.items()})
+                for item in items:
+                    item[name] = grouped[item['id']]
+        return items
+
+
+def _split(value: Optional[str]) -> list:
+    return list(dict.fromkeys(name.strip() for name in (value or '').split(',') if name.strip()))
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
@@ -0,0 +1,208 @@
+"""接口请求的耗时与查询统计
+
+中间件为每个请求记录总耗时、数据库查询次数与耗时、响应大小：
+
+- 通过 Server-Timing 响应头返回，浏览器开发者工具可直接查看；
+- 按 (方法, 路由, 状态码) 累计到进程内的指标表，由 /api/metrics 以 Prometheus 文本格式输出；
+- 超过 API_SLOW_REQUEST_MS 的请求连同其执行的 SQL（不含参数值，避免个人信息进入日志）写入 api.slow 日志。
+
+查询统计通过数据库连接的 execute_wrapper 实现，当前请求的统计对象保存在 contextvar 中，
+异步视图经 sync_to_async 在线程中执行的查询同样会计入发起它的请求。
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger('api.slow')
+
+# 请求耗时直方图的分桶上限（秒）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 慢请求日志中每个请求最多保留的 SQL 条数
+SLOW_LOG_MAX_STATEMENTS = 100
+
+
+class RequestMetrics:
+    """单个请求的数据库查询统计"""
+
+    def __init__(self, capture_sql: bool):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = [] if capture_sql else None
+
+    def record(self, sql: str, duration: float):
+        self.queries += 1
+        self.db_time += duration
+        if self.statements is not None and len(self.statements) < SLOW_LOG_MAX_STATEMENTS:
+            self.statements.append((sql, duration))
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('api_request_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper：把查询计入当前请求的统计，请求之外的查询直接执行"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# 连接按线程创建，新连接建立时安装；导入前当前线程已建立的连接在此补装
+connection_created.connect(install_query_recorder, dispatch_uid='api.instrumentation.install_query_recorder')
+for _connection in connections.all(initialized_only=True):
+    install_query_recorder(_connection)
+
+
+class MetricsRegistry:
+    """进程内的按路由指标表
+
+    多进程部署时每个进程各自累计，由 Prometheus 分别抓取后按实例汇总。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float, queries: int, db_time: float,
+                size: Optional[int]):
+        with self._lock:
+            series = self._series.get((method, route, status))
+            if series is None:
+                series = self._series[(method, route, status)] = {
+                    'requests': 0, 'duration': 0.0, 'buckets': [0] * len(DURATION_BUCKETS),
+                    'queries': 0, 'db_time': 0.0, 'bytes': 0,
+                }
+            series['requests'] += 1
+            series['duration'] += duration
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    series['buckets'][index] += 1
+            series['queries'] += queries
+            series['db_time'] += db_time
+            series['bytes'] += size or 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {key: {**series, 'buckets': list(series['buckets'])} for key, series in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式输出"""
+        series = sorted(self.snapshot().items())
+        lines = []
+
+        def family(name, kind, help_text, value):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, data in series:
+                lines.append(f'{name}{{{_labels(*key)}}} {_number(value(data))}')
+
+        family('hr_api_requests_total', 'counter', 'Requests handled.', lambda data: data['requests'])
+        lines.append('# HELP hr_api_request_duration_seconds Request wall time.')
+        lines.append('# TYPE hr_api_request_duration_seconds histogram')
+        for key, data in series:
+            labels = _labels(*key)
+            for bound, count in zip(DURATION_BUCKETS, data['buckets']):
+                lines.append(f'hr_api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'hr_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {data["requests"]}')
+            lines.append(f'hr_api_request_duration_seconds_sum{{{labels}}} {_number(data["duration"])}')
+            lines.append(f'hr_api_request_duration_seconds_count{{{labels}}} {data["requests"]}')
+        family('hr_api_db_queries_total', 'counter', 'Database queries executed.', lambda data: data['queries'])
+        family('hr_api_db_duration_seconds_total', 'counter', 'Time spent in database queries.',
+               lambda data: data['db_time'])
+        family('hr_api_response_bytes_total', 'counter', 'Response body bytes (streaming responses excluded).',
+               lambda data: data['bytes'])
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(method: str, route: str, status: int) -> str:
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'method="{method}",route="{route}",status="{status}"'
+
+
+def _number(value) -> str:
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
+
+
+def _api_route(request) -> Optional[str]:
+    """API 请求的路由模板（如 /api/employees/<employee_id>），非 API 请求返回 None"""
+    match = request.resolver_match
+    if match is None or 'api' not in match.namespaces:
+        return None
+    return f'/{match.route}'
+
+
+def _start():
+    return time.perf_counter(), RequestMetrics(capture_sql=settings.API_SLOW_REQUEST_MS > 0)
+
+
+def _finish(request, response, started: float, metrics: RequestMetrics):
+    route = _api_route(request)
+    if route is None:
+        return
+    duration = time.perf_counter() - started
+    size = None if response.streaming else len(response.content)
+    registry.observe(request.method, route, response.status_code, duration, metrics.queries, metrics.db_time, size)
+
+    response['Server-Timing'] = (
+        f'total;dur={duration * 1000:.1f}, db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"'
+    )
+
+    threshold = settings.API_SLOW_REQUEST_MS
+    if threshold > 0 and duration * 1000 >= threshold:
+        statements = '\n'.join(f'  [{seconds * 1000:.1f}ms] {sql}' for sql, seconds in metrics.statements)
+        logger.warning(
+            '慢请求 %s %s -> %s：%.1fms，%d 次查询，数据库 %.1fms\n%s',
+            request.method, request.get_full_path(), response.status_code,
+            duration * 1000, metrics.queries, metrics.db_time * 1000, statements,
+        )
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """记录 API 请求的耗时、查询次数与响应大小"""
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            started, metrics = _start()
+            token = _current.set(metrics)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            _finish(request, response, started, metrics)
+            return response
+    else:
+        def middleware(request):
+            started, metrics = _start()
+            token = _current.set(metrics)
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            _finish(request, response, started, metrics)
+            return response
+    return middleware
@@ -0,0 +1,28 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from ninja import Router
+from ninja.security import HttpBearer
+
+from .instrumentation import registry
+
+router = Router()
+
+
+class MetricsTokenAuth(HttpBearer):
+    """抓取指标使用的固定令牌认证；未配置 API_METRICS_TOKEN 时不需认证，应由反向代理限制访问来源"""
+
+    def __call__(self, request):
+        if not settings.API_METRICS_TOKEN:
+            return True
+        return super().__call__(request)
+
+    def authenticate(self, request, token):
+        return hmac.compare_digest(token, settings.API_METRICS_TOKEN) or None
+
+
+@router.get("", auth=MetricsTokenAuth(), include_in_schema=False)
+def metrics(request):
+    """按路由统计的请求数、耗时、查询次数与响应大小（Prometheus 文本格式）"""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from ninja.errors import HttpError
+from pydantic import BaseModel
+
+from hr_backend.cache import aget_version, count_namespace, get_version
+
+T = TypeVar('T')
+
+# 统计总数时忽略的分页、字段选择与响应格式参数
+PAGINATION_PARAMS = {'page', 'page_size', 'cursor', 'fields', 'include', 'format'}
+
+# 游标分页固定按 (created_at, id) 倒序，与各模型上的复合索引对应
+CURSOR_ORDERING = ('-created_at', '-id')
+
+# 游标分页要求投影中包含的列
+CURSOR_COLUMNS = ('created_at', 'id')
+
+
+class Page(BaseModel, Generic[T]):
+    """列表接口的分页响应"""
+    items: List[T]
+    total: int
+    page: int
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
+def _count_cache_key(namespace: str, version: int, filters: BaseModel) -> str:
+    normalized = {
+        key: value for key, value in filters.model_dump(exclude=PAGINATION_PARAMS).items()
+        if value is not None
+    }
+    digest = hashlib.md5(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+    return f'{namespace}:{version}:{digest}'
+
+
+def cached_count(queryset, filters: BaseModel) -> int:
+    """返回查询集的总数，按规范化后的过滤条件缓存
+
+    模型写入时通过信号递增命名空间版本号，缓存随之失效。
+    """
+    namespace = count_namespace(queryset.model)
+    key = _count_cache_key(namespace, get_version(namespace), filters)
+
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, settings.LIST_COUNT_CACHE_TIMEOUT)
+    return total
+
+
+async def acached_count(queryset, filters: BaseModel) -> int:
+    """cached_count 的异步版本"""
+    namespace = count_namespace(queryset.model)
+    key = _count_cache_key(namespace, await aget_version(namespace), filters)
+
+    total = await cache.aget(key)
+    if total is None:
+        total = await queryset.acount()
+        await cache.aset(key, total, settings.LIST_COUNT_CACHE_TIMEOUT)
+    return total
+
+
+def encode_cursor(row: dict) -> str:
+    """将一行的 (created_at, id) 编码为不透明游标"""
+    payload = json.dumps([row['created_at'].isoformat(), row['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """解码游标，返回 (created_at, id)"""
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError):
+        raise HttpError(400, '无效的分页游标')
+
+
+def _cursor_page(queryset, cursor: str, page_size: int):
+    queryset = queryset.order_by(*CURSOR_ORDERING)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # 外层的 created_at__lte 让数据库可以直接在索引上定位起点
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(id__lt=pk),
+            created_at__lte=created_at,
+        )
+    # 多取一行用于判断是否还有下一页
+    return queryset[:page_size + 1]
+
+
+def _split_page(rows: list, page_size: int):
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
+
+
+def paginate_by_cursor(queryset, cursor: str, page_size: int):
+    """按游标取一页数据，返回 (行列表, 下一页游标)
+
+    queryset 需为包含 created_at 与 id 列的 values() 查询集；
+    cursor 为空字符串时返回第一页。
+    """
+    return _split_page(list(_cursor_page(queryset, cursor, page_size)), page_size)
+
+
+async def apaginate_by_cursor(queryset, cursor: str, page_size: int):
+    """paginate_by_cursor 的异步版本"""
+    return _split_page([row async for row in _cursor_page(queryset, cursor, page_size)], page_size)
@@ -0,0 +1,49 @@
+from typing import Dict, List, Optional, Type
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from ninja.errors import HttpError
+from pydantic import BaseModel, create_model
+from pydantic.fields import FieldInfo
+
+
+def partial_schema(name: str, base: Type[BaseModel]) -> Type[BaseModel]:
+    """生成部分更新（PATCH）用的请求体模型
+
+    所有字段均可省略，但字段类型保持不变：非空字段显式传入 null 仍会校验失败。
+    """
+    fields = {
+        field: (info.annotation, FieldInfo.merge_field_infos(info, default=None))
+        for field, info in base.model_fields.items()
+    }
+    return create_model(name, **fields)
+
+
+def apply_partial_update(
+    instance: models.Model,
+    data: BaseModel,
+    related: Optional[Dict[str, Type[models.Model]]] = None,
+) -> List[str]:
+    """将请求中显式传入的字段写入实例，返回实际发生变化的字段
+
+    related 为需要校验存在性的外键字段及其关联模型，仅在外键值变化时才查询。
+    调用方负责以 save(update_fields=...) 保存返回的字段。
+    """
+    changed = {}
+    for name, value in data.model_dump(exclude_unset=True).items():
+        field = instance._meta.get_field(name)
+        try:
+            value = field.to_python(value)
+        except ValidationError as exc:
+            raise HttpError(400, f'{name}: {"；".join(exc.messages)}')
+        if getattr(instance, field.attname) != value:
+            changed[field.attname] = value
+
+    for name, model in (related or {}).items():
+        value = changed.get(name)
+        if value is not None and not model.objects.filter(pk=value).exists():
+            raise HttpError(400, f'{name}: {model._meta.verbose_name} {value} 不存在')
+
+    for name, value in changed.items():
+        setattr(instance, name, value)
+    return list(changed)
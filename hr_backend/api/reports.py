@@ -0,0 +1,42 @@
+from ninja import Router, Query
+from datetime import date, timedelta
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from employees.reports import aget_cached_forecast
+
+from .security import async_auth
+
+router = Router()
+
+class ForecastQuery(BaseModel):
+    report: Literal['retirement', 'promotion', 'anniversary']
+    # 预测窗口：从 start（默认今天）起的 days 天，含首尾
+    start: Optional[date] = None
+    days: int = Field(365, ge=1, le=3660)
+
+class ForecastItem(BaseModel):
+    id: int
+    employee_id: str
+    name: str
+    department_id: int
+    department_name: str
+    # retirement、promotion_title、promotion_position、anniversary
+    kind: str
+    reason: str
+    base_date: str
+    event_date: str
+    years: int
+
+class ForecastReport(BaseModel):
+    report: str
+    start: str
+    end: str
+    total: int
+    items: List[ForecastItem]
+
+
+@router.get("/forecast", auth=async_auth, response=ForecastReport)
+async def get_forecast(request, q: ForecastQuery = Query(...)):
+    """预测窗口内达到退休年龄、具备晋升资格或迎来入所纪念周年的在职员工"""
+    start = q.start or date.today()
+    return await aget_cached_forecast(q.report, start, start + timedelta(days=q.days - 1))
@@ -0,0 +1,313 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from jose import JWTError, jwt
+from ninja.security import HttpBearer
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenUser:
+    """由令牌声明和缓存的用户快照构成的请求主体
+
+    只包含鉴权所需的字段，认证时无需再从数据库加载完整的用户对象。
+    """
+    id: int
+    username: str
+    is_active: bool
+    is_staff: bool
+    is_superuser: bool
+    password_fingerprint: str
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def pk(self):
+        return self.id
+
+    @classmethod
+    def from_user(cls, user) -> 'TokenUser':
+        return cls(
+            id=user.pk,
+            username=user.get_username(),
+            is_active=user.is_active,
+            is_staff=user.is_staff,
+            is_superuser=user.is_superuser,
+            password_fingerprint=password_fingerprint(user),
+        )
+
+
+def password_fingerprint(user) -> str:
+    """密码指纹，写入令牌声明；修改密码后此前签发的令牌全部失效"""
+    return user.get_session_auth_hash()[:16]
+
+
+class BoundedCache:
+    """进程内有界缓存，按最近最少使用淘汰，条目默认在 ttl 秒后过期"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def evict(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# 条目为 (用户版本标记, TokenUser)，版本标记与共享缓存中的不一致时重新加载
+user_cache = BoundedCache(settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL)
+
+# 已校验的令牌载荷，按令牌摘要缓存，条目在令牌过期时失效
+token_cache = BoundedCache(settings.JWT_TOKEN_CACHE_SIZE, settings.JWT_ACCESS_TOKEN_LIFETIME)
+
+
+def _user_version_key(user_id) -> str:
+    return f'jwt:user:{user_id}'
+
+
+def _evict_user(sender, instance, **kwargs):
+    """用户保存（含停用、修改密码）或删除后移出缓存
+
+    本进程立即移出；事务提交后在共享缓存中写入新的版本标记，其他进程的缓存条目随之失效。
+    标记只需保留到这些条目过期（JWT_USER_CACHE_TTL）。
+    """
+    user_id = instance.pk
+    user_cache.evict(user_id)
+
+    def bump_version():
+        user_cache.evict(user_id)
+        caches[settings.JWT_REVOCATION_CACHE].set(
+            _user_version_key(user_id), uuid.uuid4().hex, timeout=settings.JWT_USER_CACHE_TTL + 1,
+        )
+
+    transaction.on_commit(bump_version)
+
+
+# api 不是独立的 Django 应用；用户缓存只会在本模块导入后被填充，因此在此连接信号即可
+post_save.connect(_evict_user, sender=User, dispatch_uid='api.security.evict_user')
+post_delete.connect(_evict_user, sender=User, dispatch_uid='api.security.evict_user')
+
+
+def check_revocation_cache():
+    """JWT_REVOCATION_CACHE 为本地内存缓存时，吊销与用户版本标记只对当前进程生效，非调试环境下启动时告警"""
+    backend = settings.CACHES[settings.JWT_REVOCATION_CACHE]['BACKEND']
+    if not settings.DEBUG and backend.endswith('.LocMemCache'):
+        logger.warning(
+            'JWT_REVOCATION_CACHE=%r 为进程内缓存，多进程部署时登出、停用用户与修改密码不会在其他进程生效，'
+            '请配置共享缓存（如 Redis）', settings.JWT_REVOCATION_CACHE,
+        )
+
+
+check_revocation_cache()
+
+
+def _create_token(user_id: int, fingerprint: str, token_type: str, lifetime: int) -> str:
+    payload = {
+        "user_id": user_id,
+        "pwd": fingerprint,
+        "exp": datetime.utcnow() + timedelta(seconds=lifetime),
+        "type": token_type,
+    }
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
+def create_access_token(user_id: int, fingerprint: str) -> str:
+    """创建访问令牌"""
+    return _create_token(user_id, fingerprint, "access", settings.JWT_ACCESS_TOKEN_LIFETIME)
+
+
+def create_refresh_token(user_id: int, fingerprint: str) -> str:
+    """创建刷新令牌"""
+    return _create_token(user_id, fingerprint, "refresh", settings.JWT_REFRESH_TOKEN_LIFETIME)
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """解码并校验令牌签名与有效期"""
+    try:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _revocation_key(digest: str) -> str:
+    return f'jwt:revoked:{digest}'
+
+
+def _cache_verified(token: str, digest: str) -> Optional[dict]:
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        token_cache.set(digest, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+
+def verify_token(token: str) -> Optional[dict]:
+    """校验令牌并返回载荷；已吊销的令牌返回 None，校验结果在进程内缓存至令牌过期"""
+    digest = token_digest(token)
+    # 吊销列表存放在共享缓存中，每次都需检查，确保登出立即对所有进程生效
+    if caches[settings.JWT_REVOCATION_CACHE].get(_revocation_key(digest)):
+        token_cache.evict(digest)
+        return None
+    return _cache_verified(token, digest)
+
+
+async def averify_token(token: str) -> Optional[dict]:
+    """verify_token 的异步版本"""
+    digest = token_digest(token)
+    if await caches[settings.JWT_REVOCATION_CACHE].aget(_revocation_key(digest)):
+        token_cache.evict(digest)
+        return None
+    return _cache_verified(token, digest)
+
+
+def revoke_token(token: str):
+    """将令牌加入吊销列表直至其过期"""
+    payload = decode_token(token)
+    if payload is None:
+        return
+    digest = token_digest(token)
+    remaining = int(payload["exp"] - time.time()) + 1
+    caches[settings.JWT_REVOCATION_CACHE].set(_revocation_key(digest), True, timeout=remaining)
+    token_cache.evict(digest)
+
+
+def _cached_principal(user_id, version) -> Optional[TokenUser]:
+    entry = user_cache.get(user_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def get_principal(user_id) -> Optional[TokenUser]:
+    """获取在职用户的主体，优先读取进程内缓存
+
+    缓存命中时仍比对共享缓存中的用户版本标记，其他进程中的停用、修改密码等操作立即生效。
+    """
+    version = caches[settings.JWT_REVOCATION_CACHE].get(_user_version_key(user_id))
+    principal = _cached_principal(user_id, version)
+    if principal is None:
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            return None
+        principal = TokenUser.from_user(user)
+        user_cache.set(user_id, (version, principal))
+    return principal
+
+
+async def aget_principal(user_id) -> Optional[TokenUser]:
+    """get_principal 的异步版本"""
+    version = await caches[settings.JWT_REVOCATION_CACHE].aget(_user_version_key(user_id))
+    principal = _cached_principal(user_id, version)
+    if principal is None:
+        user = await User.objects.filter(pk=user_id, is_active=True).afirst()
+        if user is None:
+            return None
+        principal = TokenUser.from_user(user)
+        user_cache.set(user_id, (version, principal))
+    return principal
+
+
+def _claims_valid(payload: Optional[dict], token_type: str) -> bool:
+    return bool(payload) and payload.get("type") == token_type and bool(payload.get("user_id"))
+
+
+def _password_matches(payload: dict, principal: Optional[TokenUser]) -> bool:
+    return principal is not None and payload.get("pwd") == principal.password_fingerprint
+
+
+def resolve_token(token: str, token_type: str) -> Optional[TokenUser]:
+    """校验令牌并返回对应的用户主体，令牌无效、用户停用或密码已修改时返回 None"""
+    payload = verify_token(token)
+    if not _claims_valid(payload, token_type):
+        return None
+    principal = get_principal(payload["user_id"])
+    return principal if _password_matches(payload, principal) else None
+
+
+async def aresolve_token(token: str, token_type: str) -> Optional[TokenUser]:
+    """resolve_token 的异步版本"""
+    payload = await averify_token(token)
+    if not _claims_valid(payload, token_type):
+        return None
+    principal = await aget_principal(payload["user_id"])
+    return principal if _password_matches(payload, principal) else None
+
+
+class JWTAuth(HttpBearer):
+    """Bearer 访问令牌认证"""
+
+    def authenticate(self, request, token):
+        principal = resolve_token(token, "access")
+        if principal is not None:
+            request.user = principal
+            request.access_token = token
+        return principal
+
+
+class AsyncJWTAuth(HttpBearer):
+    """异步接口使用的 Bearer 访问令牌认证，缓存未命中时通过异步 ORM 加载用户"""
+
+    is_async = True
+
+    async def authenticate(self, request, token):
+        principal = await aresolve_token(token, "access")
+        if principal is not None:
+            request.user = principal
+            request.access_token = token
+        return principal
+
+
+# 异步只读接口的认证实例，其余接口使用 NinjaAPI 的默认认证
+async_auth = AsyncJWTAuth()
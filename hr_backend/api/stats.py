@@ -0,0 +1,36 @@
+from ninja import Router
+from typing import List, Union
+from pydantic import BaseModel
+from employees.stats import aget_cached_employee_stats
+
+from .security import async_auth
+
+router = Router()
+
+class StatItem(BaseModel):
+    # 选项代码；性别为布尔值，“未填写”为 None
+    key: Union[bool, str, None]
+    label: str
+    count: int
+
+class DepartmentStat(BaseModel):
+    id: int
+    name: str
+    count: int
+
+class EmployeeStats(BaseModel):
+    total: int
+    by_department: List[DepartmentStat]
+    by_gender: List[StatItem]
+    by_age_band: List[StatItem]
+    by_political_status: List[StatItem]
+    by_professional_title: List[StatItem]
+    by_education: List[StatItem]
+    by_degree: List[StatItem]
+    as_of: str
+
+
+@router.get("/", auth=async_auth, response=EmployeeStats)
+async def get_employee_stats(request):
+    """获取在职员工的人数分布统计（按部门、性别、年龄段、政治面貌、职称、学历、学位）"""
+    return await aget_cached_employee_stats()
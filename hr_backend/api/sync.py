@@ -0,0 +1,95 @@
+from ninja import Router, Query
+from ninja.errors import HttpError
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Optional
+from pydantic import BaseModel
+from django.conf import settings
+from django.utils import timezone
+from sync.models import SYNC_MODELS, Tombstone
+
+from .departments import DepartmentOut, project_departments, to_department_out
+from .employees import EmployeeOut, project_employees, to_employee_out
+from .renderers import trusted_response
+from .security import async_auth
+from .teams import TeamOut, project_teams, to_team_out
+
+router = Router()
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+PROJECTIONS = {
+    'employees': (project_employees, to_employee_out),
+    'departments': (project_departments, to_department_out),
+    'teams': (project_teams, to_team_out),
+}
+
+class SyncQuery(BaseModel):
+    # 上次同步返回的 token；不传时只返回当前令牌，客户端随后全量加载列表
+    since: Optional[str] = None
+
+class SyncDeleted(BaseModel):
+    employees: List[int]
+    departments: List[int]
+    teams: List[int]
+
+class SyncResult(BaseModel):
+    token: str
+    # 为 True 时客户端应丢弃本地副本，全量加载列表后以本次 token 继续同步
+    reset: bool
+    employees: List[EmployeeOut]
+    departments: List[DepartmentOut]
+    teams: List[TeamOut]
+    deleted: SyncDeleted
+
+
+def encode_sync_token(moment: datetime) -> str:
+    """同步令牌为 UTC 微秒时间戳"""
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_sync_token(token: str) -> datetime:
+    try:
+        return EPOCH + timedelta(microseconds=int(token))
+    except (ValueError, OverflowError):
+        raise HttpError(400, "无效的同步令牌")
+
+
+@router.get("", auth=async_auth, response=SyncResult)
+async def sync_changes(request, q: SyncQuery = Query(...)):
+    """返回令牌之后新增、修改与删除的员工、部门和团队
+
+    令牌比本次查询时间回退 SYNC_WATERMARK_LAG 秒，下次同步会重复返回这段时间内的变更，
+    以覆盖查询时尚未提交的并发写入；客户端按ID覆盖即可。
+    部门、团队或负责人改名、删除时，sync.signals 同时刷新引用方的 updated_at，行中的名称列与
+    被清空的外键随之返回，客户端无需自行关联。
+    """
+    now = timezone.now()
+    result = {
+        "token": encode_sync_token(now - timedelta(seconds=settings.SYNC_WATERMARK_LAG)),
+        "reset": True,
+        **{key: [] for key in SYNC_MODELS},
+        "deleted": {key: [] for key in SYNC_MODELS},
+    }
+    # 令牌早于删除日志保留期时无法得知其间的删除，只能全量重新加载
+    since = decode_sync_token(q.since) if q.since else None
+    if since is None or since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+        return result
+
+    limit = settings.SYNC_MAX_CHANGES
+    changes = {}
+    for key, model in SYNC_MODELS.items():
+        project, to_out = PROJECTIONS[key]
+        queryset = project(model.objects.filter(updated_at__gt=since)).order_by('updated_at', 'id')
+        rows = [row async for row in queryset[:limit + 1]]
+        if len(rows) > limit:
+            return result
+        changes[key] = [to_out(row) for row in rows]
+
+    tombstones = Tombstone.objects.filter(deleted_at__gt=since).order_by('deleted_at', 'id')
+    deleted = {key: [] for key in SYNC_MODELS}
+    async for key, object_id in tombstones.values_list('model', 'object_id')[:limit + 1]:
+        deleted[key].append(object_id)
+    if sum(map(len, deleted.values())) > limit:
+        return result
+
+    return trusted_response(request, {**result, **changes, "reset": False, "deleted": deleted})
@@ -1,9 +1,18 @@
 from ninja import Router, Query
-from typing import List, Optional
+from typing import Literal, Optional
 from pydantic import BaseModel
 from teams.models import ResearchTeam
 from departments.models import Department
 from employees.models import Employee
+from django.db.models import Count, F
+from django.shortcuts import aget_object_or_404, get_object_or_404
+
+from .columnar import columnar_response, enum_columns, to_columnar
+from .fields import FieldSet, Include, SparseQuery
+from .pagination import CURSOR_COLUMNS, CURSOR_ORDERING, Page, acached_count, apaginate_by_cursor
+from .partial import apply_partial_update, partial_schema
+from .renderers import render_response, trusted_response
+from .security import async_auth
 
 router = Router()
 
@@ -19,6 +28,9 @@ class TeamCreate(TeamBase):
 class TeamUpdate(TeamBase):
     pass
 
+# 部分更新：仅提交需要修改的字段
+TeamPatch = partial_schema('TeamPatch', TeamBase)
+
 class TeamOut(TeamBase):
     id: int
     department_name: str
@@ -30,15 +42,59 @@ class TeamOut(TeamBase):
     class Config:
         from_attributes = True
 
-class TeamQuery(BaseModel):
+class TeamQuery(SparseQuery):
     name: Optional[str] = None
     department_id: Optional[int] = None
     page: int = 1
     page_size: int = 10
+    # 游标分页：传入空字符串获取第一页，之后传入上一页返回的 next_cursor
+    cursor: Optional[str] = None
+    # columnar：列式响应，列名与选项标签只发送一次
+    format: Optional[Literal['columnar']] = None
+
+
+TEAM_COLUMNS = ['id', 'name', 'department_id', 'leader_id', 'description', 'created_at', 'updated_at']
+
+
+def project_teams(queryset):
+    """将团队查询集投影为响应所需的列，成员数量通过分组聚合一次算出"""
+    return queryset.annotate(employee_count=Count('employee')).values(
+        *TEAM_COLUMNS,
+        'employee_count',
+        department_name=F('department__name'),
+        leader_name=F('leader__name'),
+    )
+
+
+# 稀疏字段：可选的列、计算字段与可嵌入的关联
+TEAM_FIELDS = FieldSet(
+    TEAM_COLUMNS,
+    {
+        'employee_count': lambda: Count('employee'),
+        'department_name': lambda: F('department__name'),
+        'leader_name': lambda: F('leader__name'),
+    },
+    {
+        'department': Include(('id', 'name'), relation='department'),
+        'leader': Include(('id', 'employee_id', 'name'), relation='leader'),
+    },
+)
+
+
+def to_team_out(row: dict) -> dict:
+    """将投影行转换为TeamOut格式"""
+    row['created_at'] = row['created_at'].isoformat()
+    row['updated_at'] = row['updated_at'].isoformat()
+    return row
+
 
+# 列式响应的列与选项字段
+TEAM_OUT_COLUMNS = list(TeamOut.model_fields)
+TEAM_ENUMS = enum_columns(ResearchTeam, TEAM_OUT_COLUMNS)
 
-@router.get("/", response=List[TeamOut])
-def list_teams(request, q: TeamQuery = Query(...)):
+
+@router.get("/", auth=async_auth, response=Page[TeamOut])
+async def list_teams(request, q: TeamQuery = Query(...)):
     """获取科研团队列表"""
     queryset = ResearchTeam.objects.all()
     
@@ -48,45 +104,42 @@ def list_teams(request, q: TeamQuery = Query(...)):
     if q.department_id:
         queryset = queryset.filter(department_id=q.department_id)
     
-    # 分页
-    offset = (q.page - 1) * q.page_size
-    teams = queryset[offset:offset + q.page_size]
+    selection = TEAM_FIELDS.select(q.fields, q.include)
+    projected = selection.project(queryset, extra=CURSOR_COLUMNS) if selection else project_teams(queryset)
     
-    # 转换为响应格式
-    result = []
-    for team in teams:
-        result.append({
-            "id": team.id,
-            "name": team.name,
-            "department_id": team.department.id,
-            "department_name": team.department.name,
-            "leader_id": team.leader.id if team.leader else None,
-            "leader_name": team.leader.name if team.leader else None,
-            "description": team.description,
-            "created_at": team.created_at.isoformat(),
-            "updated_at": team.updated_at.isoformat(),
-            "employee_count": team.employee_set.count()
-        })
+    # 分页
+    next_cursor = None
+    if q.cursor is not None:
+        rows, next_cursor = await apaginate_by_cursor(projected, q.cursor, q.page_size)
+    else:
+        offset = (q.page - 1) * q.page_size
+        # 与游标分页相同的排序键，(created_at, id) 唯一确定顺序，翻页时不会重复或遗漏
+        rows = [row async for row in projected.order_by(*CURSOR_ORDERING)[offset:offset + q.page_size]]
     
-    return result
+    page = {
+        "total": await acached_count(queryset, q),
+        "page": q.page,
+        "page_size": q.page_size,
+        "next_cursor": next_cursor,
+    }
+    items = await selection.aserialize(rows) if selection else [to_team_out(row) for row in rows]
+    if q.format == 'columnar':
+        columns = selection.columns if selection else TEAM_OUT_COLUMNS
+        return columnar_response(request, {**to_columnar(items, columns, TEAM_ENUMS), **page})
+    if selection:
+        return render_response(request, {"items": items, **page})
+    return trusted_response(request, {"items": items, **page})
 
 
-@router.get("/{team_id}", response=TeamOut)
-def get_team(request, team_id: int):
+@router.get("/{team_id}", auth=async_auth, response=TeamOut)
+async def get_team(request, team_id: int, q: SparseQuery = Query(...)):
     """获取单个科研团队信息"""
-    team = ResearchTeam.objects.get(id=team_id)
-    return {
-        "id": team.id,
-        "name": team.name,
-        "department_id": team.department.id,
-        "department_name": team.department.name,
-        "leader_id": team.leader.id if team.leader else None,
-        "leader_name": team.leader.name if team.leader else None,
-        "description": team.description,
-        "created_at": team.created_at.isoformat(),
-        "updated_at": team.updated_at.isoformat(),
-        "employee_count": team.employee_set.count()
-    }
+    selection = TEAM_FIELDS.select(q.fields, q.include)
+    if selection:
+        row = await aget_object_or_404(selection.project(ResearchTeam.objects.all()), id=team_id)
+        return render_response(request, (await selection.aserialize([row]))[0])
+    row = await aget_object_or_404(project_teams(ResearchTeam.objects.all()), id=team_id)
+    return trusted_response(request, to_team_out(row))
 
 
 @router.post("/", response=TeamOut)
@@ -102,18 +155,7 @@ def create_team(request, data: TeamCreate):
         description=data.description
     )
     
-    return {
-        "id": team.id,
-        "name": team.name,
-        "department_id": team.department.id,
-        "department_name": team.department.name,
-        "leader_id": team.leader.id if team.leader else None,
-        "leader_name": team.leader.name if team.leader else None,
-        "description": team.description,
-        "created_at": team.created_at.isoformat(),
-        "updated_at": team.updated_at.isoformat(),
-        "employee_count": 0
-    }
+    return to_team_out(project_teams(ResearchTeam.objects.all()).get(id=team.id))
 
 
 @router.put("/{team_id}", response=TeamOut)
@@ -131,18 +173,18 @@ def update_team(request, team_id: int, data: TeamUpdate):
     
     team.save()
     
-    return {
-        "id": team.id,
-        "name": team.name,
-        "department_id": team.department.id,
-        "department_name": team.department.name,
-        "leader_id": team.leader.id if team.leader else None,
-        "leader_name": team.leader.name if team.leader else None,
-        "description": team.description,
-        "created_at": team.created_at.isoformat(),
-        "updated_at": team.updated_at.isoformat(),
-        "employee_count": team.employee_set.count()
-    }
+    return to_team_out(project_teams(ResearchTeam.objects.all()).get(id=team.id))
+
+
+@router.patch("/{team_id}", response=TeamOut)
+def patch_team(request, team_id: int, data: TeamPatch):
+    """部分更新团队信息，仅写入发生变化的字段"""
+    team = get_object_or_404(ResearchTeam, id=team_id)
+    changed = apply_partial_update(team, data, {'department_id': Department, 'leader_id': Employee})
+    if changed:
+        team.save(update_fields=[*changed, 'updated_at'])
+
+    return to_team_out(project_teams(ResearchTeam.objects.all()).get(id=team.id))
 
 
 @router.delete("/{team_id}")
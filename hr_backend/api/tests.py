@@ -0,0 +1,282 @@
+import itertools
+import json
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils.translation import gettext_lazy
+from ninja.responses import NinjaJSONEncoder
+from pydantic import BaseModel
+
+from . import security
+from .employees import to_employee_out
+from .instrumentation import registry
+from .renderers import ORJSONRenderer
+from .security import BoundedCache, create_access_token, get_principal, password_fingerprint, token_cache, user_cache
+
+User = get_user_model()
+
+
+class APITestCase(TestCase):
+    """接口测试基类：测试客户端默认携带有效的访问令牌"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user('api-tester')
+        cls.token = create_access_token(cls.user.id, password_fingerprint(cls.user))
+
+    def setUp(self):
+        # 各测试类回滚后用户ID可能被复用，先清空进程内缓存再预热，查询次数断言只统计接口本身的查询
+        user_cache.clear()
+        token_cache.clear()
+        get_principal(self.user.id)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {self.token}'
+
+    @property
+    def auth_headers(self):
+        # AsyncClient 不使用 self.client 的默认请求头，每次请求需传入
+        return {'Authorization': f'Bearer {self.token}'}
+
+    def assertNoTableScan(self, queryset, table):
+        """断言查询计划经由索引访问 table，而不是全表扫描（SQLite 的 EXPLAIN QUERY PLAN 输出）"""
+        plan = queryset.explain()
+        self.assertIsNone(re.search(rf'\bSCAN {table}\b(?! USING)', plan), plan)
+
+
+class JWTAuthTests(APITestCase):
+    """令牌认证与用户缓存测试"""
+
+    url = '/api/departments/tree'
+
+    def test_missing_or_invalid_token_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION='').status_code, 401)
+        self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION='Bearer invalid').status_code, 401)
+
+    def test_cached_principal_skips_user_query(self):
+        self.client.get(self.url)  # 预热部门树缓存
+        user_cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_password_change_revokes_tokens(self):
+        self.client.get(self.url)
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('new-password')
+        user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivation_revokes_tokens(self):
+        self.client.get(self.url)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_user_changes_in_other_processes_invalidate_cache(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        # 模拟在其他进程中停用：本进程的缓存条目不会被直接移出，只能经共享缓存中的版本标记发现
+        with mock.patch.object(user_cache, 'evict'), self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_verified_token_is_cached(self):
+        with mock.patch.object(security, 'decode_token', wraps=security.decode_token) as decode:
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_logout_revokes_tokens(self):
+        cache.clear()
+        User.objects.create_user('lisi', password='secret-123')
+        tokens = self.client.post(
+            '/api/auth/login', {'username': 'lisi', 'password': 'secret-123'}, content_type='application/json',
+        ).json()
+        headers = {'HTTP_AUTHORIZATION': f"Bearer {tokens['access_token']}"}
+        self.assertEqual(self.client.get(self.url, **headers).status_code, 200)
+        response = self.client.post(
+            '/api/auth/logout', {'refresh_token': tokens['refresh_token']}, content_type='application/json', **headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url, **headers).status_code, 401)
+        response = self.client.post(
+            '/api/auth/refresh', {'refresh_token': tokens['refresh_token']}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 401)
+        # 其他令牌不受影响
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_login_and_refresh(self):
+        User.objects.create_user('zhangsan', password='secret-123')
+        tokens = self.client.post(
+            '/api/auth/login', {'username': 'zhangsan', 'password': 'secret-123'}, content_type='application/json',
+        ).json()
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        self.assertEqual(response.status_code, 200)
+        # 刷新令牌不能用作访问令牌
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {tokens['refresh_token']}")
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(
+            '/api/auth/refresh', {'refresh_token': tokens['refresh_token']}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class AsyncReadEndpointTests(APITestCase):
+    """异步只读接口与异步认证测试"""
+
+    async def test_async_endpoints_authenticate(self):
+        client = AsyncClient()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        user_cache.clear()  # 缓存未命中时经异步 ORM 加载用户
+        response = await client.get('/api/departments/', {'cursor': ''}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 0)
+        self.assertEqual((await client.get('/api/employees/999999', headers=headers)).status_code, 404)
+        self.assertEqual((await client.get('/api/departments/tree', headers=headers)).status_code, 200)
+        self.assertEqual((await client.get('/api/teams/')).status_code, 401)
+
+
+class InstrumentationTests(APITestCase):
+    """接口耗时与查询统计测试"""
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        cache.clear()
+
+    def test_server_timing_reports_query_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/departments/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+        series = registry.snapshot()[('GET', '/api/departments/', 200)]
+        self.assertEqual(series['requests'], 1)
+        self.assertEqual(series['queries'], len(queries))
+        self.assertEqual(series['bytes'], len(response.content))
+
+    def test_routes_are_labelled_by_template(self):
+        self.client.get('/api/employees/1')
+        self.client.get('/api/employees/2')
+        self.assertEqual(registry.snapshot()[('GET', '/api/employees/<employee_id>', 404)]['requests'], 2)
+
+    async def test_async_views_count_queries_run_in_threads(self):
+        response = await AsyncClient().get('/api/teams/', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        # 列表查询与计数查询均在 sync_to_async 的线程中执行
+        self.assertEqual(registry.snapshot()[('GET', '/api/teams/', 200)]['queries'], 2)
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/departments/')
+        response = self.client.get('/api/metrics', HTTP_AUTHORIZATION='')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('hr_api_requests_total{method="GET",route="/api/departments/",status="200"} 1', body)
+        self.assertIn('# TYPE hr_api_request_duration_seconds histogram', body)
+        self.assertIn('hr_api_request_duration_seconds_bucket{method="GET",route="/api/departments/",status="200",le="+Inf"} 1', body)
+
+        with override_settings(API_METRICS_TOKEN='scrape-secret'):
+            self.assertEqual(self.client.get('/api/metrics').status_code, 401)
+            response = self.client.get('/api/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+            self.assertEqual(response.status_code, 200)
+
+    @override_settings(API_SLOW_REQUEST_MS=1)
+    def test_slow_request_log_includes_sql(self):
+        # 每次计时前进 0.1 秒，请求必然超过阈值
+        with mock.patch('api.instrumentation.time.perf_counter', side_effect=itertools.count(0, 0.1)):
+            with self.assertLogs('api.slow', 'WARNING') as logs:
+                self.client.get('/api/departments/')
+        self.assertIn('GET /api/departments/', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """orjson 渲染器与默认 JSON 编码器的输出一致性测试"""
+
+    def test_matches_default_encoder(self):
+        class Item(BaseModel):
+            name: str
+
+        data = {
+            'items': [{'name': '员工', 'birthday': date(1990, 1, 2), 'item': Item(name='部门')}],
+            'created_at': datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone.utc),
+            'amount': Decimal('1.50'),
+            'label': gettext_lazy('群众'),
+            1: None,
+        }
+        content = ORJSONRenderer().render(None, data, response_status=200)
+        self.assertEqual(json.loads(content), json.loads(json.dumps(data, cls=NinjaJSONEncoder)))
+        self.assertIn(b'"2024-05-06T07:08:09.123Z"', content)
+
+
+class TrustedRowsTests(APITestCase):
+    """信任投影行时跳过输出模型校验的测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from departments.models import Department
+        from employees.tests import create_employees
+        create_employees(Department.objects.create(name='科研处'), 3)
+
+    def test_trusted_rows_render_same_payload(self):
+        trusted = self.client.get('/api/employees/', {'page_size': 3}).json()
+        with override_settings(API_TRUSTED_ROWS=False):
+            validated = self.client.get('/api/employees/', {'page_size': 3}).json()
+        self.assertEqual(trusted, validated)
+        self.assertEqual(len(trusted['items']), 3)
+
+    def test_trusted_rows_skip_validation(self):
+        # 投影多出的列经校验会被输出模型丢弃，信任模式下原样输出
+        with mock.patch('api.employees.to_employee_out', side_effect=lambda row: {**to_employee_out(row), 'extra': 1}):
+            trusted = self.client.get('/api/employees/').json()['items'][0]
+            with override_settings(API_TRUSTED_ROWS=False):
+                validated = self.client.get('/api/employees/').json()['items'][0]
+        self.assertEqual(trusted['extra'], 1)
+        self.assertNotIn('extra', validated)
+
+
+class BoundedCacheTests(SimpleTestCase):
+    """进程内用户缓存测试"""
+
+    def test_evicts_least_recently_used(self):
+        cache = BoundedCache(maxsize=2, ttl=60)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c')
+        self.assertEqual((cache.get(1), cache.get(2), cache.get(3)), ('a', None, 'c'))
+
+    def test_entries_expire(self):
+        cache = BoundedCache(maxsize=2, ttl=-1)
+        cache.set(1, 'a')
+        cache.set(2, 'b', ttl=60)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual((cache.get(2), len(cache)), ('b', 1))
+
+
+class RevocationCacheCheckTests(SimpleTestCase):
+    """吊销缓存配置检查测试"""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    SHARED = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+
+    def test_warns_for_local_cache_outside_debug(self):
+        with override_settings(DEBUG=False, CACHES=self.LOCMEM), self.assertLogs('api.security', 'WARNING'):
+            security.check_revocation_cache()
+
+    def test_silent_for_shared_cache_or_debug(self):
+        for debug, caches in ((False, self.SHARED), (True, self.LOCMEM)):
+            with override_settings(DEBUG=debug, CACHES=caches), self.assertNoLogs('api.security', 'WARNING'):
+                security.check_revocation_cache()
@@ -0,0 +1,141 @@
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+# XML 1.0 不允许出现的控制字符
+ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+
+SHEET_FOOTER = '</sheetData></worksheet>'
+
+
+class _ChunkBuffer:
+    """只写的内存缓冲区，zipfile 写入的数据在每次产出后清空"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _cell(value) -> str:
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c t="n"><v>{value}</v></c>'
+    text = escape(ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(values) -> str:
+    return '<row>' + ''.join(_cell(value) for value in values) + '</row>'
+
+
+class _SheetWriter:
+    """单工作表XLSX的增量写入器，各方法返回此前已压缩、可输出的字节
+
+    使用内联字符串而非共享字符串表，工作表XML边生成边压缩输出，
+    内存占用与行数无关。
+    """
+
+    def __init__(self, sheet_name, flush_every):
+        self.sheet_name = sheet_name
+        self.flush_every = flush_every
+        self.count = 0
+        self.buffer = _ChunkBuffer()
+        self.archive = zipfile.ZipFile(self.buffer, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.sheet = None
+
+    def start(self, header) -> bytes:
+        self.archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        self.archive.writestr('_rels/.rels', ROOT_RELS)
+        self.archive.writestr('xl/workbook.xml', WORKBOOK.format(name=escape(self.sheet_name, {'"': '&quot;'})))
+        self.archive.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+        self.sheet = self.archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True)
+        self.sheet.write((SHEET_HEADER + _row(header)).encode())
+        return self.buffer.pop()
+
+    def write(self, values) -> bytes:
+        self.sheet.write(_row(values).encode())
+        self.count += 1
+        return self.buffer.pop() if self.count % self.flush_every == 0 else b''
+
+    def finish(self) -> bytes:
+        self.sheet.write(SHEET_FOOTER.encode())
+        self.sheet.close()
+        self.archive.close()
+        return self.buffer.pop()
+
+
+def stream_xlsx(header, rows, sheet_name='Sheet1', flush_every=500):
+    """以单工作表XLSX格式逐块产出字节，rows 为可迭代对象"""
+    writer = _SheetWriter(sheet_name, flush_every)
+    yield writer.start(header)
+    for values in rows:
+        chunk = writer.write(values)
+        if chunk:
+            yield chunk
+    yield writer.finish()
+
+
+async def astream_xlsx(header, rows, sheet_name='Sheet1', flush_every=500):
+    """stream_xlsx 的异步版本，rows 为异步可迭代对象"""
+    writer = _SheetWriter(sheet_name, flush_every)
+    yield writer.start(header)
+    async for values in rows:
+        chunk = writer.write(values)
+        if chunk:
+            yield chunk
+    yield writer.finish()
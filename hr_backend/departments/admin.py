@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import Department
 
 @admin.register(Department)
@@ -8,6 +9,7 @@ class DepartmentAdmin(admin.ModelAdmin):
     list_filter = ['parent_department']
     search_fields = ['name', 'description']
     ordering = ['name']
+    list_select_related = ['parent_department', 'leader']
     readonly_fields = ['created_at', 'updated_at', 'employee_count']
     fieldsets = (
         ('部门信息', {
@@ -18,8 +20,13 @@ class DepartmentAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        """在查询中聚合员工数量，避免逐行统计"""
+        return super().get_queryset(request).annotate(_employee_count=Count('employee'))
+    
     def employee_count(self, obj):
         """计算部门员工数量"""
-        return obj.employee_set.count()
+        return obj._employee_count
     
     employee_count.short_description = '员工数量'
+    employee_count.admin_order_field = '_employee_count'
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0002_initial'),
+        ('employees', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['created_at', 'id'], name='department_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0007_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['updated_at'], name='department_updated_idx'),
+        ),
+    ]
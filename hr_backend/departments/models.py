@@ -14,6 +14,12 @@ class Department(models.Model):
     class Meta:
         verbose_name = '部门'
         verbose_name_plural = '部门管理'
+        indexes = [
+            # 游标分页按 (created_at, id) 排序与定位
+            models.Index(fields=['created_at', 'id'], name='department_created_id_idx'),
+            # 增量同步按更新时间查找变更的记录
+            models.Index(fields=['updated_at'], name='department_updated_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from employees.reports import invalidate_employee_reports
+from employees.stats import invalidate_employee_stats
+from hr_backend.cache import bump_version, count_namespace
+from teams.models import ResearchTeam
+from .models import Department
+from .tree import invalidate_department_tree
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=ResearchTeam)
+@receiver(post_delete, sender=ResearchTeam)
+def invalidate_tree_on_change(sender, **kwargs):
+    """部门、团队变更时使部门树缓存失效（员工变更见 employees/signals.py）"""
+    invalidate_department_tree()
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_department_counts(sender, **kwargs):
+    """部门写入后使列表总数缓存失效"""
+    bump_version(count_namespace(sender))
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_stats_on_department_change(sender, **kwargs):
+    """部门名称出现在统计与预测报表中，部门变更后使其缓存失效"""
+    invalidate_employee_stats()
+    invalidate_employee_reports()
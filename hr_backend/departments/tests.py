@@ -1,3 +1,187 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from api.tests import APITestCase
+from employees.models import Employee
+from employees.tests import create_employees
+from teams.models import ResearchTeam
+from .models import Department
+from .tree import build_department_tree
+
+
+class DepartmentListQueryTests(APITestCase):
+    """部门列表接口的查询次数回归测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Department.objects.create(name='研究所')
+        cls.departments = [
+            Department.objects.create(name=f'部门{i}', parent_department=cls.root)
+            for i in range(20)
+        ]
+        employees = create_employees(cls.departments[0], 3)
+        cls.departments[0].leader = employees[0]
+        cls.departments[0].save()
+
+    def test_list_query_count_independent_of_page_size(self):
+        cache.clear()
+        self.client.get('/api/departments/')  # 预热总数缓存
+        for page_size in (1, 21):
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/departments/', {'page_size': page_size})
+            self.assertEqual(len(response.json()['items']), page_size)
+
+    def test_offset_pages_do_not_overlap(self):
+        # 创建时间相同的部门按 id 排序，相邻两页既不重复也不遗漏
+        Department.objects.update(created_at=self.root.created_at)
+        pages = [
+            [row['id'] for row in self.client.get('/api/departments/', {'page': page, 'page_size': 11}).json()['items']]
+            for page in (1, 2)
+        ]
+        expected = sorted([self.root.id, *(department.id for department in self.departments)], reverse=True)
+        self.assertEqual(pages[0] + pages[1], expected)
+
+    def test_detail_counts_and_names(self):
+        dept = self.departments[0]
+        with self.assertNumQueries(1):
+            row = self.client.get(f'/api/departments/{dept.id}').json()
+        self.assertEqual(row['employee_count'], 3)
+        self.assertEqual(row['parent_department_name'], '研究所')
+        self.assertEqual(row['leader_name'], dept.leader.name)
+
+
+class DepartmentTreeTests(APITestCase):
+    """部门树构建测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Department.objects.create(name='研究所')
+        cls.office = Department.objects.create(name='办公室', parent_department=cls.root)
+        cls.lab = Department.objects.create(name='实验室', parent_department=cls.root)
+        cls.group = Department.objects.create(name='课题组', parent_department=cls.lab)
+        create_employees(cls.root, 1)
+        create_employees(cls.lab, 2, start=1)
+        employees = create_employees(cls.group, 3, start=3)
+        cls.lab.leader = employees[0]
+        cls.lab.save()
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_tree_endpoint_uses_constant_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/departments/tree')
+        self.assertEqual(response.status_code, 200)
+        [root] = response.json()
+        self.assertEqual(root['name'], '研究所')
+        self.assertEqual([child['name'] for child in root['children']], ['办公室', '实验室'])
+
+    def test_direct_and_subtree_counts(self):
+        [root] = build_department_tree()
+        office, lab = root['children']
+        self.assertEqual((root['employee_count'], root['total_employee_count']), (1, 6))
+        self.assertEqual((office['employee_count'], office['total_employee_count']), (0, 0))
+        self.assertEqual((lab['employee_count'], lab['total_employee_count']), (2, 5))
+        self.assertEqual(lab['leader_name'], self.lab.leader.name)
+        self.assertEqual(lab['children'][0]['total_employee_count'], 3)
+
+    def test_deep_chain_does_not_recurse(self):
+        parent = self.group
+        for i in range(1500):
+            parent = Department.objects.create(name=f'层级{i}', parent_department=parent)
+        create_employees(parent, 1, start=6)
+        with self.assertNumQueries(2):
+            [root] = build_department_tree()
+        self.assertEqual(root['total_employee_count'], 7)
+
+
+class DepartmentTreeCacheTests(APITestCase):
+    """部门树缓存与ETag测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Department.objects.create(name='研究所')
+        cls.lab = Department.objects.create(name='实验室', parent_department=cls.root)
+        cls.employee = create_employees(cls.root, 1)[0]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_cached_tree_skips_database(self):
+        first = self.client.get('/api/departments/tree')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/departments/tree')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get('/api/departments/tree')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/departments/tree', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_department_write_invalidates(self):
+        etag = self.client.get('/api/departments/tree')['ETag']
+        Department.objects.create(name='办公室', parent_department=self.root)
+        response = self.client.get('/api/departments/tree', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()[0]['children']), 2)
+
+    def test_employee_transfer_invalidates(self):
+        etag = self.client.get('/api/departments/tree')['ETag']
+        employee = Employee.objects.get(pk=self.employee.pk)
+        employee.mobile_phone = '13800000000'
+        employee.save()
+        self.assertEqual(self.client.get('/api/departments/tree')['ETag'], etag)
+
+        employee.department = self.lab
+        employee.save()
+        [root] = self.client.get('/api/departments/tree').json()
+        self.assertEqual(root['employee_count'], 0)
+        self.assertEqual(root['children'][0]['employee_count'], 1)
+
+    def test_employee_delete_invalidates(self):
+        self.client.get('/api/departments/tree')
+        Employee.objects.filter(pk=self.employee.pk).delete()
+        [root] = self.client.get('/api/departments/tree').json()
+        self.assertEqual(root['total_employee_count'], 0)
+
+    def test_patch_rename_invalidates(self):
+        etag = self.client.get('/api/departments/tree')['ETag']
+        response = self.client.patch(f'/api/departments/{self.lab.id}', {'name': '重点实验室'}, content_type='application/json')
+        self.assertEqual(response.json()['parent_department_name'], '研究所')
+        [root] = self.client.get('/api/departments/tree', headers={'If-None-Match': etag}).json()
+        self.assertEqual(root['children'][0]['name'], '重点实验室')
+
+
+class DepartmentSparseFieldsTests(APITestCase):
+    """部门列表的稀疏字段与关联嵌入测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.teams = [ResearchTeam.objects.create(name=f'团队{i}', department=cls.department) for i in range(2)]
+        Department.objects.create(name='办公室')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.get('/api/departments/')  # 预热总数缓存
+
+    def test_fields_skip_unrequested_aggregates(self):
+        with CaptureQueriesContext(connection) as queries:
+            items = self.client.get('/api/departments/', {'fields': 'name'}).json()['items']
+        self.assertEqual({item['name'] for item in items}, {'科研处', '办公室'})
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+    def test_include_teams_uses_one_extra_query(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/departments/', {'fields': 'name,employee_count', 'include': 'teams'})
+        items = {item['name']: item for item in response.json()['items']}
+        self.assertEqual(items['科研处']['employee_count'], 0)
+        self.assertEqual([team['name'] for team in items['科研处']['teams']], ['团队0', '团队1'])
+        self.assertEqual(items['办公室']['teams'], [])
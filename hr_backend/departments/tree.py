@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from employees.models import Employee
+from hr_backend.cache import aget_version, bump_version
+from .models import Department
+
+TREE_CACHE_NAMESPACE = 'department_tree'
+
+# 影响部门树内容的员工字段：所在部门、在职状态、姓名（部门负责人姓名）
+EMPLOYEE_TREE_FIELDS = ('department_id', 'is_active', 'name')
+
+
+def load_employee_counts():
+    """按部门分组统计员工数量，返回 {部门ID: 人数}"""
+    rows = Employee.objects.order_by().values_list('department_id').annotate(total=Count('id'))
+    return dict(rows)
+
+
+def build_department_tree():
+    """构建部门树
+
+    固定两次查询取回全部部门（含负责人姓名）与各部门人数，
+    借助父部门→子部门索引一次遍历完成组装，不使用递归，
+    每个节点同时给出本部门人数 employee_count 与含下级部门的汇总人数 total_employee_count。
+    """
+    departments = Department.objects.order_by('id').values(
+        'id', 'name', 'parent_department_id', 'leader_id', leader_name=F('leader__name'),
+    )
+    counts = load_employee_counts()
+
+    nodes = {}
+    children_index = defaultdict(list)
+    for dept in departments:
+        node = {
+            "id": dept['id'],
+            "name": dept['name'],
+            "leader_id": dept['leader_id'],
+            "leader_name": dept['leader_name'],
+            "employee_count": counts.get(dept['id'], 0),
+            "total_employee_count": 0,
+            "children": children_index[dept['id']],
+        }
+        nodes[dept['id']] = node
+        children_index[dept['parent_department_id']].append(node)
+
+    # 上级部门不存在的节点视为根节点
+    roots = [node for parent_id, children in children_index.items()
+             if parent_id is None or parent_id not in nodes
+             for node in children]
+
+    # 广度优先得到自顶向下的顺序，逆序累加即可得到子树汇总人数
+    order = list(roots)
+    for node in order:
+        order.extend(node["children"])
+    for node in reversed(order):
+        node["total_employee_count"] = node["employee_count"] + sum(
+            child["total_employee_count"] for child in node["children"]
+        )
+
+    return roots
+
+
+async def adepartment_tree_etag() -> str:
+    """当前部门树版本对应的ETag"""
+    return f'"{TREE_CACHE_NAMESPACE}-{await aget_version(TREE_CACHE_NAMESPACE)}"'
+
+
+async def aget_cached_department_tree():
+    """读取缓存的部门树，未命中时在线程中重新构建，返回 (ETag, 部门树)"""
+    version = await aget_version(TREE_CACHE_NAMESPACE)
+    key = f'{TREE_CACHE_NAMESPACE}:{version}'
+    tree = await cache.aget(key)
+    if tree is None:
+        tree = await sync_to_async(build_department_tree)()
+        await cache.aset(key, tree, settings.DEPARTMENT_TREE_CACHE_TIMEOUT)
+    return f'"{TREE_CACHE_NAMESPACE}-{version}"', tree
+
+
+def invalidate_department_tree():
+    """使部门树缓存失效"""
+    bump_version(TREE_CACHE_NAMESPACE)
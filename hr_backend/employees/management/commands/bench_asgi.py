@@ -0,0 +1,83 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import AsyncClient
+from django.test.utils import override_settings
+
+from api.security import create_access_token, password_fingerprint
+from departments.models import Department
+from employees.models import Employee
+from teams.models import ResearchTeam
+
+# 仪表盘首屏同时发出的请求
+DASHBOARD_PATHS = (
+    '/api/employees/?page_size=20',
+    '/api/departments/?page_size=20',
+    '/api/teams/?page_size=20',
+    '/api/departments/tree',
+)
+
+
+class Command(BaseCommand):
+    help = '在 ASGI 下并发加载仪表盘，测量异步只读接口随并发数的吞吐与延迟（数据在事务中生成并回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='临时生成的员工数量')
+        parser.add_argument('--loads', type=int, default=200, help='每个并发级别加载仪表盘的次数')
+        parser.add_argument('--concurrency', default='1,8,32,64', help='逗号分隔的并发级别')
+
+    def handle(self, *args, **options):
+        levels = [int(value) for value in options['concurrency'].split(',')]
+
+        # AsyncClient 固定以 testserver 作为主机名
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            headers = {'Authorization': f'Bearer {self._seed(options["rows"])}'}
+            self.stdout.write(f'每次加载并发请求 {len(DASHBOARD_PATHS)} 个接口，每个级别 {options["loads"]} 次加载，延迟单位毫秒')
+            self.stdout.write(f'{"并发":>4} {"加载/秒":>9} {"p50":>8} {"p95":>8} {"线程数":>6}')
+            for level in levels:
+                rate, p50, p95, threads = async_to_sync(self._run)(headers, options['loads'], level)
+                self.stdout.write(f'{level:>4} {rate:9.1f} {p50:8.2f} {p95:8.2f} {threads:>6}')
+            transaction.set_rollback(True)
+
+    def _seed(self, rows):
+        user = get_user_model().objects.create_user('bench-asgi')
+        departments = Department.objects.bulk_create(Department(name=f'基准部门{i}') for i in range(20))
+        teams = ResearchTeam.objects.bulk_create(
+            ResearchTeam(name=f'基准团队{i}', department=departments[i % 20]) for i in range(40)
+        )
+        Employee.objects.bulk_create(
+            (Employee(
+                employee_id=f'A{i:08d}', name=f'员工{i}', gender=bool(i % 2), id_card_number=f'A{i:017d}',
+                department=departments[i % 20], team=teams[i % 40],
+            ) for i in range(rows)),
+            batch_size=1000,
+        )
+        return create_access_token(user.id, password_fingerprint(user))
+
+    async def _run(self, headers, loads, level):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(level)
+        latencies, max_threads = [], threading.active_count()
+
+        async def load():
+            nonlocal max_threads
+            async with semaphore:
+                start = time.perf_counter()
+                responses = await asyncio.gather(*(client.get(path, headers=headers) for path in DASHBOARD_PATHS))
+                latencies.append((time.perf_counter() - start) * 1000)
+                max_threads = max(max_threads, threading.active_count())
+                assert all(response.status_code == 200 for response in responses)
+
+        await load()  # 预热各接口缓存
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(load() for _ in range(loads)))
+        elapsed = time.perf_counter() - start
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        return loads / elapsed, statistics.median(latencies), p95, max_threads
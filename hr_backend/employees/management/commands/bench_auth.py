@@ -0,0 +1,47 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from api.security import create_access_token, password_fingerprint, user_cache
+
+
+class Command(BaseCommand):
+    help = '比较令牌认证在启用与禁用用户缓存时的每秒请求数（数据在事务中生成并回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='每种模式的请求次数')
+        parser.add_argument('--path', default='/api/departments/tree', help='请求的接口路径')
+
+    def handle(self, *args, **options):
+        total, path = options['requests'], options['path']
+        maxsize = user_cache.maxsize
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user('bench-auth')
+            token = create_access_token(user.id, password_fingerprint(user))
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {token}', SERVER_NAME='localhost')
+            client.get(path)  # 预热接口自身的缓存
+
+            self.stdout.write(f'接口 {path}，每种模式 {total} 次请求')
+            try:
+                for label, size in (('每次查询用户', 0), ('缓存用户', maxsize or 1024)):
+                    user_cache.maxsize = size
+                    user_cache.clear()
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        for _ in range(total):
+                            response = client.get(path)
+                        elapsed = time.perf_counter() - start
+                    assert response.status_code == 200, response.status_code
+                    self.stdout.write(
+                        f'{label:<8} {total / elapsed:9.1f} 请求/秒  平均查询 {len(queries) / total:.2f} 次'
+                    )
+            finally:
+                user_cache.maxsize = maxsize
+                user_cache.clear()
+
+            transaction.set_rollback(True)
@@ -0,0 +1,61 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.employees import project_employees
+from api.pagination import CURSOR_ORDERING, encode_cursor, paginate_by_cursor
+from departments.models import Department
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = '对比偏移分页与游标分页在首页和深页上的耗时（数据在事务中生成并回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='临时生成的员工数量')
+        parser.add_argument('--page-size', type=int, default=10, help='每页条数')
+        parser.add_argument('--page', type=int, default=1000, help='对比的深页页码')
+        parser.add_argument('--repeat', type=int, default=20, help='每种情况重复次数')
+
+    def handle(self, *args, **options):
+        page_size, page, repeat = options['page_size'], options['page'], options['repeat']
+        rows = max(options['rows'], page * page_size)
+
+        with transaction.atomic():
+            department = Department.objects.create(name='分页基准测试')
+            employees = Employee.objects.bulk_create(
+                [Employee(employee_id=f'B{i:08d}', name=f'基准{i}', gender=True,
+                          department=department, id_card_number=f'B{i:017d}')
+                 for i in range(rows)],
+                batch_size=1000,
+            )
+            # 创建时间为 auto_now_add，批量写入后再逐行错开，模拟真实数据
+            base = timezone.now()
+            for i, employee in enumerate(employees):
+                employee.created_at = base - timedelta(seconds=rows - i)
+            Employee.objects.bulk_update(employees, ['created_at'], batch_size=1000)
+            queryset = project_employees(Employee.objects.order_by(*CURSOR_ORDERING))
+
+            self.stdout.write(f'员工数 {rows}，每页 {page_size} 条，重复 {repeat} 次，单位毫秒')
+            for current in (1, page):
+                offset = (current - 1) * page_size
+                offset_ms = self._measure(repeat, lambda: list(queryset[offset:offset + page_size]))
+
+                cursor = ''
+                if offset:
+                    cursor = encode_cursor(queryset.values('created_at', 'id')[offset - 1])
+                cursor_ms = self._measure(repeat, lambda: paginate_by_cursor(queryset, cursor, page_size))
+
+                self.stdout.write(f'第 {current:>5} 页  偏移分页 {offset_ms:8.3f}  游标分页 {cursor_ms:8.3f}')
+
+            transaction.set_rollback(True)
+
+    def _measure(self, repeat, func):
+        """返回多次执行的平均耗时（毫秒）"""
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,48 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from departments.models import Department
+from employees.models import Employee
+from employees.search import build_search_text, search_employee_ids
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘'
+GIVEN_CHARS = '伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀兰霞平刚桂英华玉萍红娥玲芬'
+
+
+class Command(BaseCommand):
+    help = '测量员工检索在大数据量下的延迟（数据在事务中生成并回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='临时生成的员工数量')
+        parser.add_argument('--repeat', type=int, default=50, help='每个检索词重复次数')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        rng = random.Random(0)
+
+        with transaction.atomic():
+            department = Department.objects.create(name='检索基准测试')
+            employees = []
+            for i in range(rows):
+                employee = Employee(
+                    employee_id=f'S{i:08d}',
+                    name=rng.choice(SURNAMES) + ''.join(rng.choices(GIVEN_CHARS, k=rng.randint(1, 2))),
+                    gender=True, department=department, id_card_number=f'S{i:017d}',
+                    mobile_phone=f'13{rng.randint(0, 999999999):09d}',
+                )
+                employee.search_text = build_search_text(employee)
+                employees.append(employee)
+            Employee.objects.bulk_create(employees, batch_size=1000)
+
+            self.stdout.write(f'员工数 {rows}，每个检索词重复 {repeat} 次，单位毫秒')
+            for term in ('张伟', '秀英', 'zw', 'S0004', '5678', '王 芳'):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    matches = search_employee_ids(term, 20)
+                elapsed = (time.perf_counter() - start) * 1000 / repeat
+                self.stdout.write(f'{term:<8} 命中 {len(matches):>3}  平均 {elapsed:7.3f}')
+
+            transaction.set_rollback(True)
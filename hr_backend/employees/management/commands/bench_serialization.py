@@ -0,0 +1,78 @@
+import json
+import statistics
+import time
+from datetime import date, datetime, timezone
+
+from django.core.management.base import BaseCommand
+from ninja.renderers import JSONRenderer
+
+from api.columnar import to_columnar
+from api.employees import EMPLOYEE_ENUMS, EMPLOYEE_OUT_COLUMNS, EmployeeOut, to_employee_out
+from api.pagination import Page
+from api.renderers import ORJSONRenderer
+
+
+def sample_rows(count):
+    """与 project_employees 投影形状相同的员工行（不访问数据库）"""
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            **{name: None for name in EmployeeOut.model_fields},
+            'id': i, 'employee_id': f'E{i:05d}', 'name': f'员工{i}', 'gender': bool(i % 2),
+            'department_id': i % 20, 'department_name': f'部门{i % 20}', 'team_id': i % 50, 'team_name': f'团队{i % 50}',
+            'id_card_number': f'{i:018d}', 'birthday': date(1980, 1, 1), 'political_status': 'masses',
+            'democratic_party': False, 'full_time_degree': 'none', 'in_service_degree': 'none', 'highest_degree': 'none',
+            'work_start_date': date(2005, 7, 1), 'join_institute_date': date(2010, 3, 1), 'institute_household': False,
+            'mobile_phone': '13800000000', 'email': f'e{i}@example.com', 'is_active': True, 'age': 44,
+            'created_at': created_at, 'updated_at': created_at,
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        '比较员工列表页的序列化耗时与体积：输出模型校验 + 标准库 json、校验 + orjson、信任投影行 + orjson、'
+        '列式（format=columnar）+ orjson；解析为标准库 json.loads 的耗时'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='每页员工数量')
+        parser.add_argument('--repeat', type=int, default=20, help='重复次数，取中位数')
+
+    def handle(self, *args, **options):
+        rows = sample_rows(options['rows'])
+        schema = Page[EmployeeOut]
+        paths = (
+            ('校验 + json', JSONRenderer(), 'validate'),
+            ('校验 + orjson', ORJSONRenderer(), 'validate'),
+            ('信任 + orjson', ORJSONRenderer(), None),
+            ('列式 + orjson', ORJSONRenderer(), 'columnar'),
+        )
+        self.stdout.write(f'每页 {options["rows"]} 名员工，耗时单位毫秒（{options["repeat"]} 次取中位数）')
+        self.stdout.write(f'{"路径":<12} {"校验/转换":>8} {"编码":>8} {"合计":>8} {"字节":>9} {"解析":>8}')
+        for name, renderer, prepare in paths:
+            validating, encoding, parsing = [], [], []
+            for _ in range(options['repeat']):
+                # 投影行每次重新复制，to_employee_out 会原地转换日期
+                page = {'items': [to_employee_out(dict(row)) for row in rows], 'total': len(rows), 'page': 1, 'page_size': len(rows)}
+                start = time.perf_counter()
+                if prepare == 'validate':
+                    # 与 django-ninja 处理返回值的方式相同：按输出模型校验后再导出为字典
+                    page = schema.model_validate(page).model_dump()
+                elif prepare == 'columnar':
+                    items = page.pop('items')
+                    page = {**to_columnar(items, EMPLOYEE_OUT_COLUMNS, EMPLOYEE_ENUMS), **page}
+                middle = time.perf_counter()
+                content = renderer.render(None, page, response_status=200)
+                end = time.perf_counter()
+                json.loads(content)
+                parsing.append((time.perf_counter() - end) * 1000)
+                validating.append((middle - start) * 1000)
+                encoding.append((end - middle) * 1000)
+            size = len(content.encode() if isinstance(content, str) else content)
+            validate_ms, encode_ms = statistics.median(validating), statistics.median(encoding)
+            self.stdout.write(
+                f'{name:<12} {validate_ms:8.2f} {encode_ms:8.2f} {validate_ms + encode_ms:8.2f} {size:9d} '
+                f'{statistics.median(parsing):8.2f}'
+            )
@@ -0,0 +1,139 @@
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from departments.models import Department
+from employees.models import Employee
+from hr_backend.database import database_config
+
+# (名称, 覆盖的环境变量)
+PROFILES = (
+    ('默认', {'DB_SQLITE_TUNING': 'false'}),
+    ('调优', {}),
+)
+
+
+class Command(BaseCommand):
+    help = '比较 SQLite 默认设置与调优设置（WAL、IMMEDIATE 事务等）在并发读写下的表现（使用临时数据库文件）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='预置的员工数量')
+        parser.add_argument('--readers', type=int, default=4, help='并发读线程数')
+        parser.add_argument('--writers', type=int, default=2, help='并发更新线程数（另有一个批量写入线程）')
+        parser.add_argument('--seconds', type=float, default=5, help='每个阶段的持续秒数')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{options["readers"]} 个读线程查询员工列表首页；写入阶段另有 {options["writers"]} 个线程逐条先读后写，'
+            f'1 个线程每批写入 200 名员工；延迟单位毫秒'
+        )
+        self.stdout.write(
+            f'{"配置":<4} {"仅读 读/秒":>10} {"读写 读/秒":>10} {"读 p95":>8} {"写/秒":>8} {"锁冲突":>6}'
+        )
+        for name, env in PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                alias = self._register(Path(directory) / 'bench.sqlite3', env)
+                try:
+                    self._seed(alias, options['rows'])
+                    idle = self._run(alias, options, writers=False)
+                    busy = self._run(alias, options, writers=True)
+                finally:
+                    connections[alias].close()
+                    del connections.settings[alias]
+            self.stdout.write(
+                f'{name:<4} {idle["reads"]:10.0f} {busy["reads"]:10.0f} {busy["p95"]:8.2f} '
+                f'{busy["writes"]:8.1f} {busy["errors"]:>6}'
+            )
+
+    def _register(self, path, env):
+        """以给定环境变量生成配置，注册为临时数据库别名"""
+        alias = f'bench_{path.parent.name}'
+        config = database_config({**env, 'DB_NAME': str(path)})
+        connections.settings[alias] = connections.configure_settings({'default': config})['default']
+        call_command('migrate', database=alias, verbosity=0)
+        return alias
+
+    def _seed(self, alias, rows):
+        departments = Department.objects.using(alias).bulk_create(Department(name=f'基准部门{i}') for i in range(20))
+        Employee.objects.using(alias).bulk_create(
+            (Employee(
+                employee_id=f'S{i:08d}', name=f'员工{i}', gender=bool(i % 2), id_card_number=f'S{i:017d}',
+                department=departments[i % 20],
+            ) for i in range(rows)),
+            batch_size=1000,
+        )
+
+    def _run(self, alias, options, writers):
+        stop = threading.Event()
+        latencies, counters, lock = [], {'writes': 0, 'errors': 0}, threading.Lock()
+        ids = list(Employee.objects.using(alias).values_list('id', flat=True))
+        department = Department.objects.using(alias).first()
+
+        def worker(body):
+            try:
+                while not stop.is_set():
+                    try:
+                        body()
+                    except OperationalError:
+                        with lock:
+                            counters['errors'] += 1
+            finally:
+                connections[alias].close()
+
+        def read():
+            start = time.perf_counter()
+            list(
+                Employee.objects.using(alias).select_related('department')
+                .filter(is_active=True).order_by('-created_at', '-id')[:20]
+            )
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        def update():
+            # 与 PATCH 接口相同的先读后写事务
+            with transaction.atomic(using=alias):
+                employee = Employee.objects.using(alias).get(pk=random.choice(ids))
+                employee.office_phone = str(random.randrange(10 ** 8))
+                employee.save(using=alias, update_fields=['office_phone', 'search_text', 'updated_at'])
+            with lock:
+                counters['writes'] += 1
+
+        batch = iter(range(10 ** 9))
+
+        def bulk_write():
+            with transaction.atomic(using=alias):
+                start = next(batch) * 200
+                Employee.objects.using(alias).bulk_create(
+                    Employee(
+                        employee_id=f'B{i:08d}', name=f'新员工{i}', gender=True, id_card_number=f'B{i:017d}',
+                        department=department,
+                    ) for i in range(start, start + 200)
+                )
+            with lock:
+                counters['writes'] += 1
+
+        bodies = [read] * options['readers']
+        if writers:
+            bodies += [update] * options['writers'] + [bulk_write]
+        threads = [threading.Thread(target=worker, args=(body,)) for body in bodies]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        seconds = options['seconds']
+        return {
+            'reads': len(latencies) / seconds,
+            'p95': statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0,
+            'writes': counters['writes'] / seconds,
+            'errors': counters['errors'],
+        }
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0002_initial'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_at', 'id'], name='employee_created_id_idx'),
+        ),
+    ]
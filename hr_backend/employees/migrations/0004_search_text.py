@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:20
+
+from django.db import migrations, models
+from pypinyin import Style, lazy_pinyin
+
+# 以下检索文本与索引的生成逻辑按本迁移编写时的版本固定在迁移内，
+# employees.search 之后的修改不会改变历史迁移的结果
+FTS_TABLE = 'employees_employee_fts'
+
+SQLITE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"search_text, content='employees_employee', content_rowid='id')"
+)
+
+SQLITE_FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f'{FTS_TABLE}_ad': f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END""",
+    f'{FTS_TABLE}_au': f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF search_text ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+}
+
+POSTGRESQL_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS employees_employee_search_trgm "
+    "ON employees_employee USING gin (search_text gin_trgm_ops)",
+]
+
+# 回填检索文本时每批读取与写回的员工数
+BATCH_SIZE = 500
+
+SOURCE_FIELDS = ('name', 'employee_id', 'mobile_phone', 'office_phone', 'email')
+
+
+def _suffixes(value):
+    return [value[i:] for i in range(len(value))]
+
+
+def build_search_text(employee):
+    tokens = []
+    name = (employee.name or '').strip().lower()
+    if name:
+        tokens += _suffixes(name)
+        tokens.append(''.join(lazy_pinyin(name, style=Style.FIRST_LETTER)))
+        tokens.append(''.join(lazy_pinyin(name)))
+    for value in (employee.employee_id, employee.mobile_phone, employee.office_phone):
+        if value:
+            tokens += _suffixes(value.strip().lower())
+    if employee.email:
+        tokens.append(employee.email.strip().lower())
+    return ' '.join(dict.fromkeys(tokens))
+
+
+def populate_search_text(apps, schema_editor):
+    """分批回填检索文本，内存占用与员工总数无关"""
+    Employee = apps.get_model('employees', 'Employee')
+    batch = []
+    for employee in Employee.objects.only('id', *SOURCE_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        employee.search_text = build_search_text(employee)
+        batch.append(employee)
+        if len(batch) == BATCH_SIZE:
+            Employee.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Employee.objects.bulk_update(batch, ['search_text'])
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(SQLITE_FTS_TABLE)
+            for sql in SQLITE_FTS_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            for sql in POSTGRESQL_SEARCH_INDEX:
+                cursor.execute(sql)
+
+
+def remove_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in SQLITE_FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS employees_employee_search_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0003_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='检索文本'),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0004_search_text'),
+        ('teams', '0002_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['birthday'], name='employee_birthday_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['work_start_date'], name='employee_work_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['join_institute_date'], name='employee_join_date_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0005_date_indexes'),
+        ('teams', '0002_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['title_appointment_date'], name='employee_title_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['position_appointment_date'], name='employee_position_date_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0006_appointment_date_indexes'),
+        ('teams', '0002_created_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', '-created_at', '-id'], name='employee_dept_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='employee_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department', '-created_at', '-id'], name='employee_active_dept_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['-created_at', '-id'], name='employee_inactive_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0004_updated_at_indexes'),
+        ('employees', '0007_list_filter_indexes'),
+        ('teams', '0003_list_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['updated_at'], name='employee_updated_idx'),
+        ),
+    ]
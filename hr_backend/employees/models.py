@@ -1,5 +1,49 @@
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, Q, Value, When
+from django.db.models.functions import ExtractYear
 from django.contrib.auth.models import User
+from datetime import date
+
+
+def calculate_age(birthday, today=None):
+    """根据出生日期计算周岁年龄"""
+    today = today or date.today()
+    return today.year - birthday.year - ((today.month, today.day) < (birthday.month, birthday.day))
+
+
+def years_ago(today: date, years: int) -> date:
+    """today 之前 years 年的同一天，2月29日在平年取2月28日"""
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        return today.replace(year=today.year - years, day=28)
+
+
+def years_since_filter(field: str, low=None, high=None, today=None) -> Q:
+    """距 field 日期的周年数在 [low, high) 内的条件
+
+    编译为对日期列本身的范围比较，可直接使用该列上的索引；口径与 calculate_age 一致。
+    """
+    today = today or date.today()
+    condition = Q(**{f'{field}__isnull': False})
+    if low is not None:
+        condition &= Q(**{f'{field}__lte': years_ago(today, low)})
+    if high is not None:
+        condition &= Q(**{f'{field}__gt': years_ago(today, high)})
+    return condition
+
+
+def years_since_expression(field: str, today=None):
+    """在数据库中计算距 field 日期的周年数（如年龄、工龄），日期为空时结果为 NULL"""
+    today = today or date.today()
+    before_anniversary = Q(**{f'{field}__month__gt': today.month}) | Q(
+        **{f'{field}__month': today.month, f'{field}__day__gt': today.day}
+    )
+    return ExpressionWrapper(
+        Value(today.year) - ExtractYear(field) - Case(When(before_anniversary, then=Value(1)), default=Value(0)),
+        output_field=models.IntegerField(),
+    )
+
 
 # 政治面貌枚举
 class PoliticalStatus(models.TextChoices):
@@ -110,10 +154,40 @@ class Employee(models.Model):
     updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     is_active = models.BooleanField(default=True, verbose_name='是否在职')
     
+    # 检索信息，保存时由信号根据姓名、编号、电话、邮箱生成
+    search_text = models.TextField(blank=True, default='', editable=False, verbose_name='检索文本')
+    
     class Meta:
         verbose_name = '员工'
         verbose_name_plural = '员工管理'
         ordering = ['-created_at']
+        indexes = [
+            # 游标分页按 (created_at, id) 排序与定位
+            models.Index(fields=['created_at', 'id'], name='employee_created_id_idx'),
+            # 增量同步按更新时间查找变更的记录
+            models.Index(fields=['updated_at'], name='employee_updated_idx'),
+            # 列表按部门筛选后按创建时间倒序分页
+            models.Index(fields=['department', '-created_at', '-id'], name='employee_dept_created_idx'),
+            # 在职状态筛选使用部分索引：布尔条件编译为 WHERE is_active / WHERE NOT is_active，
+            # 不是等值比较，(is_active, ...) 复合索引无法被 SQLite 使用；部分索引也只包含相应的行，体积更小
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=True), name='employee_active_created_idx',
+            ),
+            models.Index(
+                fields=['department', '-created_at', '-id'], condition=models.Q(is_active=True),
+                name='employee_active_dept_idx',
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_active=False), name='employee_inactive_idx',
+            ),
+            # 年龄、工龄、入所时间筛选均转换为对以下日期列的范围比较
+            models.Index(fields=['birthday'], name='employee_birthday_idx'),
+            models.Index(fields=['work_start_date'], name='employee_work_start_idx'),
+            models.Index(fields=['join_institute_date'], name='employee_join_date_idx'),
+            # 晋升资格预测按任职时间的范围比较
+            models.Index(fields=['title_appointment_date'], name='employee_title_date_idx'),
+            models.Index(fields=['position_appointment_date'], name='employee_position_date_idx'),
+        ]
     
     def __str__(self):
         return f'{self.employee_id} - {self.name}'
@@ -121,6 +195,4 @@ class Employee(models.Model):
     @property
     def age(self):
         """计算年龄"""
-        from datetime import date
-        today = date.today()
-        return today.year - self.birthday.year - ((today.month, today.day) < (self.birthday.month, self.birthday.day))
+        return calculate_age(self.birthday)
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from functools import reduce
+from operator import or_
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+
+from hr_backend.cache import aget_version, bump_version
+from .models import Employee, PositionLevel, ProfessionalTitle, years_ago
+
+REPORTS_CACHE_NAMESPACE = 'employee_reports'
+
+# 影响预测报表结果或展示内容的员工字段
+EMPLOYEE_REPORT_FIELDS = (
+    'employee_id', 'name', 'department_id', 'is_active', 'gender', 'birthday',
+    'professional_title', 'title_appointment_date', 'position_level', 'position_appointment_date',
+    'join_institute_date',
+)
+
+REPORT_COLUMNS = ('id', 'employee_id', 'name', 'department_id')
+
+
+def add_years(day: date, years: int) -> date:
+    """day 之后 years 年的周年日；2月29日在平年按3月1日计，与 calculate_age 的周岁口径一致"""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return date(day.year + years, 3, 1)
+
+
+def anniversary_range(field: str, years: int, start: date, end: date) -> Q:
+    """第 years 个周年日落在 [start, end] 内的条件
+
+    转换为对日期列本身的范围比较以便使用索引；两端各放宽一天覆盖2月29日，
+    命中行再由 add_years 精确判断。
+    """
+    return Q(**{
+        f'{field}__gte': years_ago(start, years) - timedelta(days=1),
+        f'{field}__lte': years_ago(end, years) + timedelta(days=1),
+    })
+
+
+def _milestones(queryset, field: str, rules, start: date, end: date, kind: str):
+    """按周年规则预测事件，所有规则合并为一次查询
+
+    rules 为 (等值条件, 周年数, 说明) 列表，等值条件既用于 SQL 过滤，也用于在命中行上复核；
+    同一员工命中多条规则时各自产出一条记录。
+    """
+    conditions = [Q(**match) & anniversary_range(field, years, start, end) for match, years, _ in rules]
+    if not conditions:
+        return []
+    match_columns = {column for match, _, _ in rules for column in match}
+    rows = queryset.filter(reduce(or_, conditions)).values(
+        *REPORT_COLUMNS, field, *match_columns, department_name=F('department__name'),
+    )
+
+    items = []
+    for row in rows:
+        for match, years, reason in rules:
+            event = add_years(row[field], years)
+            if not start <= event <= end or any(row[column] != value for column, value in match.items()):
+                continue
+            items.append({
+                'id': row['id'],
+                'employee_id': row['employee_id'],
+                'name': row['name'],
+                'department_id': row['department_id'],
+                'department_name': row['department_name'],
+                'kind': kind,
+                'reason': reason,
+                'base_date': row[field].isoformat(),
+                'event_date': event.isoformat(),
+                'years': years,
+            })
+    return items
+
+
+def retirement_forecast(queryset, start: date, end: date):
+    """退休日期落在窗口内的员工，退休年龄按性别区分"""
+    rules = [
+        ({'gender': True}, settings.RETIREMENT_AGE_MALE, f'男职工年满{settings.RETIREMENT_AGE_MALE}周岁'),
+        ({'gender': False}, settings.RETIREMENT_AGE_FEMALE, f'女职工年满{settings.RETIREMENT_AGE_FEMALE}周岁'),
+    ]
+    return _milestones(queryset, 'birthday', rules, start, end, 'retirement')
+
+
+def promotion_forecast(queryset, start: date, end: date):
+    """任现职称或现职务满规定年限、在窗口内具备晋升资格的员工（已是最高职称、职务的除外）"""
+    title_years, position_years = settings.PROMOTION_TITLE_YEARS, settings.PROMOTION_POSITION_YEARS
+    titled = queryset.filter(professional_title__isnull=False).exclude(
+        professional_title=ProfessionalTitle.SENIOR_RESEARCHER,
+    )
+    positioned = queryset.filter(position_level__isnull=False).exclude(position_level=PositionLevel.LEVEL_4)
+    title = _milestones(
+        titled, 'title_appointment_date', [({}, title_years, f'任现职称满{title_years}年')], start, end, 'promotion_title',
+    )
+    position = _milestones(
+        positioned, 'position_appointment_date', [({}, position_years, f'任现职务满{position_years}年')], start, end,
+        'promotion_position',
+    )
+    return title + position
+
+
+def anniversary_forecast(queryset, start: date, end: date):
+    """入所满整数周年（如10、20、30年）的纪念日落在窗口内的员工"""
+    rules = [({}, years, f'入所{years}周年') for years in settings.SERVICE_ANNIVERSARY_YEARS]
+    return _milestones(queryset, 'join_institute_date', rules, start, end, 'anniversary')
+
+
+FORECASTS = {
+    'retirement': retirement_forecast,
+    'promotion': promotion_forecast,
+    'anniversary': anniversary_forecast,
+}
+
+
+def build_forecast(report: str, start: date, end: date):
+    """计算在职员工在 [start, end] 窗口内的预测报表，按事件日期排序"""
+    queryset = Employee.objects.filter(is_active=True).order_by()
+    items = FORECASTS[report](queryset, start, end)
+    items.sort(key=lambda item: (item['event_date'], item['employee_id']))
+    return {
+        'report': report,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'total': len(items),
+        'items': items,
+    }
+
+
+def _forecast_cache_key(version: int, report: str, start: date, end: date) -> str:
+    return f'{REPORTS_CACHE_NAMESPACE}:{version}:{report}:{start.isoformat()}:{end.isoformat()}'
+
+
+async def aget_cached_forecast(report: str, start: date, end: date):
+    """读取缓存的预测报表，按 (报表, 窗口) 缓存，未命中时在线程中重新计算"""
+    key = _forecast_cache_key(await aget_version(REPORTS_CACHE_NAMESPACE), report, start, end)
+    result = await cache.aget(key)
+    if result is None:
+        result = await sync_to_async(build_forecast)(report, start, end)
+        await cache.aset(key, result, settings.EMPLOYEE_REPORTS_CACHE_TIMEOUT)
+    return result
+
+
+def invalidate_employee_reports():
+    """使预测报表缓存失效"""
+    bump_version(REPORTS_CACHE_NAMESPACE)
@@ -0,0 +1,141 @@
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from pypinyin import Style, lazy_pinyin
+
+from .models import Employee
+
+# SQLite 下的 FTS5 外部内容表，通过触发器与员工表同步
+FTS_TABLE = 'employees_employee_fts'
+
+SQLITE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"search_text, content='employees_employee', content_rowid='id')"
+)
+
+SQLITE_FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f'{FTS_TABLE}_ad': f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END""",
+    f'{FTS_TABLE}_au': f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF search_text ON employees_employee BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+}
+
+POSTGRESQL_SEARCH_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS employees_employee_search_trgm "
+    "ON employees_employee USING gin (search_text gin_trgm_ops)",
+]
+
+
+def ensure_search_index(connection):
+    """创建缺失的检索索引
+
+    SQLite 在迁移中重建员工表时会连带删除触发器，因此除初始迁移外，
+    每次迁移完成后也会调用本函数补建，并在补建触发器后重建全文索引。
+    """
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name LIKE %s", [f'{FTS_TABLE}%'])
+            existing = {row[0] for row in cursor.fetchall()}
+            if FTS_TABLE not in existing:
+                cursor.execute(SQLITE_FTS_TABLE)
+            missing = [sql for name, sql in SQLITE_FTS_TRIGGERS.items() if name not in existing]
+            for sql in missing:
+                cursor.execute(sql)
+            if missing:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for sql in POSTGRESQL_SEARCH_INDEX:
+                cursor.execute(sql)
+
+
+def drop_search_index(connection):
+    """删除检索索引"""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            for name in SQLITE_FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX IF EXISTS employees_employee_search_trgm')
+
+
+def _suffixes(value: str):
+    """返回字符串的全部后缀，使前缀检索等价于子串检索"""
+    return [value[i:] for i in range(len(value))]
+
+
+# 参与生成检索文本的字段，部分更新时这些字段变化需同时写入 search_text
+SEARCH_SOURCE_FIELDS = frozenset({'name', 'employee_id', 'mobile_phone', 'office_phone', 'email'})
+
+
+def build_search_text(employee) -> str:
+    """生成员工的检索文本
+
+    包含姓名、员工编号、手机与办公电话的全部后缀，姓名的拼音全拼与首字母，以及电子邮箱，
+    统一转为小写并以空格分隔。
+    """
+    tokens = []
+    name = (employee.name or '').strip().lower()
+    if name:
+        tokens += _suffixes(name)
+        tokens.append(''.join(lazy_pinyin(name, style=Style.FIRST_LETTER)))
+        tokens.append(''.join(lazy_pinyin(name)))
+    for value in (employee.employee_id, employee.mobile_phone, employee.office_phone):
+        if value:
+            tokens += _suffixes(value.strip().lower())
+    if employee.email:
+        tokens.append(employee.email.strip().lower())
+    return ' '.join(dict.fromkeys(tokens))
+
+
+def _keywords(term: str):
+    return term.strip().lower().split()
+
+
+def _fts_query(keywords) -> str:
+    """将关键词转换为 FTS5 前缀查询，所有关键词须同时命中"""
+    return ' '.join('"{}"*'.format(keyword.replace('"', '""')) for keyword in keywords)
+
+
+def filter_by_search(queryset, term: str):
+    """按检索词过滤员工查询集，可与其他过滤条件及分页组合使用"""
+    keywords = _keywords(term)
+    if not keywords:
+        return queryset
+    if connection.vendor == 'sqlite':
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_fts_query(keywords)]
+        ))
+    # PostgreSQL 下 LIKE '%x%' 由 search_text 上的 pg_trgm GIN 索引支持
+    for keyword in keywords:
+        queryset = queryset.filter(search_text__contains=keyword)
+    return queryset
+
+
+def search_employee_ids(term: str, limit: int):
+    """按相关度返回匹配的员工ID列表"""
+    keywords = _keywords(term)
+    if not keywords:
+        return []
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            # 在 MATCH 查询内按 bm25 排序后截取，FTS5 只保留前 limit 行，不会在排序前截掉相关度高的行
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s',
+                [_fts_query(keywords), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    queryset = filter_by_search(Employee.objects.all(), term)
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+        queryset = queryset.annotate(rank=TrigramSimilarity('search_text', ' '.join(keywords))).order_by('-rank')
+    return list(queryset.values_list('id', flat=True)[:limit])
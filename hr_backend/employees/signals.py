@@ -0,0 +1,76 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from departments.tree import EMPLOYEE_TREE_FIELDS, invalidate_department_tree
+from hr_backend.cache import bump_version, count_namespace
+from .models import Employee
+from .search import build_search_text, ensure_search_index
+from .reports import EMPLOYEE_REPORT_FIELDS, invalidate_employee_reports
+from .stats import EMPLOYEE_STATS_FIELDS, invalidate_employee_stats
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_counts(sender, **kwargs):
+    """员工写入后使列表总数缓存失效"""
+    bump_version(count_namespace(sender))
+
+
+# 依赖员工字段的派生缓存：(相关字段, 失效函数)，无关字段（如电话、邮箱）变化时不失效
+DERIVED_CACHES = (
+    (EMPLOYEE_STATS_FIELDS, invalidate_employee_stats),
+    (EMPLOYEE_REPORT_FIELDS, invalidate_employee_reports),
+    (EMPLOYEE_TREE_FIELDS, invalidate_department_tree),
+)
+# 快照中的姓名也供 sync.signals 判断负责人是否改名
+WATCHED_FIELDS = tuple(dict.fromkeys(field for fields, _ in DERIVED_CACHES for field in fields))
+
+
+def _watched_state(instance):
+    # 只读取已加载的字段，避免对延迟加载的字段触发额外查询
+    return {field: instance.__dict__.get(field) for field in WATCHED_FIELDS}
+
+
+@receiver(post_init, sender=Employee)
+def remember_watched_state(sender, instance, **kwargs):
+    """记录员工加载时与派生缓存相关的字段值"""
+    instance._watched_state = _watched_state(instance)
+
+
+@receiver(post_save, sender=Employee)
+def invalidate_derived_on_save(sender, instance, created, **kwargs):
+    """员工新增或相关字段变化时使统计、预测报表与部门树缓存失效"""
+    state, previous = _watched_state(instance), instance._watched_state
+    for fields, invalidate in DERIVED_CACHES:
+        if created or any(state[field] != previous[field] for field in fields):
+            invalidate()
+    instance._watched_state = state
+
+
+@receiver(post_delete, sender=Employee)
+def invalidate_derived_on_delete(sender, **kwargs):
+    """员工删除后使统计、预测报表与部门树缓存失效"""
+    for _, invalidate in DERIVED_CACHES:
+        invalidate()
+
+
+@receiver(pre_save, sender=Employee)
+def update_search_text(sender, instance, **kwargs):
+    """保存前重新生成检索文本"""
+    instance.search_text = build_search_text(instance)
+
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    """迁移完成后补建检索索引（SQLite 重建员工表会删除触发器）"""
+    if sender.name != 'employees':
+        return
+    connection = connections[using]
+    table = Employee._meta.db_table
+    if table not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, table)}
+    if 'search_text' in columns:
+        ensure_search_index(connection)
@@ -0,0 +1,109 @@
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from hr_backend.cache import aget_version, bump_version
+from .models import (
+    DegreeLevel, EducationLevel, Employee, PoliticalStatus, ProfessionalTitle, years_since_filter,
+)
+
+STATS_CACHE_NAMESPACE = 'employee_stats'
+
+# 影响统计结果的员工字段，其余字段（电话、邮箱等）变化时无需刷新统计
+EMPLOYEE_STATS_FIELDS = (
+    'department_id', 'is_active', 'gender', 'birthday',
+    'political_status', 'professional_title', 'highest_education', 'highest_degree',
+)
+
+# 年龄段：(键, 名称, 最小年龄, 最大年龄（不含）)
+AGE_BANDS = (
+    ('under_30', '30岁以下', None, 30),
+    ('30_39', '30-39岁', 30, 40),
+    ('40_49', '40-49岁', 40, 50),
+    ('50_59', '50-59岁', 50, 60),
+    ('60_plus', '60岁及以上', 60, None),
+)
+
+UNKNOWN_LABEL = '未填写'
+
+
+def _choice_breakdown(queryset, field, choices):
+    """按选项字段分组计数，列出全部选项（含0人），空值与未知取值归入“未填写”"""
+    counts = dict(queryset.values_list(field).annotate(count=Count('id')))
+    items = [{'key': value, 'label': str(label), 'count': counts.pop(value, 0)} for value, label in choices]
+    unknown = sum(counts.values())
+    if unknown:
+        items.append({'key': None, 'label': UNKNOWN_LABEL, 'count': unknown})
+    return items
+
+
+def build_employee_stats(today=None):
+    """统计在职员工的人数分布
+
+    性别与年龄段通过一次条件聚合得到，部门、政治面貌、职称、学历、学位各一次分组查询，
+    查询次数固定，与员工人数无关。
+    """
+    today = today or date.today()
+    active = Employee.objects.filter(is_active=True).order_by()
+
+    summary = active.aggregate(
+        total=Count('id'),
+        male=Count('id', filter=Q(gender=True)),
+        female=Count('id', filter=Q(gender=False)),
+        age_unknown=Count('id', filter=Q(birthday__isnull=True)),
+        **{
+            f'age_{key}': Count('id', filter=years_since_filter('birthday', low, high, today))
+            for key, _, low, high in AGE_BANDS
+        },
+    )
+    age_bands = [
+        {'key': key, 'label': label, 'count': summary[f'age_{key}']} for key, label, _, _ in AGE_BANDS
+    ]
+    if summary['age_unknown']:
+        age_bands.append({'key': None, 'label': UNKNOWN_LABEL, 'count': summary['age_unknown']})
+
+    departments = active.values('department_id', department_name=F('department__name')).annotate(
+        count=Count('id'),
+    ).order_by('-count', 'department_id')
+
+    return {
+        'total': summary['total'],
+        'by_department': [
+            {'id': row['department_id'], 'name': row['department_name'], 'count': row['count']}
+            for row in departments
+        ],
+        'by_gender': [
+            {'key': True, 'label': '男', 'count': summary['male']},
+            {'key': False, 'label': '女', 'count': summary['female']},
+        ],
+        'by_age_band': age_bands,
+        'by_political_status': _choice_breakdown(active, 'political_status', PoliticalStatus.choices),
+        'by_professional_title': _choice_breakdown(active, 'professional_title', ProfessionalTitle.choices),
+        'by_education': _choice_breakdown(active, 'highest_education', EducationLevel.choices),
+        'by_degree': _choice_breakdown(active, 'highest_degree', DegreeLevel.choices),
+        'as_of': today.isoformat(),
+    }
+
+
+def _stats_cache_key(version: int, today: date) -> str:
+    # 年龄段随日期变化，缓存键带上当天日期
+    return f'{STATS_CACHE_NAMESPACE}:{version}:{today.isoformat()}'
+
+
+async def aget_cached_employee_stats():
+    """读取缓存的员工统计，未命中时在线程中重新统计"""
+    today = date.today()
+    key = _stats_cache_key(await aget_version(STATS_CACHE_NAMESPACE), today)
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = await sync_to_async(build_employee_stats)(today)
+        await cache.aset(key, stats, settings.EMPLOYEE_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def invalidate_employee_stats():
+    """使员工统计缓存失效"""
+    bump_version(STATS_CACHE_NAMESPACE)
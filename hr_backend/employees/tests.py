@@ -1,3 +1,724 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import zipfile
+from datetime import date, timedelta
+from importlib import import_module
+from itertools import product
+from unittest import mock, skipUnless
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from api.tests import APITestCase
+from departments.models import Department
+from teams.models import ResearchTeam
+from .models import Employee, calculate_age, years_ago
+from .search import build_search_text
+
+
+async def read_streaming_content(response) -> bytes:
+    """读取异步流式响应的全部内容"""
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+def create_employees(department, count, team=None, start=0):
+    """批量创建测试员工"""
+    return Employee.objects.bulk_create([
+        Employee(
+            employee_id=f'E{i:05d}',
+            name=f'员工{i}',
+            gender=bool(i % 2),
+            department=department,
+            team=team,
+            id_card_number=f'{i:018d}',
+            birthday=date(1980, 1, 1),
+        )
+        for i in range(start, start + count)
+    ])
+
+
+class EmployeeListQueryTests(APITestCase):
+    """员工列表接口的查询次数回归测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.team = ResearchTeam.objects.create(name='遥感团队', department=cls.department)
+        create_employees(cls.department, 30, team=cls.team)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_list_query_count_independent_of_page_size(self):
+        self.client.get('/api/employees/')  # 预热总数缓存
+        for page_size in (1, 10, 30):
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/employees/', {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['items']), page_size)
+
+    def test_list_includes_related_names(self):
+        row = self.client.get('/api/employees/', {'page_size': 1}).json()['items'][0]
+        self.assertEqual(row['department_name'], '科研处')
+        self.assertEqual(row['team_name'], '遥感团队')
+        self.assertEqual(row['birthday'], '1980-01-01')
+        self.assertIsNotNone(row['age'])
+
+    def test_detail_uses_single_query(self):
+        employee = Employee.objects.first()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/employees/{employee.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['employee_id'], employee.employee_id)
+
+
+class EmployeeCursorPaginationTests(APITestCase):
+    """员工列表游标分页测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        create_employees(cls.department, 25)
+
+    def test_cursor_walks_all_rows_once(self):
+        seen, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get('/api/employees/', {'cursor': cursor, 'page_size': 10})
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.json()['items'])
+            cursor = response.json()['next_cursor']
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/employees/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class EmployeeListTotalTests(APITestCase):
+    """员工列表总数缓存测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.other = Department.objects.create(name='办公室')
+        create_employees(cls.department, 12)
+        create_employees(cls.other, 3, start=12)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_total_reflects_filters(self):
+        body = self.client.get('/api/employees/', {'page_size': 5, 'page': 2}).json()
+        self.assertEqual((body['total'], body['page'], body['page_size']), (15, 2, 5))
+        body = self.client.get('/api/employees/', {'department_id': self.other.id}).json()
+        self.assertEqual(body['total'], 3)
+
+    def test_total_is_cached_across_pages(self):
+        self.client.get('/api/employees/', {'page': 1})
+        with self.assertNumQueries(1):
+            self.client.get('/api/employees/', {'page': 2})
+
+    def test_write_invalidates_total(self):
+        self.client.get('/api/employees/')
+        Employee.objects.create(employee_id='N00001', name='新员工', gender=True,
+                                department=self.department, id_card_number='N' * 18)
+        self.assertEqual(self.client.get('/api/employees/').json()['total'], 16)
+
+
+class EmployeeSearchTests(APITestCase):
+    """员工检索测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.zhang = Employee.objects.create(
+            employee_id='KY2024001', name='张三丰', gender=True, department=cls.department,
+            id_card_number='110101199001011234', mobile_phone='13812345678', email='zsf@example.com',
+        )
+        cls.li = Employee.objects.create(
+            employee_id='KY2024002', name='李四', gender=False, department=cls.department,
+            id_card_number='110101199001011235', mobile_phone='13987654321', is_active=False,
+        )
+
+    def search(self, term):
+        response = self.client.get('/api/employees/search', {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()]
+
+    def test_matches_name_substring(self):
+        self.assertEqual(self.search('三丰'), ['张三丰'])
+        self.assertEqual(self.search('李'), ['李四'])
+
+    def test_matches_pinyin_initials_and_full_pinyin(self):
+        self.assertEqual(self.search('zsf'), ['张三丰'])
+        self.assertEqual(self.search('ZhangSan'), ['张三丰'])
+
+    def test_matches_employee_id_phone_and_email(self):
+        self.assertEqual(sorted(self.search('2024')), ['张三丰', '李四'])
+        self.assertEqual(self.search('5678'), ['张三丰'])
+        self.assertEqual(self.search('zsf@example'), ['张三丰'])
+
+    def test_all_keywords_must_match(self):
+        self.assertEqual(self.search('2024 李'), ['李四'])
+        self.assertEqual(self.search('不存在'), [])
+
+    def test_ranks_all_matches_before_limit(self):
+        fillers = [
+            Employee(
+                employee_id=f'KY{i:05d}', name=f'员工{i}', gender=True, department=self.department,
+                id_card_number=f'F{i:017d}', mobile_phone=f'139{i:08d}', office_phone=f'010{i:08d}',
+            )
+            for i in range(600)
+        ]
+        for employee in fillers:
+            employee.search_text = build_search_text(employee)
+        Employee.objects.bulk_create(fillers)
+        # 最后创建、rowid 最大的员工文本最短且多处命中，相关度最高
+        Employee.objects.create(employee_id='KYKYKY', name='王五', gender=True, department=self.department, id_card_number='F' * 18)
+        self.assertEqual(self.search('ky')[0], '王五')
+
+    def test_index_follows_updates(self):
+        self.li.name = '王五'
+        self.li.save()
+        self.assertEqual(self.search('李'), [])
+        self.assertEqual(self.search('ww'), ['王五'])
+
+    def test_migration_backfills_search_text_in_batches(self):
+        migration = import_module('employees.migrations.0004_search_text')
+        Employee.objects.update(search_text='')
+        self.assertEqual(self.search('zsf'), [])
+        with mock.patch.object(migration, 'BATCH_SIZE', 1):
+            migration.populate_search_text(apps, None)
+        self.assertEqual(self.search('zsf'), ['张三丰'])
+        self.assertEqual(self.search('李'), ['李四'])
+
+    def test_list_search_combines_with_filters(self):
+        body = self.client.get('/api/employees/', {'search': '2024', 'is_active': True}).json()
+        self.assertEqual([row['name'] for row in body['items']], ['张三丰'])
+        self.assertEqual(body['total'], 1)
+
+
+class EmployeeBulkImportTests(APITestCase):
+    """员工批量导入测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.team = ResearchTeam.objects.create(name='遥感团队', department=cls.department)
+        Employee.objects.create(employee_id='OLD001', name='老员工', gender=True,
+                                department=cls.department, id_card_number='110101198001010000')
+
+    def row(self, i, **extra):
+        return {'employee_id': f'NEW{i:03d}', 'name': f'新员工{i}', 'gender': True,
+                'department_id': self.department.id, 'id_card_number': f'11010119900101{i:04d}', **extra}
+
+    def post_jsonl(self, rows, **params):
+        body = '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows)
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(f'/api/employees/bulk?{query}', data=body, content_type='application/jsonl').json()
+
+    def test_jsonl_import_with_row_errors(self):
+        rows = [self.row(1, team_id=self.team.id), self.row(2, department_id=999), {'name': '缺少字段'}, self.row(3)]
+        result = self.post_jsonl(rows, chunk_size=2)
+        self.assertEqual(result['created'], 2)
+        self.assertTrue(result['committed'])
+        self.assertEqual([error['row'] for error in result['errors']], [2, 3])
+        self.assertEqual(Employee.objects.get(employee_id='NEW001').team, self.team)
+        self.assertIn('new001', Employee.objects.get(employee_id='NEW001').search_text)
+
+    def test_csv_accepts_chinese_headers_and_labels(self):
+        body = '员工编号,姓名,性别,department_id,身份证号,政治面貌,出生日期\n' \
+               f'C001,王五,女,{self.department.id},110101199202020000,中共党员,1992-02-02\n'
+        result = self.client.post('/api/employees/bulk', data=body.encode('utf-8-sig'),
+                                  content_type='text/csv').json()
+        self.assertEqual(result['created'], 1, result)
+        employee = Employee.objects.get(employee_id='C001')
+        self.assertEqual((employee.gender, employee.political_status), (False, 'party_member'))
+        self.assertEqual(employee.birthday, date(1992, 2, 2))
+
+    def test_invalid_choice_and_date_are_reported(self):
+        result = self.post_jsonl([self.row(1, political_status='unknown', birthday='1990-13-01')])
+        self.assertEqual(result['created'], 0)
+        fields = {message.split(':')[0] for message in result['errors'][0]['errors']}
+        self.assertEqual(fields, {'political_status', 'birthday'})
+
+    def test_duplicate_fail_rolls_back_everything(self):
+        result = self.post_jsonl([self.row(1), self.row(2, employee_id='OLD001')])
+        self.assertFalse(result['committed'])
+        self.assertEqual(result['errors'][0]['row'], 2)
+        self.assertFalse(Employee.objects.filter(employee_id='NEW001').exists())
+
+    def test_duplicate_skip(self):
+        result = self.post_jsonl([self.row(1), self.row(1), self.row(2, employee_id='OLD001')], on_duplicate='skip')
+        self.assertEqual((result['created'], result['skipped']), (1, 2))
+
+    def test_duplicate_upsert_updates_existing(self):
+        existing = self.row(9, employee_id='OLD001', name='改名', id_card_number='110101198001010000')
+        result = self.post_jsonl([self.row(1), existing], on_duplicate='upsert')
+        self.assertEqual((result['created'], result['updated']), (1, 1))
+        self.assertEqual(Employee.objects.get(employee_id='OLD001').name, '改名')
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_upsert_rename_updates_search_index(self):
+        renamed = self.row(9, employee_id='OLD001', name='李四', id_card_number='110101198001010000')
+        self.assertEqual(self.post_jsonl([renamed], on_duplicate='upsert')['updated'], 1)
+
+        def search(term):
+            return [row['employee_id'] for row in self.client.get('/api/employees/search', {'q': term}).json()]
+        self.assertEqual(search('李四'), ['OLD001'])
+        self.assertEqual(search('老员工'), [])
+
+    def test_lookup_queries_do_not_grow_with_rows(self):
+        counts = []
+        for start, size in ((0, 10), (100, 80)):
+            with CaptureQueriesContext(connection) as queries:
+                result = self.post_jsonl([self.row(i) for i in range(start, start + size)], chunk_size=100)
+            self.assertEqual(result['created'], size)
+            counts.append(sum(not query['sql'].startswith('INSERT') for query in queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class EmployeeExportTests(APITestCase):
+    """员工花名册导出测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.team = ResearchTeam.objects.create(name='遥感团队', department=cls.department)
+        Employee.objects.create(
+            employee_id='X001', name='张三', gender=True, department=cls.department, team=cls.team,
+            id_card_number='110101199001011234', political_status='party_member', birthday=date(1990, 1, 1),
+        )
+        create_employees(cls.department, 20, start=1)
+        Employee.objects.filter(employee_id='E00001').update(is_active=False)
+
+    def export(self, **params):
+        response = self.client.get('/api/employees/export', params)
+        self.assertEqual(response.status_code, 200)
+        # WSGI 下为同步迭代器，Django 逐块输出，不会先整体读入内存
+        self.assertFalse(response.is_async)
+        return b''.join(response.streaming_content)
+
+    def test_streams_sync_iterator_under_wsgi(self):
+        response = self.client.get('/api/employees/export', {'format': 'xlsx'})
+        self.assertFalse(response.is_async)
+        self.assertFalse(hasattr(response.streaming_content, '__aiter__'))
+        self.assertTrue(zipfile.is_zipfile(io.BytesIO(b''.join(response.streaming_content))))
+
+    async def test_streams_async_iterator_under_asgi(self):
+        # ASGI 下按块异步输出，不会先把整个文件读入内存
+        response = await AsyncClient().get('/api/employees/export', {'format': 'xlsx'}, headers=self.auth_headers)
+        self.assertTrue(response.is_async)
+        self.assertTrue(hasattr(response.streaming_content, '__aiter__'))
+        self.assertTrue(zipfile.is_zipfile(io.BytesIO(await read_streaming_content(response))))
+
+    def test_csv_uses_labels_and_filters(self):
+        with self.assertNumQueries(1):
+            content = self.export(is_active=True)
+        rows = list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 20)
+        row = next(row for row in rows if row['员工编号'] == 'X001')
+        self.assertEqual((row['性别'], row['政治面貌'], row['所在部门']), ('男', '中共党员', '科研处'))
+        self.assertEqual((row['所属科研创新团队'], row['出生日期'], row['是否在职']), ('遥感团队', '1990-01-01', '是'))
+
+    def test_xlsx_is_a_valid_workbook(self):
+        content = self.export(format='xlsx', department_id=self.department.id)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        namespace = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+        rows = sheet.findall(f'{namespace}sheetData/{namespace}row')
+        self.assertEqual(len(rows), 22)
+        self.assertEqual(rows[0][0].findtext(f'{namespace}is/{namespace}t'), '员工编号')
+
+    def test_exported_csv_can_be_imported_again(self):
+        content = self.export(employee_id='X001')
+        Employee.objects.filter(employee_id='X001').delete()
+        result = self.client.post('/api/employees/bulk', data=content, content_type='text/csv').json()
+        self.assertEqual(result['created'], 1, result)
+        employee = Employee.objects.get(employee_id='X001')
+        self.assertEqual((employee.team, employee.political_status), (self.team, 'party_member'))
+
+
+class EmployeePatchTests(APITestCase):
+    """员工部分更新接口测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.other_department = Department.objects.create(name='办公室')
+        cls.employee = create_employees(cls.department, 1)[0]
+
+    def patch(self, data):
+        return self.client.patch(f'/api/employees/{self.employee.id}', data, content_type='application/json')
+
+    def test_only_changed_columns_are_written(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({'mobile_phone': '13912345678', 'name': self.employee.name})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['mobile_phone'], '13912345678')
+        [update] = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertIn('"mobile_phone"', update)
+        self.assertIn('"search_text"', update)
+        self.assertNotIn('"name"', update)
+        self.assertNotIn('"department_id"', update)
+        # 检索文本随之更新
+        self.assertEqual(self.client.get('/api/employees/search', {'q': '12345678'}).json()[0]['id'], self.employee.id)
+
+    def test_unchanged_payload_skips_write(self):
+        self.patch({'birthday': '1990-01-01'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({'birthday': '1990-01-01', 'gender': self.employee.gender})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+
+    def test_department_change_is_validated(self):
+        self.assertEqual(self.patch({'department_id': 999999}).status_code, 400)
+        response = self.patch({'department_id': self.other_department.id})
+        self.assertEqual(response.json()['department_name'], '办公室')
+
+    def test_null_for_required_field_is_rejected(self):
+        self.assertEqual(self.patch({'name': None}).status_code, 422)
+        self.assertEqual(self.patch({'birthday': 'not-a-date'}).status_code, 400)
+        self.assertEqual(self.client.patch('/api/employees/999999', {}, content_type='application/json').status_code, 404)
+
+
+class EmployeeStatsTests(APITestCase):
+    """员工统计接口测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.department = Department.objects.create(name='科研处')
+        cls.office = Department.objects.create(name='办公室')
+        cls.employee = Employee.objects.create(
+            employee_id='S001', name='张三', gender=True, department=cls.department, id_card_number='S001',
+            birthday=years_ago(today, 30), political_status='party_member', professional_title='senior_researcher',
+            highest_education='doctor', highest_degree='doctorate',
+        )
+        Employee.objects.create(
+            employee_id='S002', name='李四', gender=False, department=cls.office, id_card_number='S002',
+            birthday=years_ago(today, 30) + timedelta(days=1),
+        )
+        create_employees(cls.department, 3, start=10)
+        Employee.objects.filter(employee_id='E00010').update(is_active=False)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def stats(self):
+        return self.client.get('/api/stats/').json()
+
+    @staticmethod
+    def counts(items):
+        return {item['key']: item['count'] for item in items if item['count']}
+
+    def test_breakdowns(self):
+        with self.assertNumQueries(6):
+            stats = self.stats()
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual([(row['name'], row['count']) for row in stats['by_department']], [('科研处', 3), ('办公室', 1)])
+        self.assertEqual(self.counts(stats['by_gender']), {True: 2, False: 2})
+        # 恰好30周岁归入30-39岁，差一天未满30周岁
+        age_bands = self.counts(stats['by_age_band'])
+        self.assertEqual((age_bands['under_30'], age_bands['30_39'], sum(age_bands.values())), (1, 1, 4))
+        self.assertEqual(self.counts(stats['by_political_status']), {'party_member': 1, 'masses': 3})
+        self.assertEqual(self.counts(stats['by_professional_title']), {'senior_researcher': 1, None: 3})
+        self.assertEqual(self.counts(stats['by_degree']), {'doctorate': 1, 'none': 3})
+        # 全部选项均列出，便于前端直接绘图
+        self.assertEqual(len(stats['by_education']), 7)
+
+    def test_cached_until_relevant_change(self):
+        self.stats()
+        employee = Employee.objects.get(pk=self.employee.pk)
+        employee.mobile_phone = '13800000000'
+        employee.save()
+        with self.assertNumQueries(0):
+            self.stats()
+
+        employee.political_status = 'masses'
+        employee.save()
+        self.assertEqual(self.counts(self.stats()['by_political_status']), {'masses': 4})
+
+        self.client.post(
+            '/api/employees/bulk', data='employee_id,name,gender,department_id,id_card_number\nS003,王五,女,%d,S003\n'
+            % self.office.id, content_type='text/csv',
+        )
+        self.assertEqual(self.stats()['total'], 5)
+
+
+class EmployeeDateFilterTests(APITestCase):
+    """年龄、工龄与日期范围筛选测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.department = Department.objects.create(name='科研处')
+        cls.ages = {'A35': 35, 'A45': 45, 'A46': 46, 'A20': 20}
+        for employee_id, age in cls.ages.items():
+            Employee.objects.create(
+                employee_id=employee_id, name=employee_id, gender=True, department=cls.department,
+                id_card_number=employee_id, birthday=years_ago(today, age),
+                work_start_date=years_ago(today, max(age - 22, 0)) + timedelta(days=1),
+                join_institute_date=date(1990 + age % 30, 1, 1),
+            )
+        Employee.objects.create(
+            employee_id='NOBIRTH', name='未知', gender=True, department=cls.department, id_card_number='NOBIRTH',
+        )
+
+    def employee_ids(self, **params):
+        items = self.client.get('/api/employees/', {'page_size': 100, **params}).json()['items']
+        return sorted(item['employee_id'] for item in items)
+
+    def test_age_range_is_inclusive(self):
+        self.assertEqual(self.employee_ids(age_min=35, age_max=45), ['A35', 'A45'])
+        self.assertEqual(self.employee_ids(age_min=46), ['A46'])
+        self.assertEqual(self.employee_ids(age_max=20), ['A20'])
+
+    def test_age_filter_compiles_to_date_comparison(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.employee_ids(age_min=35, age_max=45)
+        [select] = [query['sql'] for query in queries if 'LIMIT' in query['sql']]
+        where = select.split('WHERE', 1)[1]
+        self.assertIn('"employees_employee"."birthday" <=', where)
+        self.assertIn('"employees_employee"."birthday" >', where)
+        self.assertNotIn('django_date_extract', where)
+
+    def test_seniority_and_date_ranges(self):
+        # 工龄比年龄少22年且差一天满周年
+        self.assertEqual(self.employee_ids(seniority_min=23), ['A46'])
+        self.assertEqual(self.employee_ids(birthday_to=years_ago(date.today(), 45).isoformat()), ['A45', 'A46'])
+        self.assertEqual(self.employee_ids(join_date_from='2005-01-01', join_date_to='2006-06-30'), ['A45', 'A46'])
+
+    def test_age_comes_from_database(self):
+        rows = self.client.get('/api/employees/', {'page_size': 100}).json()['items']
+        ages = {row['employee_id']: row['age'] for row in rows}
+        self.assertEqual(ages, {**self.ages, 'NOBIRTH': None})
+        employee = Employee.objects.get(employee_id='A45')
+        self.assertEqual(self.client.get(f'/api/employees/{employee.id}').json()['age'], calculate_age(employee.birthday))
+
+
+class EmployeeForecastTests(APITestCase):
+    """退休、晋升资格与入所周年预测报表测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        people = [
+            ('M60', True, {'birthday': date(1970, 6, 15)}),
+            ('F55', False, {'birthday': date(1975, 6, 20)}),
+            ('F60', False, {'birthday': date(1970, 6, 15)}),
+            ('M-LATE', True, {'birthday': date(1970, 7, 1)}),
+            ('LEAP', False, {'birthday': date(1964, 2, 29)}),
+            ('TITLE', True, {'professional_title': 'associate_researcher', 'title_appointment_date': date(2025, 6, 5)}),
+            ('TOP', True, {'professional_title': 'senior_researcher', 'title_appointment_date': date(2025, 6, 5)}),
+            ('POSITION', True, {'position_level': 'level_3', 'position_appointment_date': date(2027, 6, 25)}),
+            ('JOIN20', True, {'join_institute_date': date(2010, 6, 2)}),
+            ('JOIN15', True, {'join_institute_date': date(2015, 6, 2)}),
+        ]
+        for employee_id, gender, fields in people:
+            Employee.objects.create(
+                employee_id=employee_id, name=employee_id, gender=gender, department=cls.department,
+                id_card_number=employee_id, **fields,
+            )
+        Employee.objects.create(
+            employee_id='RETIRED', name='RETIRED', gender=True, department=cls.department, id_card_number='RETIRED',
+            birthday=date(1970, 6, 10), is_active=False,
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def forecast(self, report, start='2030-06-01', days=30):
+        response = self.client.get('/api/reports/forecast', {'report': report, 'start': start, 'days': days})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_retirement(self):
+        with self.assertNumQueries(1):
+            result = self.forecast('retirement')
+        self.assertEqual(result['end'], '2030-06-30')
+        self.assertEqual(
+            [(item['employee_id'], item['event_date']) for item in result['items']],
+            [('M60', '2030-06-15'), ('F55', '2030-06-20')],
+        )
+        # 2月29日出生者在平年按3月1日满周岁
+        self.assertEqual(self.forecast('retirement', '2019-03-01', 1)['total'], 1)
+        self.assertEqual(self.forecast('retirement', '2019-02-28', 1)['total'], 0)
+
+    def test_promotion_and_anniversary(self):
+        promotion = self.forecast('promotion')['items']
+        self.assertEqual(
+            [(item['employee_id'], item['kind']) for item in promotion],
+            [('TITLE', 'promotion_title'), ('POSITION', 'promotion_position')],
+        )
+        anniversary = self.forecast('anniversary')['items']
+        self.assertEqual([(item['employee_id'], item['years']) for item in anniversary], [('JOIN20', 20)])
+
+    def test_cached_until_relevant_change(self):
+        self.forecast('retirement')
+        employee = Employee.objects.get(employee_id='M60')
+        employee.mobile_phone = '13800000000'
+        employee.save()
+        with self.assertNumQueries(0):
+            self.forecast('retirement')
+
+        employee.birthday = date(1970, 7, 15)
+        employee.save()
+        self.assertEqual(self.forecast('retirement')['total'], 1)
+
+
+@skipUnless(connection.vendor == 'sqlite', '断言针对 SQLite 的查询计划输出')
+class EmployeeQueryPlanTests(APITestCase):
+    """员工列表各筛选组合的查询计划测试：列表、游标分页与计数查询均应走索引"""
+
+    TABLE = Employee._meta.db_table
+
+    def plans(self, **filters):
+        from api.employees import EmployeeQuery, filter_employees, project_employees
+        from api.pagination import CURSOR_ORDERING
+
+        queryset = filter_employees(EmployeeQuery(**filters))
+        return {
+            'list': project_employees(queryset)[:20],
+            'cursor': project_employees(queryset).order_by(*CURSOR_ORDERING)[:21],
+            'count': queryset.order_by(),
+        }
+
+    def test_department_and_status_filters(self):
+        for department_id, is_active, name in product((None, 1), (None, True, False), (None, '张')):
+            filters = {'department_id': department_id, 'is_active': is_active, 'name': name}
+            for kind, queryset in self.plans(**filters).items():
+                # 不带筛选或只按姓名包含匹配时，计数本就需要遍历全部行
+                if kind == 'count' and department_id is None and is_active is None:
+                    continue
+                with self.subTest(filters=filters, query=kind):
+                    self.assertNoTableScan(queryset, self.TABLE)
+
+    def test_date_range_filters(self):
+        for filters in ({'age_min': 30, 'age_max': 40}, {'join_date_from': date(2010, 1, 1)}, {'seniority_min': 10}):
+            with self.subTest(filters=filters):
+                self.assertNoTableScan(self.plans(is_active=True, **filters)['count'], self.TABLE)
+
+
+class EmployeeSparseFieldsTests(APITestCase):
+    """员工列表与详情的稀疏字段与关联嵌入测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.team = ResearchTeam.objects.create(name='遥感团队', department=cls.department)
+        create_employees(cls.department, 3, team=cls.team)
+        create_employees(cls.department, 2, start=3)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.get('/api/employees/')  # 预热总数缓存
+
+    def test_fields_limit_columns_and_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/employees/', {'fields': 'name,department_name'})
+        items = response.json()['items']
+        self.assertEqual(items[0], {'id': items[0]['id'], 'name': items[0]['name'], 'department_name': '科研处'})
+        sql = queries[0]['sql']
+        self.assertNotIn('id_card_number', sql)
+        self.assertNotIn('teams_researchteam', sql)
+
+        full = self.client.get('/api/employees/')
+        self.assertLess(len(response.content) * 5, len(full.content))
+
+    def test_include_embeds_related_objects(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/employees/', {'fields': 'employee_id', 'include': 'team,department'})
+        items = {item['employee_id']: item for item in response.json()['items']}
+        self.assertEqual(items['E00000']['team'], {'id': self.team.id, 'name': '遥感团队', 'leader_id': None})
+        self.assertEqual(items['E00000']['department'], {'id': self.department.id, 'name': '科研处'})
+        self.assertIsNone(items['E00004']['team'])
+
+    def test_cursor_pagination_with_fields(self):
+        response = self.client.get('/api/employees/', {'fields': 'name', 'cursor': '', 'page_size': 2})
+        page = response.json()
+        self.assertEqual(set(page['items'][0]), {'id', 'name'})
+        following = self.client.get('/api/employees/', {'fields': 'name', 'cursor': page['next_cursor'], 'page_size': 2})
+        self.assertEqual(len(following.json()['items']), 2)
+        self.assertEqual(page['total'], 5)
+
+    def test_detail_fields_and_dates(self):
+        employee = Employee.objects.get(employee_id='E00000')
+        row = self.client.get(f'/api/employees/{employee.id}', {'fields': 'birthday,age'}).json()
+        self.assertEqual(row, {'id': employee.id, 'birthday': '1980-01-01', 'age': calculate_age(date(1980, 1, 1))})
+
+    def test_unknown_fields_rejected(self):
+        self.assertEqual(self.client.get('/api/employees/', {'fields': 'salary'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/employees/', {'include': 'manager'}).status_code, 400)
+
+
+class EmployeeColumnarTests(APITestCase):
+    """员工列表与导出的列式响应测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        create_employees(cls.department, 20)
+        Employee.objects.filter(employee_id='E00000').update(political_status='party_member')
+
+    def test_list_columnar_matches_rows(self):
+        rows = self.client.get('/api/employees/', {'page_size': 20}).json()
+        response = self.client.get('/api/employees/', {'page_size': 20, 'format': 'columnar'})
+        self.assertEqual(response['Vary'], 'Accept')
+        page = response.json()
+        self.assertEqual((page['total'], page['page_size']), (20, 20))
+
+        enums = page['enums']
+        self.assertEqual(enums['political_status'][0], ['party_member', '中共党员'])
+        self.assertNotIn('name', enums)
+        decoded = [
+            {
+                column: enums[column][value][0] if column in enums and value is not None else value
+                for column, value in zip(page['columns'], values)
+            }
+            for values in zip(*page['data'])
+        ]
+        self.assertEqual(decoded, rows['items'])
+        self.assertLess(len(response.content) * 2, len(json.dumps(rows, ensure_ascii=False).encode()))
+
+    def test_columnar_with_sparse_fields(self):
+        page = self.client.get('/api/employees/', {'fields': 'name,political_status', 'include': 'department', 'format': 'columnar'}).json()
+        self.assertEqual(page['columns'], ['id', 'name', 'political_status', 'department'])
+        self.assertEqual(list(page['enums']), ['political_status'])
+        self.assertEqual(page['data'][3][0], {'id': self.department.id, 'name': '科研处'})
+
+    def test_export_columnar_is_paged(self):
+        params = {'format': 'columnar', 'department_id': self.department.id, 'page_size': 15}
+        first = self.client.get('/api/employees/export', params).json()
+        self.assertEqual((first['total'], len(first['data'][0])), (20, 15))
+        political_status = first['data'][first['columns'].index('political_status')]
+        codes = [code for code, _ in first['enums']['political_status']]
+        self.assertLessEqual(set(political_status), {codes.index('party_member'), codes.index('masses')})
+
+        rest = self.client.get('/api/employees/export', {**params, 'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(rest['data'][0]), 5)
+        self.assertIsNone(rest['next_cursor'])
+        ids = first['data'][0] + rest['data'][0]
+        self.assertEqual(len(set(ids)), 20)
+        self.assertEqual(self.client.get('/api/employees/export', {**params, 'page_size': 100000}).status_code, 422)
+
+    def test_msgpack_falls_back_to_json(self):
+        from api import columnar
+        response = self.client.get('/api/employees/', {'format': 'columnar'}, HTTP_ACCEPT='application/msgpack')
+        if columnar.msgpack is None:
+            self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
+        else:
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertEqual(columnar.msgpack.unpackb(response.content)['total'], 20)
@@ -3,6 +3,8 @@ ASGI config for hr_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+运行方式：uvicorn hr_backend.asgi:application --port 8000（变更推送 /api/changes 只在 ASGI 下提供）
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +15,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# 需在 Django 初始化之后导入
+from sync.feed import ChangeFeedApp  # noqa: E402
+
+# /api/changes 的变更推送长连接直接在 ASGI 层处理，其余请求交给 Django
+application = ChangeFeedApp(django_application)
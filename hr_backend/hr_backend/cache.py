@@ -0,0 +1,36 @@
+"""基于版本号的缓存失效工具
+
+缓存键中带上命名空间的当前版本号，数据变更时只需递增版本号，
+旧版本的缓存项不再被读取并由缓存后端自然淘汰。
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(namespace: str) -> str:
+    return f'{namespace}:version'
+
+
+def get_version(namespace: str) -> int:
+    """获取命名空间的当前版本号"""
+    # 以纳秒时间戳作为初始值，避免版本号被淘汰后重新从同一数值开始而命中旧缓存
+    return cache.get_or_set(_version_key(namespace), time.time_ns, timeout=None)
+
+
+async def aget_version(namespace: str) -> int:
+    """get_version 的异步版本"""
+    return await cache.aget_or_set(_version_key(namespace), time.time_ns, timeout=None)
+
+
+def bump_version(namespace: str) -> None:
+    """递增命名空间的版本号，使该命名空间下的缓存全部失效"""
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def count_namespace(model) -> str:
+    """模型列表总数缓存的命名空间"""
+    return f'{model._meta.label_lower}:count'
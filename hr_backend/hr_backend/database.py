@@ -0,0 +1,112 @@
+"""由环境变量生成数据库配置
+
+DB_ENGINE 取 sqlite（默认，开发与小型部署）或 postgresql（生产）。SQLite 下：
+
+- DB_NAME：数据库文件路径，默认为项目目录下的 db.sqlite3
+- DB_SQLITE_TUNING：新建连接时启用 WAL 等性能设置，默认开启
+- DB_SQLITE_BUSY_TIMEOUT：等待写锁的毫秒数，默认 5000
+- DB_SQLITE_MMAP_SIZE / DB_SQLITE_CACHE_SIZE：内存映射字节数与页缓存大小（负数表示 KiB）
+
+PostgreSQL 下：
+
+- DB_NAME / DB_USER / DB_PASSWORD / DB_HOST / DB_PORT：连接参数
+- DB_CONN_MAX_AGE：持久连接秒数，默认 60；设为 0 则每个请求重新连接
+- DB_CONN_HEALTH_CHECKS：复用持久连接前先检查其可用性，默认开启
+- DB_POOL：启用 Django 5.1+ 的连接池（需安装 psycopg 3 及 psycopg-pool），
+  取 true 使用默认池大小，或取整数指定 max_size；启用后持久连接不再生效
+- DB_POOL_MIN_SIZE / DB_POOL_TIMEOUT：连接池最小连接数与获取连接的超时秒数
+- DB_STATEMENT_TIMEOUT：单条语句超时毫秒数，默认 30000，0 表示不限制
+"""
+import importlib.util
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+FALSE_VALUES = {'0', 'false', 'no', 'off', ''}
+
+
+def _flag(value: str) -> bool:
+    return value.strip().lower() in TRUE_VALUES
+
+
+def sqlite_options(env) -> dict:
+    """SQLite 的连接参数
+
+    - WAL 日志让读操作不再被写事务阻塞，写入只追加日志，配合 synchronous=NORMAL 每次提交无需 fsync；
+    - busy_timeout 让写锁冲突时等待而不是立即报 database is locked；
+    - 写事务以 BEGIN IMMEDIATE 开始，在事务开头即取得写锁，多个写事务按到达顺序串行执行，
+      避免 DEFERRED 事务先读后写、升级写锁时互相死锁（这种情况 busy_timeout 也无法重试）。
+    """
+    if not _flag(env.get('DB_SQLITE_TUNING', 'true')):
+        return {}
+    pragmas = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={int(env.get("DB_SQLITE_BUSY_TIMEOUT", "5000"))}',
+        f'PRAGMA mmap_size={int(env.get("DB_SQLITE_MMAP_SIZE", "268435456"))}',
+        f'PRAGMA cache_size={int(env.get("DB_SQLITE_CACHE_SIZE", "-65536"))}',
+        'PRAGMA temp_store=MEMORY',
+    ]
+    return {
+        'init_command': ';'.join(pragmas),
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+
+def _pool_options(value: str, env) -> dict:
+    """解析 DB_POOL；未启用时返回空字典"""
+    value = value.strip().lower()
+    if value in FALSE_VALUES:
+        return {}
+    if importlib.util.find_spec('psycopg') is None or importlib.util.find_spec('psycopg_pool') is None:
+        raise ImproperlyConfigured('DB_POOL 需要安装 psycopg[pool]（psycopg 3），psycopg2 不支持连接池')
+    pool = {
+        'min_size': int(env.get('DB_POOL_MIN_SIZE', '2')),
+        'timeout': float(env.get('DB_POOL_TIMEOUT', '10')),
+    }
+    if value not in TRUE_VALUES:
+        pool['max_size'] = int(value)
+    return pool
+
+
+def database_config(env=None, base_dir=None) -> dict:
+    """根据环境变量返回 DATABASES['default']"""
+    env = os.environ if env is None else env
+    engine = env.get('DB_ENGINE', 'sqlite').strip().lower()
+    if engine not in ENGINES:
+        raise ImproperlyConfigured(f'不支持的 DB_ENGINE：{engine}，可选 {", ".join(ENGINES)}')
+
+    if engine == 'sqlite':
+        return {
+            'ENGINE': ENGINES[engine],
+            'NAME': env.get('DB_NAME') or base_dir / 'db.sqlite3',
+            'OPTIONS': sqlite_options(env),
+        }
+
+    options = {}
+    statement_timeout = int(env.get('DB_STATEMENT_TIMEOUT', '30000'))
+    if statement_timeout:
+        # 以连接参数设置，对每个新连接生效，无需额外的 SET 往返
+        options['options'] = f'-c statement_timeout={statement_timeout}'
+    pool = _pool_options(env.get('DB_POOL', ''), env)
+    if pool:
+        options['pool'] = pool
+
+    return {
+        'ENGINE': ENGINES[engine],
+        'NAME': env.get('DB_NAME', 'hr_backend'),
+        'USER': env.get('DB_USER', ''),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', ''),
+        'PORT': env.get('DB_PORT', ''),
+        # 连接池自行管理连接复用，Django 要求此时 CONN_MAX_AGE 为 0
+        'CONN_MAX_AGE': 0 if pool else int(env.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': _flag(env.get('DB_CONN_HEALTH_CHECKS', 'true')),
+        'OPTIONS': options,
+    }
@@ -14,6 +14,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 import os
 
+from .database import database_config
+
 # 加载环境变量
 load_dotenv()
 
@@ -46,9 +48,12 @@ INSTALLED_APPS = [
     'employees',
     'departments',
     'teams',
+    'sync',
 ]
 
 MIDDLEWARE = [
+    # 放在最外层，统计的耗时覆盖其余中间件
+    'api.instrumentation.metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,19 +85,80 @@ WSGI_APPLICATION = 'hr_backend.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# 由 DB_ENGINE 等环境变量选择 SQLite 或 PostgreSQL，详见 hr_backend/database.py
 
 DATABASES = {
+    'default': database_config(base_dir=BASE_DIR),
+}
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'hr-backend'),
     }
 }
 
+# 部门树、员工统计与预测报表等派生缓存的默认有效期（秒）。数据变更时由信号主动失效，但失效只作用于
+# 发出信号的进程可见的缓存：本地内存缓存（LocMemCache）为每个进程独有，多进程部署时其他进程的旧结果
+# 要等到过期才会更新，因此默认只缓存 60 秒；配置共享缓存（如 Redis、Memcached）后默认缓存一天
+LOCAL_MEMORY_CACHE = CACHES['default']['BACKEND'].endswith('.LocMemCache')
+DERIVED_CACHE_TIMEOUT = '60' if LOCAL_MEMORY_CACHE else '86400'
+
+# 部门树缓存有效期（秒），数据变更时通过信号主动失效
+DEPARTMENT_TREE_CACHE_TIMEOUT = int(os.getenv('DEPARTMENT_TREE_CACHE_TIMEOUT', DERIVED_CACHE_TIMEOUT))
+
+# 列表总数缓存有效期（秒），数据变更时通过信号主动失效
+LIST_COUNT_CACHE_TIMEOUT = int(os.getenv('LIST_COUNT_CACHE_TIMEOUT', '300'))
+
+# 员工统计缓存有效期（秒），影响统计的员工字段变更时通过信号主动失效
+EMPLOYEE_STATS_CACHE_TIMEOUT = int(os.getenv('EMPLOYEE_STATS_CACHE_TIMEOUT', DERIVED_CACHE_TIMEOUT))
+
+# 预测报表缓存有效期（秒），相关员工字段变更时通过信号主动失效
+EMPLOYEE_REPORTS_CACHE_TIMEOUT = int(os.getenv('EMPLOYEE_REPORTS_CACHE_TIMEOUT', DERIVED_CACHE_TIMEOUT))
+
+# 预测报表规则：退休年龄、晋升所需任职年限、入所纪念周年
+RETIREMENT_AGE_MALE = int(os.getenv('RETIREMENT_AGE_MALE', '60'))
+RETIREMENT_AGE_FEMALE = int(os.getenv('RETIREMENT_AGE_FEMALE', '55'))
+PROMOTION_TITLE_YEARS = int(os.getenv('PROMOTION_TITLE_YEARS', '5'))
+PROMOTION_POSITION_YEARS = int(os.getenv('PROMOTION_POSITION_YEARS', '3'))
+SERVICE_ANNIVERSARY_YEARS = [int(years) for years in os.getenv('SERVICE_ANNIVERSARY_YEARS', '10,20,30,40').split(',')]
+
+# 接口监控：超过该毫秒数的请求连同 SQL 写入 api.slow 日志，0 表示关闭；
+# 设置 API_METRICS_TOKEN 后抓取 /api/metrics 需携带 Bearer 令牌
+API_SLOW_REQUEST_MS = int(os.getenv('API_SLOW_REQUEST_MS', '0'))
+API_METRICS_TOKEN = os.getenv('API_METRICS_TOKEN', '')
+
+# 列表、详情等接口的行由数据库投影，开启时直接渲染，不再按输出模型逐行校验
+API_TRUSTED_ROWS = os.getenv('API_TRUSTED_ROWS', 'True').lower() == 'true'
+
+# 增量同步：令牌回退的秒数（覆盖提交较晚的并发写入，客户端按ID覆盖重复的记录）、
+# 删除日志保留天数（更早的令牌需全量重新加载）、单次返回的最大变更数（超过时要求全量重新加载）
+SYNC_WATERMARK_LAG = int(os.getenv('SYNC_WATERMARK_LAG', '5'))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+SYNC_MAX_CHANGES = int(os.getenv('SYNC_MAX_CHANGES', '1000'))
+
+# 变更推送：事件分发后端（多进程部署时替换为共享后端的实现）、心跳间隔与单个连接的最长秒数
+CHANGE_FEED_BROKER = os.getenv('CHANGE_FEED_BROKER', 'sync.broker.InProcessBroker')
+CHANGE_FEED_HEARTBEAT = int(os.getenv('CHANGE_FEED_HEARTBEAT', '15'))
+CHANGE_FEED_MAX_AGE = int(os.getenv('CHANGE_FEED_MAX_AGE', '600'))
+
 # JWT Settings
 JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_ACCESS_TOKEN_LIFETIME = int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', '3600'))  # 1 hour
 JWT_REFRESH_TOKEN_LIFETIME = int(os.getenv('JWT_REFRESH_TOKEN_LIFETIME', '86400'))  # 24 hours
+# 认证用户的进程内缓存：最多缓存的用户数与缓存秒数；用户保存或删除时经 JWT_REVOCATION_CACHE
+# 中的版本标记使所有进程的缓存条目失效
+JWT_USER_CACHE_SIZE = int(os.getenv('JWT_USER_CACHE_SIZE', '1024'))
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', '300'))
+# 已校验令牌的进程内缓存条目数
+JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE', '4096'))
+# 令牌吊销列表与用户版本标记使用的缓存别名；多进程部署时需配置为共享缓存（如 Redis），
+# 登出、停用用户与修改密码才能对所有进程立即生效；DEBUG 关闭而该别名为本地内存缓存时启动时记录告警
+JWT_REVOCATION_CACHE = os.getenv('JWT_REVOCATION_CACHE', 'default')
 
 
 # Password validation
@@ -0,0 +1,73 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from .database import database_config
+
+BASE_DIR = Path('/srv/hr')
+
+
+class DatabaseConfigTests(SimpleTestCase):
+    """环境变量驱动的数据库配置测试"""
+
+    def test_sqlite_by_default(self):
+        config = database_config({}, BASE_DIR)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], BASE_DIR / 'db.sqlite3')
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA journal_mode=WAL', config['OPTIONS']['init_command'])
+
+    def test_sqlite_tuning_can_be_disabled(self):
+        config = database_config({'DB_SQLITE_TUNING': 'false'}, BASE_DIR)
+        self.assertEqual(config['OPTIONS'], {})
+
+    def test_sqlite_pragmas_applied_on_connect(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # 独立的连接句柄，不影响测试数据库
+            settings = ConnectionHandler().configure_settings({
+                'default': database_config({'DB_NAME': f'{directory}/hr.sqlite3', 'DB_SQLITE_BUSY_TIMEOUT': '1234'}),
+            })
+            wrapper = ConnectionHandler(settings)['default']
+            connection = wrapper.get_new_connection(wrapper.get_connection_params())
+            try:
+                pragmas = {
+                    name: connection.execute(f'PRAGMA {name}').fetchone()[0]
+                    for name in ('journal_mode', 'synchronous', 'busy_timeout')
+                }
+            finally:
+                connection.close()
+        # synchronous=NORMAL 的取值为 1
+        self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 1234})
+
+    def test_postgresql_persistent_connections(self):
+        config = database_config({
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'hr', 'DB_USER': 'hr', 'DB_HOST': 'db', 'DB_PORT': '5432',
+            'DB_CONN_MAX_AGE': '120', 'DB_STATEMENT_TIMEOUT': '5000',
+        }, BASE_DIR)
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['CONN_MAX_AGE'], 120)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertEqual(config['OPTIONS'], {'options': '-c statement_timeout=5000'})
+
+    def test_statement_timeout_can_be_disabled(self):
+        config = database_config({'DB_ENGINE': 'postgresql', 'DB_STATEMENT_TIMEOUT': '0'}, BASE_DIR)
+        self.assertEqual(config['OPTIONS'], {})
+
+    def test_pool_disables_persistent_connections(self):
+        with mock.patch('importlib.util.find_spec', return_value=object()):
+            config = database_config({'DB_ENGINE': 'postgresql', 'DB_POOL': '20'}, BASE_DIR)
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 2, 'timeout': 10.0, 'max_size': 20})
+
+    def test_pool_requires_psycopg3(self):
+        with mock.patch('importlib.util.find_spec', return_value=None):
+            with self.assertRaises(ImproperlyConfigured):
+                database_config({'DB_ENGINE': 'postgresql', 'DB_POOL': 'true'}, BASE_DIR)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_config({'DB_ENGINE': 'oracle'}, BASE_DIR)
@@ -0,0 +1,79 @@
+"""变更事件的发布与订阅
+
+模型信号在事务提交后调用 publish_change 发布事件，变更推送通道（sync.feed）为每个连接订阅事件流。
+默认的 InProcessBroker 只在当前进程内分发；多进程部署时可将 CHANGE_FEED_BROKER 配置为基于
+Redis 等共享后端的实现，只需提供相同的 publish 与 subscribe 方法。
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# 订阅者积压的事件超过该数量时丢弃积压，改为通知客户端全量同步
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# 订阅者积压溢出时收到的事件
+OVERFLOW_EVENT = {'model': None, 'op': 'resync', 'id': None}
+
+
+class InProcessBroker:
+    """进程内的事件分发，publish 可在任意线程调用，subscribe 在事件循环中消费"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def publish(self, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_deliver, queue, event)
+            except RuntimeError:
+                # 事件循环已关闭，订阅者随之失效
+                pass
+
+    async def subscribe(self):
+        """异步迭代订阅期间发布的事件，迭代结束（或被取消）时自动退订"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+def _deliver(queue: asyncio.Queue, event: dict):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # 客户端消费过慢：丢弃积压的事件，只保留一条全量同步通知
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(OVERFLOW_EVENT)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """按 CHANGE_FEED_BROKER 配置创建的进程内单例"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.CHANGE_FEED_BROKER)()
+    return _broker
+
+
+def publish_change(model: str, op: str, object_id=None):
+    """发布一条变更事件：model 为 employees、departments、teams，op 为 upsert、delete 或 bulk"""
+    get_broker().publish({'model': model, 'op': op, 'id': object_id})
@@ -0,0 +1,101 @@
+"""变更推送通道（Server-Sent Events）
+
+由 hr_backend/asgi.py 挂载在 Django 之前，直接以 ASGI 协议处理 /api/changes：长连接不占用
+Django 的请求处理流程与线程池，空闲的仪表盘只保持一个连接，无需轮询列表接口。
+
+浏览器的 EventSource 不能设置请求头，访问令牌通过查询参数 token 传入。每条事件形如
+{"model": "employees", "op": "upsert", "id": 12}，客户端收到后调用 /api/sync 拉取变更；
+连接在 CHANGE_FEED_MAX_AGE 秒后由服务端关闭，EventSource 自动重连时重新校验令牌。
+"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from django.conf import settings
+
+from api.security import aresolve_token
+from .broker import get_broker
+
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    # 关闭 nginx 的响应缓冲，事件立即送达
+    (b'x-accel-buffering', b'no'),
+]
+
+
+def format_event(event: dict) -> bytes:
+    return f'event: change\ndata: {json.dumps(event, separators=(",", ":"))}\n\n'.encode()
+
+
+class ChangeFeedApp:
+    """在 path 上提供变更推送，其余请求交给 application"""
+
+    def __init__(self, application, path='/api/changes'):
+        self.application = application
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] != self.path:
+            return await self.application(scope, receive, send)
+        if scope['method'] != 'GET':
+            return await self._reject(send, 405, '仅支持 GET')
+
+        token = parse_qs(scope.get('query_string', b'').decode()).get('token', [''])[0]
+        if not token or await aresolve_token(token, 'access') is None:
+            return await self._reject(send, 401, '未认证')
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+        # 建议 EventSource 断线后 3 秒重连
+        await send({'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+        await self._stream(receive, send)
+
+    async def _stream(self, receive, send):
+        disconnected = asyncio.ensure_future(self._wait_disconnect(receive))
+        events = get_broker().subscribe()
+        deadline = time.monotonic() + settings.CHANGE_FEED_MAX_AGE
+        next_event = None
+        try:
+            while not disconnected.done():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if next_event is None:
+                    next_event = asyncio.ensure_future(events.__anext__())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected}, timeout=min(settings.CHANGE_FEED_HEARTBEAT, remaining),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_event in done:
+                    body, next_event = format_event(next_event.result()), None
+                elif disconnected in done:
+                    break
+                else:
+                    # 注释行作为心跳，防止代理关闭空闲连接
+                    body = b': keepalive\n\n'
+                await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            tasks = [task for task in (next_event, disconnected) if task is not None]
+            for task in tasks:
+                task.cancel()
+            # 等待取消完成后再关闭事件流，关闭时退订
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await events.aclose()
+
+    @staticmethod
+    async def _wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str):
+        body = json.dumps({'detail': detail}, ensure_ascii=False).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
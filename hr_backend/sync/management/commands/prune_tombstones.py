@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = '清理超过保留期的删除日志（早于保留期的同步令牌会被要求全量重新加载）'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(f'已清理 {deleted} 条删除日志')
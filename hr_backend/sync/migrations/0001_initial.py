@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=32, verbose_name='数据类型')),
+                ('object_id', models.BigIntegerField(verbose_name='记录ID')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='删除时间')),
+            ],
+            options={
+                'verbose_name': '删除日志',
+                'verbose_name_plural': '删除日志',
+                'indexes': [models.Index(fields=['deleted_at'], name='tombstone_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils import timezone
+
+from departments.models import Department
+from employees.models import Employee
+from teams.models import ResearchTeam
+
+# 增量同步中的数据类型名称与对应模型
+SYNC_MODELS = {
+    'employees': Employee,
+    'departments': Department,
+    'teams': ResearchTeam,
+}
+
+
+class Tombstone(models.Model):
+    """删除日志，增量同步据此返回在令牌之后被删除的记录"""
+    model = models.CharField(max_length=32, verbose_name='数据类型')
+    object_id = models.BigIntegerField(verbose_name='记录ID')
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name='删除时间')
+
+    class Meta:
+        verbose_name = '删除日志'
+        verbose_name_plural = '删除日志'
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model}#{self.object_id}'
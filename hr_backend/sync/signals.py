@@ -0,0 +1,91 @@
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from departments.models import Department
+from employees.models import Employee
+from teams.models import ResearchTeam
+from .broker import publish_change
+from .models import SYNC_MODELS, Tombstone
+
+SYNC_KEYS = {model: key for key, model in SYNC_MODELS.items()}
+
+# 同步行中带有被引用记录名称的外键：被引用模型 -> (引用方模型, 外键字段)
+NAME_REFERENCES = {
+    Department: ((Employee, 'department'), (ResearchTeam, 'department'), (Department, 'parent_department')),
+    ResearchTeam: ((Employee, 'team'),),
+    Employee: ((Department, 'leader'), (ResearchTeam, 'leader')),
+}
+
+
+def touch_references(model, pk, set_null_only=False):
+    """刷新引用 model 中 pk 记录的行的 updated_at，使增量同步重新返回这些行
+
+    被引用记录改名时引用方的名称列（如员工的 department_name）随之变化；删除时 SET_NULL 级联
+    以查询集 update() 清空外键，不会更新 auto_now 字段。set_null_only 只处理后一种外键，
+    CASCADE 外键的引用方会被一并删除并记录删除日志。
+    """
+    now = timezone.now()
+    for referencing, name in NAME_REFERENCES[model]:
+        field = referencing._meta.get_field(name)
+        if set_null_only and field.remote_field.on_delete is not models.SET_NULL:
+            continue
+        referencing.objects.filter(**{field.attname: pk}).update(updated_at=now)
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=ResearchTeam)
+def record_deletion(sender, instance, **kwargs):
+    """记录删除（含级联删除）的记录ID"""
+    Tombstone.objects.create(model=SYNC_KEYS[sender], object_id=instance.pk)
+
+
+def _publish_on_commit(model: str, op: str, object_id):
+    # 事务提交后再推送，订阅者据此同步时一定能读到变更
+    transaction.on_commit(lambda: publish_change(model, op, object_id))
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=ResearchTeam)
+def publish_save(sender, instance, **kwargs):
+    """推送新增或修改事件"""
+    _publish_on_commit(SYNC_KEYS[sender], 'upsert', instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=ResearchTeam)
+def publish_deletion(sender, instance, **kwargs):
+    """推送删除事件"""
+    _publish_on_commit(SYNC_KEYS[sender], 'delete', instance.pk)
+
+
+@receiver(pre_save, sender=Department)
+@receiver(pre_save, sender=ResearchTeam)
+def touch_references_on_rename(sender, instance, **kwargs):
+    """部门、团队改名时刷新引用方（部门、团队保存较少，直接查询原名称比较）"""
+    if instance._state.adding:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+    if previous is not None and previous != instance.name:
+        touch_references(sender, instance.pk)
+
+
+@receiver(pre_save, sender=Employee)
+def touch_references_on_employee_rename(sender, instance, **kwargs):
+    """负责人改名时刷新其负责的部门与团队；原姓名取自 employees.signals 在加载时记录的字段快照"""
+    if instance._state.adding:
+        return
+    if getattr(instance, '_watched_state', {}).get('name') != instance.name:
+        touch_references(sender, instance.pk)
+
+
+@receiver(pre_delete, sender=Employee)
+@receiver(pre_delete, sender=Department)
+@receiver(pre_delete, sender=ResearchTeam)
+def touch_references_on_delete(sender, instance, **kwargs):
+    """删除前刷新将被 SET_NULL 的引用方（团队成员、所负责的部门与团队）"""
+    touch_references(sender, instance.pk, set_null_only=True)
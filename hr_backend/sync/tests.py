@@ -0,0 +1,208 @@
+import asyncio
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from api.sync import encode_sync_token
+from api.tests import APITestCase
+from departments.models import Department
+from employees.models import Employee
+from employees.tests import create_employees
+from teams.models import ResearchTeam
+from .broker import InProcessBroker, get_broker
+from .feed import ChangeFeedApp
+from .models import Tombstone
+
+
+class SyncEndpointTests(APITestCase):
+    """增量同步接口测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.team = ResearchTeam.objects.create(name='团队一', department=cls.department)
+        cls.employees = create_employees(cls.department, 3, team=cls.team)
+        # 以上数据早于同步起点
+        past = timezone.now() - timedelta(hours=1)
+        for model in (Employee, Department, ResearchTeam):
+            model.objects.update(updated_at=past)
+        cls.since = encode_sync_token(timezone.now() - timedelta(minutes=1))
+
+    def sync(self, since=None):
+        response = self.client.get('/api/sync', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_without_token_requests_full_reload(self):
+        result = self.sync()
+        self.assertTrue(result['reset'])
+        self.assertEqual(result['employees'], [])
+        # 令牌回退若干秒以覆盖尚未提交的并发写入
+        self.assertLess(int(result['token']), int(encode_sync_token(timezone.now())))
+
+    def test_returns_only_changes_after_token(self):
+        self.assertEqual(self.sync(self.since)['employees'], [])
+
+        employee = self.employees[1]
+        employee.mobile_phone = '13800000000'
+        employee.save()
+        created = Department.objects.create(name='新部门')
+
+        with self.assertNumQueries(4):
+            result = self.sync(self.since)
+        self.assertFalse(result['reset'])
+        self.assertEqual([row['id'] for row in result['employees']], [employee.id])
+        self.assertEqual(result['employees'][0]['mobile_phone'], '13800000000')
+        self.assertEqual([row['id'] for row in result['departments']], [created.id])
+        self.assertEqual(result['teams'], [])
+
+    def test_deletions_are_returned_as_tombstones(self):
+        Employee.objects.filter(pk=self.employees[0].pk).delete()
+        result = self.sync(self.since)
+        self.assertEqual(result['deleted'], {'employees': [self.employees[0].pk], 'departments': [], 'teams': []})
+
+        # 级联删除同样记录
+        department_id, team_id = self.department.pk, self.team.pk
+        Department.objects.filter(pk=department_id).delete()
+        deleted = self.sync(self.since)['deleted']
+        self.assertEqual(deleted['departments'], [department_id])
+        self.assertEqual(deleted['teams'], [team_id])
+        self.assertEqual(sorted(deleted['employees']), sorted(employee.pk for employee in self.employees))
+
+    def test_deleted_team_is_cleared_from_members(self):
+        team_id = self.team.pk
+        ResearchTeam.objects.get(pk=team_id).delete()
+        result = self.sync(self.since)
+        self.assertEqual(result['deleted']['teams'], [team_id])
+        self.assertEqual(sorted(row['id'] for row in result['employees']), sorted(e.pk for e in self.employees))
+        self.assertEqual({(row['team_id'], row['team_name']) for row in result['employees']}, {(None, None)})
+
+    def test_renamed_or_deleted_references_are_resynced(self):
+        leader = self.employees[0]
+        Department.objects.filter(pk=self.department.pk).update(leader=leader, updated_at=timezone.now() - timedelta(hours=1))
+
+        department = Department.objects.get(pk=self.department.pk)
+        department.name = '科研管理处'
+        department.save()
+        result = self.sync(self.since)
+        self.assertEqual({row['department_name'] for row in result['employees']}, {'科研管理处'})
+        self.assertEqual([row['department_name'] for row in result['teams']], ['科研管理处'])
+
+        since = encode_sync_token(timezone.now())
+        employee = Employee.objects.get(pk=leader.pk)
+        employee.name = '新负责人'
+        employee.save()
+        self.assertEqual([row['leader_name'] for row in self.sync(since)['departments']], ['新负责人'])
+
+        since = encode_sync_token(timezone.now())
+        Employee.objects.filter(pk=leader.pk).delete()
+        [row] = self.sync(since)['departments']
+        self.assertEqual((row['leader_id'], row['leader_name']), (None, None))
+
+    def test_bulk_upsert_rename_resyncs_led_department(self):
+        leader = self.employees[0]
+        Department.objects.filter(pk=self.department.pk).update(leader=leader, updated_at=timezone.now() - timedelta(hours=1))
+        row = {
+            'employee_id': leader.employee_id, 'name': '改名', 'gender': True,
+            'department_id': self.department.pk, 'id_card_number': leader.id_card_number,
+        }
+        self.client.post('/api/employees/bulk?on_duplicate=upsert', data=json.dumps(row), content_type='application/jsonl')
+        self.assertEqual([row['leader_name'] for row in self.sync(self.since)['departments']], ['改名'])
+
+    def test_stale_or_oversized_sync_requests_reload(self):
+        old = encode_sync_token(timezone.now() - timedelta(days=365))
+        self.assertTrue(self.sync(old)['reset'])
+
+        Employee.objects.update(updated_at=timezone.now())
+        with override_settings(SYNC_MAX_CHANGES=2):
+            self.assertTrue(self.sync(self.since)['reset'])
+
+    def test_invalid_token(self):
+        self.assertEqual(self.client.get('/api/sync', {'since': 'abc'}).status_code, 400)
+
+
+class TombstoneTests(APITestCase):
+    """删除日志清理测试"""
+
+    def test_prune_removes_expired_tombstones(self):
+        Tombstone.objects.create(model='employees', object_id=1, deleted_at=timezone.now() - timedelta(days=400))
+        Tombstone.objects.create(model='employees', object_id=2)
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [2])
+
+
+class ChangeFeedTests(APITestCase):
+    """变更推送通道测试"""
+
+    def test_model_changes_are_published_after_commit(self):
+        broker = get_broker()
+        with mock.patch.object(broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                department = Department.objects.create(name='科研处')
+                publish.assert_not_called()
+            publish.assert_called_once_with({'model': 'departments', 'op': 'upsert', 'id': department.pk})
+
+            publish.reset_mock()
+            department_id = department.pk
+            with self.captureOnCommitCallbacks(execute=True):
+                department.delete()
+            publish.assert_called_once_with({'model': 'departments', 'op': 'delete', 'id': department_id})
+
+    async def test_broker_delivers_events_published_from_threads(self):
+        broker = InProcessBroker()
+        events = broker.subscribe()
+        received = asyncio.ensure_future(events.__anext__())
+        while not len(broker):
+            await asyncio.sleep(0)
+        await asyncio.to_thread(broker.publish, {'model': 'teams', 'op': 'delete', 'id': 3})
+        self.assertEqual(await asyncio.wait_for(received, 1), {'model': 'teams', 'op': 'delete', 'id': 3})
+        await events.aclose()
+        self.assertEqual(len(broker), 0)
+
+    async def call_feed(self, query_string: bytes):
+        """以 ASGI 调用推送通道，返回 (发送的消息队列, 通知断开的函数, 运行中的任务)"""
+        incoming, sent = asyncio.Queue(), asyncio.Queue()
+        app = ChangeFeedApp(application=None)
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/changes', 'query_string': query_string}
+        task = asyncio.ensure_future(app(scope, incoming.get, sent.put))
+        return sent, lambda: incoming.put_nowait({'type': 'http.disconnect'}), task
+
+    async def test_feed_requires_token(self):
+        sent, _, task = await self.call_feed(b'token=invalid')
+        await asyncio.wait_for(task, 1)
+        self.assertEqual((await sent.get())['status'], 401)
+
+    async def test_feed_streams_events(self):
+        broker = InProcessBroker()
+        with mock.patch('sync.feed.get_broker', return_value=broker):
+            sent, disconnect, task = await self.call_feed(f'token={self.token}'.encode())
+            start = await asyncio.wait_for(sent.get(), 1)
+            self.assertEqual(start['status'], 200)
+            self.assertIn((b'content-type', b'text/event-stream; charset=utf-8'), start['headers'])
+            self.assertEqual((await sent.get())['body'], b'retry: 3000\n\n')
+
+            while not len(broker):
+                await asyncio.sleep(0)
+            broker.publish({'model': 'employees', 'op': 'upsert', 'id': 7})
+            message = await asyncio.wait_for(sent.get(), 1)
+            self.assertEqual(message['body'], b'event: change\ndata: {"model":"employees","op":"upsert","id":7}\n\n')
+
+            disconnect()
+            await asyncio.wait_for(task, 1)
+        self.assertEqual(len(broker), 0)
+
+    @override_settings(CHANGE_FEED_HEARTBEAT=0.01, CHANGE_FEED_MAX_AGE=0.05)
+    async def test_feed_sends_heartbeats_and_expires(self):
+        sent, _, task = await self.call_feed(f'token={self.token}'.encode())
+        await asyncio.wait_for(task, 1)
+        bodies = []
+        while not sent.empty():
+            bodies.append((await sent.get()).get('body'))
+        self.assertIn(b': keepalive\n\n', bodies)
+        # 到达最长时间后正常结束响应，客户端重连时重新认证
+        self.assertEqual(bodies[-1], b'')
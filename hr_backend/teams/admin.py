@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Count
 from .models import ResearchTeam
 
 @admin.register(ResearchTeam)
@@ -8,6 +9,7 @@ class ResearchTeamAdmin(admin.ModelAdmin):
     list_filter = ['department']
     search_fields = ['name', 'description']
     ordering = ['name']
+    list_select_related = ['department', 'leader']
     readonly_fields = ['created_at', 'updated_at', 'member_count']
     fieldsets = (
         ('团队信息', {
@@ -18,8 +20,13 @@ class ResearchTeamAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        """在查询中聚合成员数量，避免逐行统计"""
+        return super().get_queryset(request).annotate(_member_count=Count('employee'))
+    
     def member_count(self, obj):
         """计算团队成员数量"""
-        return obj.employee_set.count()
+        return obj._member_count
     
     member_count.short_description = '成员数量'
+    member_count.admin_order_field = '_member_count'
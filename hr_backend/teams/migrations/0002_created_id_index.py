@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0003_created_id_index'),
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='researchteam',
+            index=models.Index(fields=['created_at', 'id'], name='team_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_created_id_index'),
+        ('employees', '0007_list_filter_indexes'),
+        ('teams', '0002_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='researchteam',
+            index=models.Index(fields=['department', '-created_at', '-id'], name='team_dept_created_idx'),
+        ),
+    ]
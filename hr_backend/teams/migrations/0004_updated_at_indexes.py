@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0004_updated_at_indexes'),
+        ('employees', '0008_updated_at_indexes'),
+        ('teams', '0003_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='researchteam',
+            index=models.Index(fields=['updated_at'], name='team_updated_idx'),
+        ),
+    ]
@@ -12,6 +12,14 @@ class ResearchTeam(models.Model):
     class Meta:
         verbose_name = '科研创新团队'
         verbose_name_plural = '科研创新团队管理'
+        indexes = [
+            # 游标分页按 (created_at, id) 排序与定位
+            models.Index(fields=['created_at', 'id'], name='team_created_id_idx'),
+            # 增量同步按更新时间查找变更的记录
+            models.Index(fields=['updated_at'], name='team_updated_idx'),
+            # 列表按部门筛选后按创建时间倒序分页
+            models.Index(fields=['department', '-created_at', '-id'], name='team_dept_created_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from hr_backend.cache import bump_version, count_namespace
+from .models import ResearchTeam
+
+
+@receiver(post_save, sender=ResearchTeam)
+@receiver(post_delete, sender=ResearchTeam)
+def invalidate_team_counts(sender, **kwargs):
+    """科研团队写入后使列表总数缓存失效"""
+    bump_version(count_namespace(sender))
@@ -1,3 +1,88 @@
-from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+
+from api.tests import APITestCase
+from departments.models import Department
+from employees.models import Employee
+from employees.tests import create_employees
+from .models import ResearchTeam
+
+
+class TeamListQueryTests(APITestCase):
+    """科研团队列表接口的查询次数回归测试"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='科研处')
+        cls.teams = [
+            ResearchTeam.objects.create(name=f'团队{i}', department=cls.department)
+            for i in range(10)
+        ]
+        create_employees(cls.department, 4, team=cls.teams[0])
+
+    def test_list_query_count_independent_of_page_size(self):
+        cache.clear()
+        self.client.get('/api/teams/')  # 预热总数缓存
+        for page_size in (1, 10):
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/teams/', {'page_size': page_size})
+            self.assertEqual(len(response.json()['items']), page_size)
+
+    def test_offset_pages_do_not_overlap(self):
+        # 创建时间相同的团队按 id 排序，相邻两页既不重复也不遗漏
+        ResearchTeam.objects.update(created_at=self.teams[0].created_at)
+        pages = [
+            [row['id'] for row in self.client.get('/api/teams/', {'page': page, 'page_size': 5}).json()['items']]
+            for page in (1, 2)
+        ]
+        self.assertEqual(pages[0] + pages[1], sorted((team.id for team in self.teams), reverse=True))
+
+    def test_detail_counts_members(self):
+        row = self.client.get(f'/api/teams/{self.teams[0].id}').json()
+        self.assertEqual(row['employee_count'], 4)
+        self.assertEqual(row['department_name'], '科研处')
+
+    def test_patch_updates_leader_only(self):
+        leader = Employee.objects.filter(team=self.teams[0]).first()
+        response = self.client.patch(
+            f'/api/teams/{self.teams[0].id}', {'leader_id': leader.id}, content_type='application/json',
+        )
+        row = response.json()
+        self.assertEqual((row['leader_id'], row['name'], row['employee_count']), (leader.id, '团队0', 4))
+        self.assertEqual(
+            self.client.patch(f'/api/teams/{self.teams[0].id}', {'leader_id': 999999}, content_type='application/json').status_code,
+            400,
+        )
+
+
+@skipUnless(connection.vendor == 'sqlite', '断言针对 SQLite 的查询计划输出')
+class TeamQueryPlanTests(APITestCase):
+    """科研团队列表按部门筛选的查询计划测试"""
+
+    def test_department_filter_uses_index(self):
+        from api.pagination import CURSOR_ORDERING
+        from api.teams import project_teams
+
+        for filters in ({}, {'department_id': 1}, {'department_id': 1, 'name__icontains': '团队'}):
+            # 偏移分页与游标分页使用相同的排序键
+            queryset = project_teams(ResearchTeam.objects.filter(**filters)).order_by(*CURSOR_ORDERING)
+            for kind, query in (('offset', queryset[20:40]), ('cursor', queryset[:21])):
+                with self.subTest(filters=filters, query=kind):
+                    self.assertNoTableScan(query, ResearchTeam._meta.db_table)
+
+
+class TeamSparseFieldsTests(APITestCase):
+    """科研团队的稀疏字段与关联嵌入测试"""
+
+    def test_detail_includes_leader(self):
+        department = Department.objects.create(name='科研处')
+        leader = create_employees(department, 1)[0]
+        team = ResearchTeam.objects.create(name='遥感团队', department=department, leader=leader)
+        with self.assertNumQueries(1):
+            row = self.client.get(f'/api/teams/{team.id}', {'fields': 'name', 'include': 'leader'}).json()
+        self.assertEqual(row, {
+            'id': team.id, 'name': '遥感团队',
+            'leader': {'id': leader.id, 'employee_id': leader.employee_id, 'name': leader.name},
+        })